@@ -4,13 +4,17 @@
 AI Agent Stack - Core Agent System
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Set, Union
 import json
 import logging
+import time
 import uuid
 
+from agent_stack.core.tasks.batching import TaskBatch
+from agent_stack.core.tasks.skills import CapabilityMask
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,6 +43,9 @@ class AgentState:
     max_concurrent_tasks: int
     current_task_count: int
     comments: List[AgentComment]  # Track progress comments
+    assigned_tasks: Set[str] = field(default_factory=set)  # Task and batch ids held
+
+    capability_mask = CapabilityMask("capability_tags")
 
 class Agent:
     """Base Agent class for AI Agent Stack"""
@@ -58,6 +65,7 @@ class Agent:
             current_task_count=0,
             comments=[]  # Initialize empty comments list
         )
+        self._batches: Dict[str, TaskBatch] = {}
 
     def add_comment(self, action: str, details: str, status: str, metadata: Optional[Dict] = None) -> AgentComment:
         """
@@ -145,12 +153,13 @@ class Agent:
             self.agent_id,
             self.state
         )
+        self._renew_leases()
         
     def request_task(self):
         """Request a new task from the task pool"""
         self.add_comment("task_request", "Requesting new task from pool", "started")
         
-        from agent_stack.core.task_pool import TaskPool
+        from agent_stack.core.tasks import TaskPool
         if self.state.current_task_count >= self.state.max_concurrent_tasks:
             self.add_comment("task_request", 
                            f"Task request denied - at maximum capacity ({self.state.current_task_count}/{self.state.max_concurrent_tasks})", 
@@ -163,11 +172,12 @@ class Agent:
         
         task = TaskPool.get_task(
             agent_id=self.agent_id,
-            capabilities=self.state.capability_tags
+            capabilities=self.state.capability_mask
         )
         
         if task:
             self.state.current_task = task.task_id
+            self.state.assigned_tasks.add(task.task_id)
             self.state.current_task_count += 1
             self.state.status = "WORKING"
             self.add_comment("task_request", f"Task {task.task_id} assigned successfully", "completed", {
@@ -179,6 +189,80 @@ class Agent:
         
         return task
         
+    def request_tasks(self, lease_seconds: float = 300.0) -> List:
+        """Lease tasks up to the agent's free capacity in one pool round trip
+        
+        Every heartbeat renews the leases the agent holds, so heartbeats
+        must be sent more often than lease_seconds while tasks run.
+        """
+        from agent_stack.core.tasks import TaskPool
+        capacity = self.state.max_concurrent_tasks - self.state.current_task_count
+        if capacity <= 0:
+            return []
+        
+        tasks = TaskPool.lease_tasks(
+            agent_id=self.agent_id,
+            capabilities=self.state.capability_mask,
+            n=capacity,
+            lease_seconds=lease_seconds
+        )
+        
+        if tasks:
+            self.state.current_task = self.state.current_task or tasks[0].task_id
+            self.state.assigned_tasks.update(task.task_id for task in tasks)
+            self.state.current_task_count += len(tasks)
+            self.state.status = "WORKING"
+            self.add_comment("task_request", f"Leased {len(tasks)} tasks", "completed", {
+                "task_ids": [task.task_id for task in tasks],
+                "lease_seconds": lease_seconds
+            })
+        
+        return tasks
+        
+    def request_batch(self):
+        """Claim a batch of small compatible tasks as a single assignment"""
+        from agent_stack.core.tasks import TaskPool
+        if self.state.current_task_count >= self.state.max_concurrent_tasks:
+            return None
+        
+        batch = TaskPool.get_batch(self.agent_id, self.state.capability_mask)
+        if batch:
+            claimed = time.perf_counter()
+            self.state.current_task = batch.batch_id
+            self.state.assigned_tasks.add(batch.batch_id)
+            self._batches[batch.batch_id] = batch
+            self.state.current_task_count += 1
+            self.state.status = "WORKING"
+            self.add_comment("task_request", f"Batch {batch.batch_id} assigned", "completed", {
+                "task_ids": batch.task_ids
+            })
+            # Our bookkeeping is part of the per-assignment cost batching amortizes
+            batch.overhead_seconds += time.perf_counter() - claimed
+        
+        return batch
+        
+    def complete_batch(self, batch_id: str, results: Optional[Dict] = None,
+                       errors: Optional[Dict[str, str]] = None):
+        """Report the results of every task in a batch at once"""
+        from agent_stack.core.tasks import TaskPool
+        if batch_id not in self._batches:
+            self.add_comment("task_completion", 
+                           f"Failed to complete batch {batch_id} - not currently assigned", 
+                           "failed")
+            return []
+        
+        completed = TaskPool.complete_batch(batch_id, self.agent_id, results, errors)
+        
+        del self._batches[batch_id]
+        self._release_task(batch_id)
+        self.send_heartbeat()
+        self.add_comment("task_completion", f"Batch {batch_id} completed", "completed", {
+            "completed": completed,
+            "failed": sorted(errors or ()),
+            "remaining_tasks": self.state.current_task_count
+        })
+        return completed
+        
     def update_status(self, status: str, progress: int, current_task: Optional[str] = None):
         """Update agent status"""
         self.state.status = status
@@ -187,21 +271,26 @@ class Agent:
             self.state.current_task = current_task
         self.send_heartbeat()
         
-    def complete_task(self, task_id: str):
+    def complete_task(self, task_id: str, result: Optional[Dict] = None):
         """Mark a task as completed"""
         self.add_comment("task_completion", f"Starting completion process for task {task_id}", "started")
         
-        from agent_stack.core.task_pool import TaskPool
-        if task_id == self.state.current_task:
+        from agent_stack.core.tasks import TaskPool
+        if task_id in self.state.assigned_tasks and task_id not in self._batches:
             self.add_comment("task_completion", "Finalizing task results", "in_progress")
-            TaskPool.complete_task(task_id, self.agent_id)
-            
-            self.state.current_task = None
-            self.state.current_task_count -= 1
-            self.state.progress = 0
+            try:
+                TaskPool.complete_task(task_id, self.agent_id, result)
+            except ValueError as e:
+                # The lease ran out and the pool already took the task back
+                self._release_task(task_id)
+                self.send_heartbeat()
+                self.add_comment("task_completion", f"Failed to complete task {task_id} - {e}", "failed", {
+                    "remaining_tasks": self.state.current_task_count
+                })
+                return
             
+            self._release_task(task_id)
             if self.state.current_task_count == 0:
-                self.state.status = "IDLE"
                 self.add_comment("status_update", "Agent returned to IDLE state", "completed")
             
             self.send_heartbeat()
@@ -214,6 +303,33 @@ class Agent:
                            f"Failed to complete task {task_id} - not currently assigned", 
                            "failed")
             
+    def fail_task(self, task_id: str, error: str):
+        """Report a failed task so the pool can retry it with backoff"""
+        from agent_stack.core.tasks import TaskPool
+        if task_id not in self.state.assigned_tasks or task_id in self._batches:
+            self.add_comment("task_failure", 
+                           f"Failed to report task {task_id} - not currently assigned", 
+                           "failed")
+            return
+            
+        try:
+            will_retry = TaskPool.fail_task(task_id, self.agent_id, error)
+        except ValueError as e:
+            # The lease ran out and the pool already took the task back
+            self._release_task(task_id)
+            self.send_heartbeat()
+            self.add_comment("task_failure", f"Failed to report task {task_id} - {e}", "failed", {
+                "remaining_tasks": self.state.current_task_count
+            })
+            return
+        
+        self._release_task(task_id)
+        self.send_heartbeat()
+        self.add_comment("task_failure", f"Task {task_id} failed: {error}", "failed", {
+            "will_retry": will_retry,
+            "remaining_tasks": self.state.current_task_count
+        })
+            
     def shutdown(self):
         """Shutdown the agent"""
         self.add_comment("shutdown", "Initiating agent shutdown sequence", "started")
@@ -222,16 +338,27 @@ class Agent:
         self.state.status = "SHUTTING_DOWN"
         self.send_heartbeat()
         
-        # Handle any incomplete tasks
-        if self.state.current_task:
+        # Handle any incomplete tasks, including every task of a held batch
+        from agent_stack.core.tasks import TaskPool
+        task_ids = []
+        for task_id in sorted(self.state.assigned_tasks):
+            batch = self._batches.get(task_id)
+            task_ids.extend(batch.task_ids if batch else [task_id])
+        # Leases that already expired may have gone to another agent
+        owned = {task.task_id for task in TaskPool.get_agent_tasks(self.agent_id)}
+        reassigned = [task_id for task_id in task_ids if task_id in owned]
+        for task_id in reassigned:
             self.add_comment("shutdown", 
-                           f"Reassigning active task {self.state.current_task}", 
+                           f"Reassigning active task {task_id}",
                            "in_progress")
-            from agent_stack.core.task_pool import TaskPool
-            TaskPool.reassign_task(self.state.current_task)
+            TaskPool.reassign_task(task_id)
             self.add_comment("task_handoff", 
-                           f"Task {self.state.current_task} reassigned to task pool", 
+                           f"Task {task_id} reassigned to task pool",
                            "completed")
+        self.state.assigned_tasks.clear()
+        self._batches.clear()
+        self.state.current_task = None
+        self.state.current_task_count = 0
             
         self.add_comment("shutdown", "Deregistering agent from system", "in_progress")
         AgentRegistry.deregister_agent(self.agent_id)
@@ -241,5 +368,28 @@ class Agent:
         
         self.add_comment("shutdown", "Agent shutdown completed successfully", "completed", {
             "final_status": self.state.status,
-            "tasks_reassigned": 1 if self.state.current_task else 0
+            "tasks_reassigned": len(reassigned)
         })
+        
+    def _renew_leases(self):
+        """Extend the pool leases on the tasks the agent still holds"""
+        from agent_stack.core.tasks import TaskPool
+        for task_id in list(self.state.assigned_tasks):
+            lease = TaskPool.get_lease(task_id)
+            if lease is None or lease.agent_id != self.agent_id:
+                continue
+            try:
+                TaskPool.renew_lease(task_id, self.agent_id)
+            except ValueError:
+                # Expired since we looked; completion will release the slot
+                continue
+        
+    def _release_task(self, task_id: str):
+        """Forget a finished task or batch and free its slot"""
+        self.state.assigned_tasks.discard(task_id)
+        self.state.current_task_count -= 1
+        self.state.progress = 0
+        if self.state.current_task == task_id:
+            self.state.current_task = min(self.state.assigned_tasks, default=None)
+        if self.state.current_task_count == 0:
+            self.state.status = "IDLE"
@@ -53,7 +53,7 @@ class AgentConfig(BaseModel):
     )
     task_poll_interval: int = Field(
         default=5,
-        description="Interval between task polling in seconds"
+        description="Maximum time an idle agent waits in TaskPool.wait_for_task before re-checking, in seconds"
     )
     max_retries: int = Field(
         default=3,
@@ -3,12 +3,16 @@ AI Agent Stack - Event System
 """
 
 from collections import defaultdict
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
 import asyncio
 import threading
-import queue
 import uuid
 
+from agent_stack.core.events.backpressure import BLOCK, EventQueue, set_delivering
+from agent_stack.core.events.dispatch import PartitionedDispatcher
+from agent_stack.core.events.index import HandlerIndex
+from agent_stack.core.events.topics import TopicTrie, is_pattern
+
 class EventHandler:
     """Handler for system events"""
     
@@ -28,10 +32,18 @@ class EventHandler:
         )
 
 class SystemEventBus:
-    """Central event bus for system-wide communication"""
+    """Central event bus for system-wide communication
+    
+    Besides flat event types, handlers can subscribe to dotted topics and
+    wildcard patterns such as "task.*" or "agent.#". Flat event types are
+    mapped onto topics with register_topic; every SystemEvents constant is
+    registered, so task_completed is also delivered as task.completed.
+    """
     
     _instance = None
     _lock = threading.Lock()
+    _topic_names: Dict[str, str] = {}  # flat event type -> topic
+    _flat_names: Dict[str, str] = {}   # topic -> flat event type
     
     def __new__(cls):
         if cls._instance is None:
@@ -43,8 +55,10 @@ class SystemEventBus:
     
     def _initialize(self):
         """Initialize the event bus"""
-        self._handlers = defaultdict(set)  # event_type -> Set[EventHandler]
-        self._event_queue = queue.Queue()
+        self._handlers = defaultdict(HandlerIndex)  # event_type -> indexed EventHandlers
+        self._topics = TopicTrie()  # topic patterns -> indexed EventHandlers
+        self._event_queue = EventQueue()
+        self._dispatcher: Optional[PartitionedDispatcher] = None
         self._start_event_processor()
         
     def _start_event_processor(self):
@@ -60,8 +74,11 @@ class SystemEventBus:
         while True:
             try:
                 event_type, event_data = self._event_queue.get()
-                self._dispatch_event(event_type, event_data)
-                self._event_queue.task_done()
+                dispatcher = self._dispatcher
+                if dispatcher is None:
+                    self._dispatch_event(event_type, event_data)
+                else:
+                    dispatcher.submit(event_type, event_data)
             except Exception as e:
                 from agent_stack.core.logging import SystemLogger
                 SystemLogger.error(
@@ -70,44 +87,152 @@ class SystemEventBus:
                     event_data=event_data
                 )
     
+    def _match(self, event_type: str, event_data: Dict) -> List[EventHandler]:
+        """Find the handlers an event is delivered to"""
+        flat_handlers = self._handlers.get(self._flat_names.get(event_type, event_type))
+        matched = flat_handlers.match(event_data) if flat_handlers is not None else []
+        for handlers in self._topics.match(self._topic_names.get(event_type, event_type)):
+            matched.extend(handlers.match(event_data))
+        return matched
+        
     def _dispatch_event(self, event_type: str, event_data: Dict):
         """Dispatch event to registered handlers"""
-        handlers = self._handlers.get(event_type, set())
+        for handler in self._match(event_type, event_data):
+            self._deliver(handler, event_type, event_data)
+            
+    @staticmethod
+    def _deliver(handler: EventHandler, event_type: str, event_data: Dict):
+        """Call one handler, logging rather than raising its errors"""
+        set_delivering(True)
+        try:
+            handler.callback(event_type, event_data)
+        except Exception as e:
+            from agent_stack.core.logging import SystemLogger
+            SystemLogger.error(
+                f"Error in event handler: {str(e)}",
+                handler_id=handler.id,
+                event_type=event_type,
+                event_data=event_data
+            )
+        finally:
+            set_delivering(False)
+    
+    @classmethod
+    def configure_dispatch(cls,
+                           workers: int = 4,
+                           partition_keys: Sequence[str] = ("agent_id", "task_id"),
+                           handler_timeout: Optional[float] = 30.0):
+        """Deliver events from a pool of workers, ordered per partition key
         
-        for handler in handlers:
-            if handler.matches(event_data):
-                try:
-                    handler.callback(event_type, event_data)
-                except Exception as e:
-                    from agent_stack.core.logging import SystemLogger
-                    SystemLogger.error(
-                        f"Error in event handler: {str(e)}",
-                        handler_id=handler.id,
-                        event_type=event_type,
-                        event_data=event_data
-                    )
+        See PartitionedDispatcher. workers=0 goes back to delivering every
+        event in order on the bus thread. The lanes are bounded like the
+        bus queue, see configure_queue.
+        """
+        instance = cls()
+        previous = instance._dispatcher
+        dispatcher = None
+        if workers:
+            queue = instance._event_queue
+            dispatcher = PartitionedDispatcher(
+                instance._match, cls._deliver, workers, partition_keys, handler_timeout
+            )
+            dispatcher.set_coalescible(queue.coalescible)
+            dispatcher.configure_queues(queue.maxsize, queue.default_policy, queue.policies)
+        instance._dispatcher = dispatcher
+        if previous is not None:
+            previous.close()
+            
+    @classmethod
+    def configure_queue(cls,
+                        maxsize: Optional[int] = None,
+                        default_policy: str = BLOCK,
+                        policies: Optional[Dict[str, str]] = None):
+        """Bound the event queue and choose what happens to events that overflow it
+        
+        policies maps event types to "block", "drop_oldest", "drop_newest"
+        or "coalesce", for example lossy heartbeats next to lossless task
+        completions; see EventQueue. maxsize=None removes the bound. With
+        configure_dispatch on, every dispatch lane gets the same bound and
+        policies, so at most maxsize events wait in the bus queue and in
+        each lane.
+        """
+        instance = cls()
+        instance._event_queue.configure(maxsize, default_policy, policies)
+        if instance._dispatcher is not None:
+            instance._dispatcher.configure_queues(maxsize, default_policy, policies)
+        
+    @classmethod
+    def configure_coalescing(cls, event_types: Optional[Iterable[str]] = None):
+        """Deliver only the latest queued value per agent or task of these event types
+        
+        A burst of updates for one key that arrives while earlier ones are
+        still queued is dispatched once, carrying the newest payload.
+        Defaults to agent heartbeats and status changes; an empty list
+        turns coalescing off.
+        """
+        if event_types is None:
+            event_types = (SystemEvents.AGENT_HEARTBEAT, SystemEvents.AGENT_STATUS_CHANGED)
+        instance = cls()
+        event_types = frozenset(event_types)
+        instance._event_queue.set_coalescible(event_types)
+        if instance._dispatcher is not None:
+            instance._dispatcher.set_coalescible(event_types)
+            
+    @classmethod
+    def stats(cls) -> Dict[str, float]:
+        """Get event bus counters
+        
+        coalescing_ratio is the share of coalescible events that were
+        folded into a newer value instead of being dispatched.
+        """
+        instance = cls()
+        counts = instance._event_queue.stats()
+        if instance._dispatcher is not None:
+            counts.update(instance._dispatcher.stats())
+        coalesced = counts["coalesced"] + counts.get("lane_coalesced", 0)
+        counts["coalescing_ratio"] = (
+            coalesced / counts["coalescible"] if counts["coalescible"] else 0.0
+        )
+        return counts
     
     @classmethod
     def subscribe(cls, event_type: str, callback: Callable, event_filter: Optional[Dict] = None) -> str:
-        """Subscribe to events of a specific type"""
+        """Subscribe to events of a specific type, or to a dotted topic pattern"""
         instance = cls()
         handler = EventHandler(callback, event_filter)
-        instance._handlers[event_type].add(handler)
+        if is_pattern(event_type):
+            instance._topics.index_for(event_type).add(handler)
+        else:
+            instance._handlers[event_type].add(handler)
         return handler.id
     
     @classmethod
     def unsubscribe(cls, event_type: str, handler_id: str):
         """Unsubscribe from events"""
         instance = cls()
-        handlers = instance._handlers.get(event_type, set())
-        handlers = {h for h in handlers if h.id != handler_id}
-        instance._handlers[event_type] = handlers
+        if is_pattern(event_type):
+            handlers = instance._topics.get(event_type)
+        else:
+            handlers = instance._handlers.get(event_type)
+        if handlers is not None:
+            handlers.remove(handler_id)
     
     @classmethod
-    def emit(cls, event_type: str, event_data: Dict):
-        """Emit an event"""
+    def register_topic(cls, event_type: str, topic: str):
+        """Deliver a flat event type to subscribers of a dotted topic, and back"""
+        cls._topic_names[event_type] = topic
+        cls._flat_names[topic] = event_type
+    
+    @classmethod
+    def emit(cls, event_type: str, event_data: Dict, block: bool = True):
+        """Emit an event
+        
+        With block=False a full queue admits the event over its bound
+        instead of waiting, so callers holding locks that handlers take
+        cannot deadlock against the dispatcher.
+        """
         instance = cls()
-        instance._event_queue.put((event_type, event_data))
+        instance._event_queue.put(event_type, event_data, block=block)
         
         # Log event
         from agent_stack.core.logging import SystemLogger
@@ -218,6 +343,7 @@ class SystemEvents:
     TASK_COMPLETED = "task_completed"
     TASK_FAILED = "task_failed"
     TASK_REASSIGNED = "task_reassigned"
+    TASK_ATTEMPT_CANCELLED = "task_attempt_cancelled"
     
     # Resource events
     RESOURCE_ALLOCATED = "resource_allocated"
@@ -239,12 +365,28 @@ class SystemEvents:
     MONITORING_ALERT = "monitoring_alert"
     PERFORMANCE_THRESHOLD = "performance_threshold"
     RESOURCE_THRESHOLD = "resource_threshold"
+    
+    @classmethod
+    def topics(cls) -> Dict[str, str]:
+        """Map each event type to its topic, e.g. task_completed to task.completed"""
+        return {
+            value: value.replace("_", ".", 1)
+            for name, value in vars(cls).items()
+            if name.isupper() and isinstance(value, str)
+        }
+
+
+for _event_type, _topic in SystemEvents.topics().items():
+    SystemEventBus.register_topic(_event_type, _topic)
 
 
 # Event utilities
 def event_decorator(event_type: str):
     """Decorator to emit events around function calls"""
     
+    for phase in ("started", "completed", "failed"):
+        SystemEventBus.register_topic(f"{event_type}_{phase}", f"{event_type}.{phase}")
+    
     def decorator(func):
         def wrapper(*args, **kwargs):
             # Emit pre-event
@@ -0,0 +1,232 @@
+"""
+AI Agent Stack - Bounded Event Queue
+"""
+
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Sequence, Tuple
+import threading
+import time
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+COALESCE = "coalesce"
+
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, COALESCE)
+
+_delivery = threading.local()
+
+
+def set_delivering(active: bool):
+    """Mark the current thread as running an event handler, or done with it"""
+    _delivery.active = active
+
+
+def delivering() -> bool:
+    """Check whether the current thread is running an event handler"""
+    return getattr(_delivery, "active", False)
+
+
+class _Entry:
+    """A queued event; dropped entries stay in the deques until popped"""
+
+    __slots__ = ("event_type", "event_data", "slot", "alive")
+
+    def __init__(self, event_type: str, event_data: Dict, slot: Optional[Tuple]):
+        self.event_type = event_type
+        self.event_data = event_data
+        self.slot = slot
+        self.alive = True
+
+
+class EventQueue:
+    """FIFO of emitted events with an optional bound and overflow policies
+
+    While the queue holds fewer than maxsize events, put always succeeds.
+    Once it is full, the policy of the incoming event's type decides:
+
+    - block: wait for room (the default, lossless)
+    - drop_oldest: drop the oldest queued event of the same type
+    - drop_newest: drop the incoming event
+    - coalesce: overwrite the queued event of the same type and coalesce
+      key value in place, or drop the oldest of the type if there is none
+
+    Event types marked coalescible are coalesced even when there is room:
+    an event overwrites the queued event with the same coalesce key value,
+    so a burst of updates for one agent is delivered once with the newest
+    payload, in the place of the first.
+
+    Dropping only ever evicts events of the incoming event's own type, so a
+    lossy heartbeat storm never evicts a lossless task_completed; when none
+    is queued the incoming event is dropped instead. If an event handler
+    emits into a full queue, the event is admitted over the bound rather
+    than blocking, since the handler may be what the queue is waiting on.
+    The same goes for a put with block=False, for emitters that hold a
+    lock a handler may need.
+    """
+
+    def __init__(self,
+                 maxsize: Optional[int] = None,
+                 default_policy: str = BLOCK,
+                 policies: Optional[Dict[str, str]] = None,
+                 coalesce_keys: Sequence[str] = ("agent_id", "task_id")):
+        self._condition = threading.Condition()
+        self._entries: Deque[_Entry] = deque()
+        self._by_type: Dict[str, Deque[_Entry]] = {}
+        self._slots: Dict[Tuple, _Entry] = {}
+        self._size = 0
+        self.coalescible = frozenset()
+        self._counts = {"enqueued": 0, "dropped_oldest": 0, "dropped_newest": 0,
+                        "coalescible": 0, "coalesced": 0,
+                        "blocked_puts": 0, "blocked_seconds": 0.0}
+        self.configure(maxsize, default_policy, policies, coalesce_keys)
+
+    def configure(self,
+                  maxsize: Optional[int] = None,
+                  default_policy: str = BLOCK,
+                  policies: Optional[Dict[str, str]] = None,
+                  coalesce_keys: Sequence[str] = ("agent_id", "task_id")):
+        """Change the bound and policies; queued events are kept"""
+        policies = dict(policies or {})
+        for policy in (default_policy, *policies.values()):
+            if policy not in OVERFLOW_POLICIES:
+                raise ValueError(f"Unknown overflow policy: {policy}")
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f"Queue bound must be positive: {maxsize}")
+
+        with self._condition:
+            self.maxsize = maxsize
+            self.default_policy = default_policy
+            self.policies = policies
+            self.coalesce_keys = tuple(coalesce_keys)
+            # Waiting emitters may now fit
+            self._condition.notify_all()
+
+    def set_coalescible(self, event_types: Iterable[str]):
+        """Choose the event types that keep only their latest value per key"""
+        with self._condition:
+            self.coalescible = frozenset(event_types)
+
+    def policy_for(self, event_type: str) -> str:
+        return self.policies.get(event_type, self.default_policy)
+
+    def qsize(self) -> int:
+        return self._size
+
+    def put(self, event_type: str, event_data: Dict, block: bool = True) -> bool:
+        """Queue an event, returns False if it was dropped"""
+        with self._condition:
+            if event_type in self.coalescible:
+                self._counts["coalescible"] += 1
+                if self._coalesce(event_type, event_data):
+                    return True
+
+            if self._full():
+                policy = self.policy_for(event_type)
+                if policy == BLOCK and block and not delivering():
+                    self._wait_for_room()
+                elif policy == DROP_NEWEST:
+                    self._counts["dropped_newest"] += 1
+                    return False
+                elif policy == COALESCE and self._coalesce(event_type, event_data):
+                    return True
+                elif policy in (DROP_OLDEST, COALESCE) and not self._drop_oldest(event_type):
+                    # Nothing of this type to evict, so the newcomer goes
+                    self._counts["dropped_newest"] += 1
+                    return False
+
+            self._append(event_type, event_data)
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple[str, Dict]]:
+        """Remove and return the oldest (event_type, event_data), None on timeout"""
+        with self._condition:
+            while True:
+                while self._entries and not self._entries[0].alive:
+                    self._entries.popleft()
+                if self._entries:
+                    break
+                if not self._condition.wait(timeout) and timeout is not None:
+                    return None
+
+            entry = self._entries.popleft()
+            self._release(entry)
+            self._condition.notify_all()
+            return entry.event_type, entry.event_data
+
+    def stats(self) -> Dict[str, float]:
+        """Return drop, coalesce and blocking counters"""
+        with self._condition:
+            counts = dict(self._counts)
+            counts["queued"] = self._size
+        return counts
+
+    def _full(self) -> bool:
+        return self.maxsize is not None and self._size >= self.maxsize
+
+    def _wait_for_room(self):
+        """Block the emitter until the queue has room, caller holds the condition"""
+        started = time.monotonic()
+        while self._full():
+            self._condition.wait()
+        self._counts["blocked_puts"] += 1
+        self._counts["blocked_seconds"] += time.monotonic() - started
+
+    def _slot(self, event_type: str, event_data: Dict) -> Optional[Tuple]:
+        """Return the key that events replacing each other share"""
+        for key in self.coalesce_keys:
+            value = event_data.get(key)
+            if value is not None:
+                try:
+                    hash(value)
+                except TypeError:
+                    return None
+                return event_type, key, value
+        return None
+
+    def _append(self, event_type: str, event_data: Dict):
+        slot = self._slot(event_type, event_data)
+        entry = _Entry(event_type, event_data, slot)
+        self._entries.append(entry)
+        self._by_type.setdefault(event_type, deque()).append(entry)
+        if slot is not None:
+            self._slots[slot] = entry
+        self._size += 1
+        self._counts["enqueued"] += 1
+        self._condition.notify_all()
+
+    def _coalesce(self, event_type: str, event_data: Dict) -> bool:
+        """Overwrite the queued event with the same slot, returns False if there is none"""
+        slot = self._slot(event_type, event_data)
+        entry = self._slots.get(slot) if slot is not None else None
+        if entry is None:
+            return False
+        entry.event_data = event_data
+        self._counts["coalesced"] += 1
+        return True
+
+    def _drop_oldest(self, event_type: str) -> bool:
+        """Evict the oldest queued event of a type, returns False if there is none"""
+        queued = self._by_type.get(event_type)
+        while queued:
+            entry = queued.popleft()
+            if entry.alive:
+                self._release(entry, by_type=False)
+                self._counts["dropped_oldest"] += 1
+                if not queued:
+                    del self._by_type[event_type]
+                return True
+        return False
+
+    def _release(self, entry: _Entry, by_type: bool = True):
+        """Forget a popped or dropped entry, caller holds the condition"""
+        entry.alive = False
+        self._size -= 1
+        if entry.slot is not None and self._slots.get(entry.slot) is entry:
+            del self._slots[entry.slot]
+        if by_type:
+            queued = self._by_type[entry.event_type]
+            while queued and not queued[0].alive:
+                queued.popleft()
+            if not queued:
+                del self._by_type[entry.event_type]
@@ -0,0 +1,185 @@
+"""
+AI Agent Stack - Partitioned Event Dispatcher
+"""
+
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import threading
+import time
+import zlib
+
+from agent_stack.core.events.backpressure import BLOCK, EventQueue
+
+if TYPE_CHECKING:
+    from agent_stack.core.events import EventHandler
+
+_STOP = object()
+
+
+class _Lane:
+    """One ordered stream of events served by one worker thread at a time"""
+
+    __slots__ = ("index", "queue", "generation", "handler", "busy_since", "remaining")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.queue = EventQueue()
+        self.generation = 0
+        self.handler: Optional["EventHandler"] = None
+        self.busy_since: Optional[float] = None
+        # The event being delivered and the handlers still due after the current one
+        self.remaining: Optional[Tuple[str, Dict, List["EventHandler"]]] = None
+
+
+class PartitionedDispatcher:
+    """Runs event handlers on a pool of workers, ordered per partition key
+
+    Each event is routed to one of workers lanes by the value of the first
+    of partition_keys present in its data, or by its event type when none
+    is, so events for one agent or task are delivered in emit order while
+    different keys are delivered in parallel. Handlers are looked up when
+    an event is delivered. Lane queues take the bound, overflow policies
+    and coalescible types of the bus queue (see configure_queues), so a
+    full lane blocks the bus thread or drops events just like the bus
+    queue does instead of growing without limit.
+
+    A handler that runs longer than handler_timeout is abandoned: a
+    watchdog hands its lane to a fresh worker, which first delivers the
+    rest of the stalled event's handlers and then carries on with the
+    lane. The stalled worker checks the lane generation before every
+    handler call and exits once the handler returns, so a lane never has
+    two workers delivering at once.
+    """
+
+    def __init__(self,
+                 match: Callable[[str, Dict], List["EventHandler"]],
+                 deliver: Callable[["EventHandler", str, Dict], None],
+                 workers: int = 4,
+                 partition_keys: Sequence[str] = ("agent_id", "task_id"),
+                 handler_timeout: Optional[float] = 30.0):
+        if workers < 1:
+            raise ValueError(f"Dispatcher needs at least one worker: {workers}")
+
+        self.partition_keys = tuple(partition_keys)
+        self.handler_timeout = handler_timeout
+        self._match = match
+        self._deliver = deliver
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._counts = {"dispatched": 0, "handler_timeouts": 0}
+        self._lanes = [_Lane(i) for i in range(workers)]
+        for lane in self._lanes:
+            self._start_worker(lane)
+
+        self._watchdog = None
+        if handler_timeout is not None:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="event-dispatch-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    def partition(self, event_type: str, event_data: Dict) -> str:
+        """Return the ordering key of an event"""
+        for key in self.partition_keys:
+            value = event_data.get(key)
+            if value is not None:
+                return f"{key}={value}"
+        return event_type
+
+    def submit(self, event_type: str, event_data: Dict):
+        """Queue an event on the lane of its partition"""
+        # crc32 rather than hash() keeps routing stable across processes
+        key = self.partition(event_type, event_data)
+        lane = self._lanes[zlib.crc32(key.encode()) % len(self._lanes)]
+        lane.queue.put(event_type, event_data)
+
+    def set_coalescible(self, event_types: Iterable[str]):
+        """Coalesce these event types while they wait in a lane"""
+        for lane in self._lanes:
+            lane.queue.set_coalescible(event_types)
+
+    def configure_queues(self,
+                         maxsize: Optional[int] = None,
+                         default_policy: str = BLOCK,
+                         policies: Optional[Dict[str, str]] = None):
+        """Bound each lane and choose its overflow policies, see EventQueue"""
+        for lane in self._lanes:
+            lane.queue.configure(maxsize, default_policy, policies)
+
+    def stats(self) -> Dict[str, float]:
+        """Return dispatch counters, the current backlog and lane overflow counters"""
+        with self._lock:
+            counts: Dict[str, float] = dict(self._counts)
+        counts["backlog"] = sum(lane.queue.qsize() for lane in self._lanes)
+        for lane in self._lanes:
+            for name in ("coalesced", "dropped_oldest", "dropped_newest", "blocked_seconds"):
+                counts[f"lane_{name}"] = counts.get(f"lane_{name}", 0) + lane.queue.stats()[name]
+        return counts
+
+    def close(self):
+        """Stop the workers once the events queued so far are delivered"""
+        self._closed.set()
+        for lane in self._lanes:
+            # Unbounded so the stop marker is never dropped or held up
+            lane.queue.configure()
+            lane.queue.put(_STOP, {})
+
+    def _start_worker(self, lane: _Lane,
+                      resume: Optional[Tuple[str, Dict, List["EventHandler"]]] = None):
+        threading.Thread(
+            target=self._work, args=(lane, lane.generation, resume),
+            name=f"event-dispatch-{lane.index}", daemon=True
+        ).start()
+
+    def _work(self, lane: _Lane, generation: int,
+              resume: Optional[Tuple[str, Dict, List["EventHandler"]]]):
+        """Deliver a lane's events in order until stopped or replaced"""
+        if resume is not None:
+            self._run(lane, generation, *resume)
+
+        while lane.generation == generation:
+            event_type, event_data = lane.queue.get()
+            if event_type is _STOP:
+                return
+            self._run(lane, generation, event_type, event_data, self._match(event_type, event_data))
+
+    def _run(self, lane: _Lane, generation: int, event_type: str, event_data: Dict,
+             handlers: List["EventHandler"]):
+        """Call an event's handlers in turn, stopping if the lane is handed over"""
+        for position, handler in enumerate(handlers):
+            with self._lock:
+                if lane.generation != generation:
+                    return
+                lane.remaining = (event_type, event_data, handlers[position + 1:])
+                lane.handler, lane.busy_since = handler, time.monotonic()
+            self._deliver(handler, event_type, event_data)
+
+        with self._lock:
+            if lane.generation != generation:
+                return
+            lane.handler = lane.busy_since = lane.remaining = None
+            self._counts["dispatched"] += 1
+
+    def _watch(self):
+        """Replace the worker of any lane stuck in one handler past the timeout"""
+        while not self._closed.wait(self.handler_timeout / 4):
+            now = time.monotonic()
+            for lane in self._lanes:
+                with self._lock:
+                    started, handler = lane.busy_since, lane.handler
+                    if started is None or now - started < self.handler_timeout:
+                        continue
+
+                    # Checked and bumped under the lock the worker takes before
+                    # each handler, so the stalled worker cannot start another
+                    lane.generation += 1
+                    resume, lane.remaining = lane.remaining, None
+                    lane.handler = lane.busy_since = None
+                    self._counts["handler_timeouts"] += 1
+                self._start_worker(lane, resume)
+
+                from agent_stack.core.logging import SystemLogger
+                SystemLogger.error(
+                    "Event handler timed out",
+                    handler_id=handler.id if handler else None,
+                    timeout=self.handler_timeout
+                )
@@ -0,0 +1,99 @@
+"""
+AI Agent Stack - Event Handler Index
+"""
+
+from typing import TYPE_CHECKING, Dict, List
+import threading
+
+if TYPE_CHECKING:
+    from agent_stack.core.events import EventHandler
+
+
+class HandlerIndex:
+    """Handlers of one event type, bucketed by their equality filters
+
+    Unfiltered handlers match every event and are kept on their own. A
+    filtered handler is indexed under one of its key/value pairs, so an
+    event only looks up one bucket per distinct filter key instead of
+    testing every handler; the rest of the filter is checked on the few
+    candidates. Handlers whose indexed value is unhashable are scanned.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._all: Dict[str, "EventHandler"] = {}
+        self._unfiltered: Dict[str, "EventHandler"] = {}
+        self._scanned: Dict[str, "EventHandler"] = {}
+        # filter key -> filter value -> handler id -> handler
+        self._by_pair: Dict[str, Dict[object, Dict[str, "EventHandler"]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def add(self, handler: "EventHandler"):
+        """Index a handler under its filter"""
+        with self._lock:
+            self._all[handler.id] = handler
+            self._slot(handler, create=True)[handler.id] = handler
+
+    def remove(self, handler_id: str) -> bool:
+        """Drop a handler, returns False if it was not subscribed"""
+        with self._lock:
+            handler = self._all.pop(handler_id, None)
+            if handler is None:
+                return False
+
+            slot = self._slot(handler, create=False)
+            slot.pop(handler_id, None)
+            if not slot and slot is not self._unfiltered and slot is not self._scanned:
+                self._prune(handler)
+            return True
+
+    def match(self, event_data: Dict) -> List["EventHandler"]:
+        """Return the handlers whose filter matches an event"""
+        with self._lock:
+            matched = list(self._unfiltered.values())
+            for key, buckets in self._by_pair.items():
+                try:
+                    bucket = buckets.get(event_data.get(key))
+                except TypeError:
+                    # An unhashable event value equals no indexed value
+                    continue
+                if bucket:
+                    matched.extend(h for h in bucket.values() if h.matches(event_data))
+            matched.extend(h for h in self._scanned.values() if h.matches(event_data))
+            return matched
+
+    def _slot(self, handler: "EventHandler", create: bool) -> Dict[str, "EventHandler"]:
+        """Return the bucket a handler is indexed in, caller holds the lock"""
+        if not handler.event_filter:
+            return self._unfiltered
+
+        key = min(handler.event_filter)
+        value = handler.event_filter[key]
+        try:
+            hash(value)
+        except TypeError:
+            return self._scanned
+
+        buckets = self._by_pair.get(key)
+        if buckets is None:
+            if not create:
+                return {}
+            buckets = self._by_pair[key] = {}
+        bucket = buckets.get(value)
+        if bucket is None:
+            if not create:
+                return {}
+            bucket = buckets[value] = {}
+        return bucket
+
+    def _prune(self, handler: "EventHandler"):
+        """Drop the empty bucket left by a removed handler, caller holds the lock"""
+        key = min(handler.event_filter)
+        buckets = self._by_pair.get(key)
+        if buckets is None:
+            return
+        buckets.pop(handler.event_filter[key], None)
+        if not buckets:
+            del self._by_pair[key]
@@ -0,0 +1,94 @@
+"""
+AI Agent Stack - Topic Trie
+"""
+
+from typing import Dict, List, Optional, Tuple
+import threading
+
+from agent_stack.core.events.index import HandlerIndex
+
+SEPARATOR = "."
+ONE_LEVEL = "*"
+ANY_LEVELS = "#"
+
+
+def is_pattern(name: str) -> bool:
+    """Check whether a subscription names a hierarchical topic or wildcard pattern"""
+    return SEPARATOR in name or name in (ONE_LEVEL, ANY_LEVELS)
+
+
+class _Node:
+    __slots__ = ("children", "handlers")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.handlers: Optional[HandlerIndex] = None
+
+
+class TopicTrie:
+    """Subscriptions to dotted topics such as task.completed
+
+    A pattern segment of * matches exactly one topic segment and # matches
+    zero or more, so task.* covers every task event and # covers all.
+    Patterns are stored segment by segment in a trie; matching a topic walks
+    it once per segment, following only the literal, * and # branches, so
+    the cost depends on the topic's depth rather than on how many patterns
+    exist. Matches are cached per topic until the subscriptions change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._root = _Node()
+        self._cache: Dict[str, Tuple[HandlerIndex, ...]] = {}
+
+    def index_for(self, pattern: str) -> HandlerIndex:
+        """Return the handlers subscribed to a pattern, creating its branch"""
+        with self._lock:
+            node = self._root
+            for segment in pattern.split(SEPARATOR):
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _Node()
+                node = child
+            if node.handlers is None:
+                node.handlers = HandlerIndex()
+                self._cache.clear()
+            return node.handlers
+
+    def get(self, pattern: str) -> Optional[HandlerIndex]:
+        """Return the handlers subscribed to a pattern, if any"""
+        with self._lock:
+            node = self._root
+            for segment in pattern.split(SEPARATOR):
+                node = node.children.get(segment)
+                if node is None:
+                    return None
+            return node.handlers
+
+    def match(self, topic: str) -> Tuple[HandlerIndex, ...]:
+        """Return the handler sets of every pattern matching a topic"""
+        with self._lock:
+            matched = self._cache.get(topic)
+            if matched is None:
+                found: List[HandlerIndex] = []
+                self._walk(self._root, topic.split(SEPARATOR), 0, found)
+                # A # branch can reach the same pattern along several paths
+                matched = self._cache[topic] = tuple({id(h): h for h in found}.values())
+            return matched
+
+    def _walk(self, node: _Node, segments: List[str], position: int, found: List[HandlerIndex]):
+        if position == len(segments):
+            if node.handlers is not None:
+                found.append(node.handlers)
+        else:
+            child = node.children.get(segments[position])
+            if child is not None:
+                self._walk(child, segments, position + 1, found)
+            child = node.children.get(ONE_LEVEL)
+            if child is not None:
+                self._walk(child, segments, position + 1, found)
+
+        child = node.children.get(ANY_LEVELS)
+        if child is not None:
+            for rest in range(position, len(segments) + 1):
+                self._walk(child, segments, rest, found)
@@ -8,6 +8,35 @@ import json
 import threading
 import time
 
+class SchedulerMetrics:
+    """System-wide scheduler counters"""
+    
+    _lock = threading.Lock()
+    _counters: Dict[str, int] = {}
+    
+    @classmethod
+    def increment(cls, name: str, amount: int = 1):
+        """Add to a counter"""
+        with cls._lock:
+            cls._counters[name] = cls._counters.get(name, 0) + amount
+            
+    @classmethod
+    def get(cls, name: str) -> int:
+        """Get the current value of a counter"""
+        return cls._counters.get(name, 0)
+        
+    @classmethod
+    def snapshot(cls) -> Dict[str, int]:
+        """Get a copy of all counters"""
+        with cls._lock:
+            return dict(cls._counters)
+            
+    @classmethod
+    def reset(cls):
+        """Zero all counters"""
+        with cls._lock:
+            cls._counters.clear()
+
 class HeartbeatMonitor:
     """System-wide agent heartbeat monitoring"""
     
@@ -193,3 +222,26 @@ class HeartbeatMonitor:
             "healthy_agents": healthy_agents,
             "health_percentage": (healthy_agents / total_agents * 100) if total_agents > 0 else 0
         }
+        
+    @classmethod
+    def get_task_duration_estimates(cls) -> Dict:
+        """Get learned task duration statistics by task name and skill set"""
+        from agent_stack.core.tasks import TaskPool
+        
+        estimator = TaskPool._estimator
+        return estimator.snapshot() if estimator is not None else {}
+        
+    @classmethod
+    def get_deadline_metrics(cls) -> Dict:
+        """Get deadline outcomes of tasks scheduled with a deadline"""
+        met = SchedulerMetrics.get("deadline_met")
+        missed = SchedulerMetrics.get("deadline_missed")
+        rejected = SchedulerMetrics.get("deadline_rejected")
+        finished = met + missed + rejected
+        
+        return {
+            "deadline_met": met,
+            "deadline_missed": missed,
+            "deadline_rejected": rejected,
+            "miss_rate": (missed + rejected) / finished if finished > 0 else 0
+        }
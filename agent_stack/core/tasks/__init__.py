@@ -2,36 +2,313 @@
 AI Agent Stack - Task Management System
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, List, Optional, Set
+from abc import abstractmethod
+from collections import Counter, OrderedDict, deque
+from collections.abc import MutableSet
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+import asyncio
+import functools
+import sys
+import threading
+import time
 import uuid
 
-@dataclass
+from agent_stack.core.tasks.batching import TaskBatch
+from agent_stack.core.tasks.cache import result_key, stable_hash
+from agent_stack.core.tasks.graph import TopologicalOrder
+from agent_stack.core.tasks.ready_queue import ReadyQueue
+from agent_stack.core.tasks.retry import RetryPolicy
+from agent_stack.core.tasks.scheduling import PriorityPolicy, task_deadline
+from agent_stack.core.tasks.skills import SkillRegistry
+from agent_stack.core.tasks.timers import Timer, TimerQueue
+from agent_stack.core.tasks.waiters import Waiter, WaiterRegistry
+
+_EPOCH = datetime(1970, 1, 1)
+_EMPTY: FrozenSet[str] = frozenset()
+
+def _to_timestamp(value: Optional[datetime]) -> Optional[float]:
+    """Convert a naive UTC (or aware) datetime to epoch seconds"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH).total_seconds()
+
+def _from_timestamp(value: Optional[float]) -> Optional[datetime]:
+    """Convert epoch seconds back to a naive UTC datetime"""
+    return None if value is None else _EPOCH + timedelta(seconds=value)
+
+class _SetView(MutableSet):
+    """Mutable set interface over a task's shared, immutable set
+    
+    Reads go to the task's current frozenset and every write replaces it
+    with a new one, so tasks keep sharing storage until they are changed.
+    """
+    
+    __slots__ = ("_task",)
+    
+    def __init__(self, task: "Task"):
+        self._task = task
+    
+    @abstractmethod
+    def _get(self) -> FrozenSet[str]:
+        """Return the task's current set"""
+    
+    @abstractmethod
+    def _set(self, value: Iterable[str]):
+        """Replace the task's set"""
+    
+    @classmethod
+    def _from_iterable(cls, iterable: Iterable[str]) -> FrozenSet[str]:
+        # Set operators such as | and - return plain frozensets
+        return frozenset(iterable)
+    
+    def __contains__(self, value: object) -> bool:
+        return value in self._get()
+    
+    def __iter__(self):
+        return iter(self._get())
+    
+    def __len__(self) -> int:
+        return len(self._get())
+    
+    def add(self, value: str):
+        current = self._get()
+        if value not in current:
+            self._set(current | {value})
+    
+    def discard(self, value: str):
+        current = self._get()
+        if value in current:
+            self._set(current - {value})
+    
+    def __repr__(self) -> str:
+        return repr(self._get())
+
+class _DependencyView(_SetView):
+    __slots__ = ()
+    
+    def _get(self) -> FrozenSet[str]:
+        return self._task._dependencies
+    
+    def _set(self, value: Iterable[str]):
+        self._task.dependencies = value
+
+class _SkillView(_SetView):
+    __slots__ = ()
+    
+    def _get(self) -> FrozenSet[str]:
+        return SkillRegistry.skills(self._task.skill_mask)
+    
+    def _set(self, value: Iterable[str]):
+        self._task.required_skills = value
+
 class Task:
-    """Task definition and state"""
-    task_id: str = field(default_factory=lambda: f"task_{uuid.uuid4().hex[:8]}")
-    name: str = ""
-    description: str = ""
-    priority: int = 1
-    status: str = "PENDING"
-    progress: int = 0
-    assigned_agent: Optional[str] = None
-    dependencies: Set[str] = field(default_factory=set)
-    required_skills: Set[str] = field(default_factory=set)
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    estimated_duration: Optional[int] = None
-    actual_duration: Optional[int] = None
-    metadata: Dict = field(default_factory=dict)
+    """Task definition and state
+    
+    Instances are slotted to keep large pools compact. Timestamps are held
+    as epoch floats and exposed as naive UTC datetimes, status is interned,
+    required skills are held as a SkillRegistry mask, and empty dependency
+    sets and metadata dicts are shared until first written. dependencies
+    and required_skills read and write like sets, copying the shared
+    frozenset on the first change. Changes made after the task is added to
+    a pool are not re-linked into its graph.
+    """
+    
+    __slots__ = (
+        "task_id", "name", "description", "priority", "_status", "progress",
+        "assigned_agent", "_dependencies", "skill_mask", "_created_at",
+        "_started_at", "_completed_at", "estimated_duration",
+        "actual_duration", "_metadata",
+    )
+    
+    def __init__(self,
+                 task_id: Optional[str] = None,
+                 name: str = "",
+                 description: str = "",
+                 priority: int = 1,
+                 status: str = "PENDING",
+                 progress: int = 0,
+                 assigned_agent: Optional[str] = None,
+                 dependencies: Iterable[str] = _EMPTY,
+                 required_skills: Iterable[str] = _EMPTY,
+                 created_at: Optional[datetime] = None,
+                 started_at: Optional[datetime] = None,
+                 completed_at: Optional[datetime] = None,
+                 estimated_duration: Optional[int] = None,
+                 actual_duration: Optional[int] = None,
+                 metadata: Optional[Dict] = None):
+        self.task_id = task_id or f"task_{uuid.uuid4().hex[:8]}"
+        self.name = name
+        self.description = description
+        self.priority = priority
+        self.status = status
+        self.progress = progress
+        self.assigned_agent = assigned_agent
+        self.dependencies = dependencies
+        self.required_skills = required_skills
+        self._created_at = time.time() if created_at is None else _to_timestamp(created_at)
+        self.started_at = started_at
+        self.completed_at = completed_at
+        self.estimated_duration = estimated_duration
+        self.actual_duration = actual_duration
+        self.metadata = metadata
+    
+    @property
+    def status(self) -> str:
+        return self._status
+    
+    @status.setter
+    def status(self, value: str):
+        self._status = sys.intern(value)
+    
+    @property
+    def dependencies(self) -> MutableSet:
+        return _DependencyView(self)
+    
+    @dependencies.setter
+    def dependencies(self, value: Iterable[str]):
+        self._dependencies = frozenset(value) or _EMPTY
+    
+    @property
+    def required_skills(self) -> MutableSet:
+        return _SkillView(self)
+    
+    @required_skills.setter
+    def required_skills(self, value: Iterable[str]):
+        self.skill_mask = SkillRegistry.mask(value)
+    
+    @property
+    def metadata(self) -> Dict:
+        # Allocated on first access so idle tasks share no dict at all
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value: Optional[Dict]):
+        # A caller's dict is kept as given, even when empty
+        self._metadata = value
+    
+    @property
+    def created_at(self) -> datetime:
+        return _from_timestamp(self._created_at)
+    
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_at = _to_timestamp(value)
+    
+    @property
+    def started_at(self) -> Optional[datetime]:
+        return _from_timestamp(self._started_at)
+    
+    @started_at.setter
+    def started_at(self, value: Optional[datetime]):
+        self._started_at = _to_timestamp(value)
+    
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        return _from_timestamp(self._completed_at)
+    
+    @completed_at.setter
+    def completed_at(self, value: Optional[datetime]):
+        self._completed_at = _to_timestamp(value)
+    
+    @property
+    def created_timestamp(self) -> float:
+        """Creation time as epoch seconds, without building a datetime"""
+        return self._created_at
+    
+    @property
+    def completed_timestamp(self) -> Optional[float]:
+        """Completion time as epoch seconds, without building a datetime"""
+        return self._completed_at
+    
+    def _astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in TASK_FIELDS)
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in TASK_FIELDS)
+        return f"Task({fields})"
+
+# Public attribute names, in constructor order
+TASK_FIELDS = (
+    "task_id", "name", "description", "priority", "status", "progress",
+    "assigned_agent", "dependencies", "required_skills", "created_at",
+    "started_at", "completed_at", "estimated_duration", "actual_duration",
+    "metadata",
+)
+
+class Lease:
+    """Time-limited claim of a task by an agent"""
+    
+    __slots__ = ("task_id", "agent_id", "lease_seconds", "expires_at", "timer")
+    
+    def __init__(self, task_id: str, agent_id: str, lease_seconds: float):
+        self.task_id = task_id
+        self.agent_id = agent_id
+        self.lease_seconds = lease_seconds
+        self.expires_at = time.time() + lease_seconds
+        self.timer: Optional[Timer] = None
+    
+    def __repr__(self) -> str:
+        return (f"Lease(task_id={self.task_id!r}, agent_id={self.agent_id!r}, "
+                f"expires_at={self.expires_at!r})")
 
 class TaskPool:
-    """System-wide task management"""
+    """System-wide task management
+    
+    Thread safety: every change to task, graph, policy and store state holds
+    the pool lock. A claim first pops its candidate under only the lock of
+    the ready-queue bucket for the task's skill set, so agents with disjoint
+    skills search without contending and exactly one of them wins an entry;
+    the bucket lock is released before the pool lock is taken to re-check
+    and record the assignment. Lock order is pool lock, then bucket lock,
+    then agent lock.
+    """
     
+    _lock = threading.RLock()
+    _agent_lock = threading.Lock()
     _tasks: Dict[str, Task] = {}
     _agent_tasks: Dict[str, Set[str]] = {}
     _dependency_graph: Dict[str, Set[str]] = {}
+    _dependents: Dict[str, Set[str]] = {}
+    _unmet_dependencies: Dict[str, int] = {}
+    _topological_order: TopologicalOrder = TopologicalOrder(_dependents, _dependency_graph)
+    _policy = PriorityPolicy()
+    _ready: ReadyQueue = ReadyQueue(key=_policy.sort_key)
+    _store = None
+    _archive = None
+    _estimator = None
+    _retry_policy = RetryPolicy()
+    _cache = None
+    _cached_ready: Deque[Tuple[Task, Any]] = deque()
+    _draining = False
+    _finished: "OrderedDict[str, float]" = OrderedDict()
+    _pinned: Dict[str, float] = {}
+    _leases: Dict[str, Lease] = {}
+    _timers: TimerQueue = TimerQueue("task-pool-timers")
+    _waiters: WaiterRegistry = WaiterRegistry()
+    _speculation_policy = None
+    _speculative: ReadyQueue = ReadyQueue()
+    _attempts: Dict[str, Set[str]] = {}
+    _affinity_wait: Optional[float] = None
+    _reserved: Dict[str, ReadyQueue] = {}
+    _reserved_for: Dict[str, str] = {}
+    _agent_masks: Dict[str, int] = {}
+    _batch_policy = None
+    _batches: Dict[str, TaskBatch] = {}
+    _remote: Set[str] = set()
+    _claiming: Set[str] = set()
+    _store_recheck_seconds = 1.0
     
     @classmethod
     def create_task(cls, 
@@ -40,7 +317,8 @@ class TaskPool:
                    priority: int = 1,
                    dependencies: Set[str] = None,
                    required_skills: Set[str] = None,
-                   estimated_duration: Optional[int] = None) -> Task:
+                   estimated_duration: Optional[int] = None,
+                   metadata: Optional[Dict] = None) -> Task:
         """Create a new task"""
         task = Task(
             name=name,
@@ -48,79 +326,756 @@ class TaskPool:
             priority=priority,
             dependencies=dependencies or set(),
             required_skills=required_skills or set(),
-            estimated_duration=estimated_duration
+            estimated_duration=estimated_duration,
+            metadata=dict(metadata) if metadata else None
         )
+        cls._fill_estimate(task)
         
-        cls._tasks[task.task_id] = task
-        cls._update_dependency_graph(task)
+        with cls._lock:
+            cls._update_dependency_graph(task)
+            cls._tasks[task.task_id] = task
+            cls._unmet_dependencies[task.task_id] = cls._count_unmet_dependencies(task)
+            cls._apply_policy([task])
+            
+            if cls._is_ready(task):
+                cls._enqueue(task)
+            cls._persist(task, created=True)
+            
+            return task
+    
+    @classmethod
+    def create_tasks(cls, specs: Iterable[Dict]) -> List[Task]:
+        """Create a batch of tasks atomically
         
+        Each spec takes the create_task arguments plus optional task_id,
+        status ("PENDING" or "COMPLETED") and metadata. Dependencies may
+        reference tasks later in the same batch. The combined DAG is sorted
+        once and either every task is inserted or none is.
+        """
+        with cls._lock:
+            batch: Dict[str, Task] = {}
+            for spec in specs:
+                task = cls._build_task(spec)
+                if task.task_id in batch or task.task_id in cls._tasks:
+                    raise ValueError(f"Duplicate task id: {task.task_id}")
+                batch[task.task_id] = task
+                
+            tasks = cls._insert_batch(batch)
+            for task in tasks:
+                cls._persist(task, created=True)
+            cls._evict_finished()
+                
+            return tasks
+    
+    @classmethod
+    def _insert_batch(cls, batch: Dict[str, Task]) -> List[Task]:
+        """Link and insert built tasks in dependency order, all or nothing"""
+        ordered = cls._sort_batch(batch)
+        
+        linked = []
+        try:
+            for task in ordered:
+                cls._update_dependency_graph(task)
+                linked.append(task)
+        except ValueError:
+            for task in reversed(linked):
+                cls._unlink_dependencies(task)
+            raise
+            
+        for task in ordered:
+            cls._tasks[task.task_id] = task
+        for task in ordered:
+            cls._unmet_dependencies[task.task_id] = cls._count_unmet_dependencies(task)
+        cls._apply_policy(ordered)
+        
+        # Cache hits complete only after the batch is in place, so batch
+        # dependents are not released twice
+        draining, cls._draining = cls._draining, True
+        try:
+            cls._queue_batch(ordered, batch)
+        finally:
+            cls._draining = draining
+        cls._drain_cached()
+            
+        return ordered
+    
+    @classmethod
+    def _queue_batch(cls, ordered: List[Task], batch: Dict[str, Task]):
+        """Register finished, assigned and ready tasks of an inserted batch"""
+        for task in ordered:
+            if task.status == "FAILED":
+                # A rejected batch task may have failed and evicted this one
+                if task.task_id in cls._tasks:
+                    cls._finished.setdefault(task.task_id, time.time())
+            elif task.status == "COMPLETED":
+                cls._finished[task.task_id] = time.time()
+                # Batch dependents were counted against the final statuses
+                for dependent_id in list(cls._dependents.get(task.task_id, ())):
+                    if dependent_id not in batch:
+                        cls._release_dependent(dependent_id)
+            elif task.assigned_agent is not None:
+                with cls._agent_lock:
+                    cls._agent_tasks.setdefault(task.assigned_agent, set()).add(task.task_id)
+            else:
+                if task.status == "RETRYING":
+                    # Backoff timers do not survive a restart
+                    task.status = "PENDING"
+                if cls._is_ready(task):
+                    cls._enqueue(task)
+    
+    @classmethod
+    def _build_task(cls, spec: Dict) -> Task:
+        """Build a task from a create_tasks spec"""
+        status = spec.get("status", "PENDING")
+        if status not in ("PENDING", "COMPLETED"):
+            raise ValueError(f"Invalid initial task status: {status}")
+            
+        task = Task(
+            name=spec.get("name", ""),
+            description=spec.get("description", ""),
+            priority=spec.get("priority", 1),
+            status=status,
+            dependencies=spec.get("dependencies") or (),
+            required_skills=spec.get("required_skills") or (),
+            estimated_duration=spec.get("estimated_duration"),
+            metadata=dict(spec.get("metadata") or {})
+        )
+        if spec.get("task_id"):
+            task.task_id = spec["task_id"]
+        if status == "COMPLETED":
+            task.completed_at = task.created_at
+        cls._fill_estimate(task)
+            
         return task
     
+    @classmethod
+    def _sort_batch(cls, batch: Dict[str, Task]) -> List[Task]:
+        """Topologically sort a batch of tasks (Kahn's algorithm)"""
+        in_degree = {task_id: 0 for task_id in batch}
+        dependents: Dict[str, List[str]] = {}
+        
+        for task in batch.values():
+            for dep_id in task._dependencies:
+                if dep_id in batch:
+                    in_degree[task.task_id] += 1
+                    dependents.setdefault(dep_id, []).append(task.task_id)
+                    
+        queue = [task_id for task_id, degree in in_degree.items() if degree == 0]
+        ordered = []
+        while queue:
+            task_id = queue.pop()
+            ordered.append(batch[task_id])
+            for dependent_id in dependents.get(task_id, ()):
+                in_degree[dependent_id] -= 1
+                if in_degree[dependent_id] == 0:
+                    queue.append(dependent_id)
+                    
+        if len(ordered) != len(batch):
+            raise ValueError("Task dependencies would create a cycle")
+            
+        return ordered
+    
     @classmethod
     def _update_dependency_graph(cls, task: Task):
         """Update the dependency graph with a new task"""
-        cls._dependency_graph[task.task_id] = task.dependencies
+        task_id = task.task_id
+        cls._topological_order.add_node(task_id)
         
-        # Verify no cycles are created
-        if cls._has_dependency_cycle(task.task_id):
-            raise ValueError("Task dependencies would create a cycle")
+        # Verify no cycles are created before touching the graph
+        added = []
+        for dep_id in task._dependencies:
+            # Archived tasks are finished and can never be part of a cycle
+            if cls._is_archived_complete(dep_id):
+                continue
+            if not cls._topological_order.add_edge(dep_id, task_id):
+                for added_id in added:
+                    cls._dependents[added_id].discard(task_id)
+                if task_id not in cls._dependents:
+                    cls._topological_order.discard(task_id)
+                raise ValueError("Task dependencies would create a cycle")
+            cls._dependents.setdefault(dep_id, set()).add(task_id)
+            added.append(dep_id)
+        
+        cls._dependency_graph[task_id] = task._dependencies
+        
+    @classmethod
+    def _unlink_dependencies(cls, task: Task):
+        """Remove a task's edges from the dependency graph"""
+        for dep_id in task._dependencies:
+            dependents = cls._dependents.get(dep_id)
+            if dependents is not None:
+                dependents.discard(task.task_id)
+                
+        cls._dependency_graph.pop(task.task_id, None)
+        if not cls._dependents.get(task.task_id):
+            cls._topological_order.discard(task.task_id)
             
     @classmethod
-    def _has_dependency_cycle(cls, task_id: str, visited: Set[str] = None) -> bool:
-        """Check for dependency cycles"""
-        if visited is None:
-            visited = set()
+    def _count_unmet_dependencies(cls, task: Task) -> int:
+        """Count the dependencies of a task that are not completed yet"""
+        unmet = 0
+        for dep_id in task._dependencies:
+            dep_task = cls._tasks.get(dep_id)
+            if dep_task is None:
+                if not cls._is_archived_complete(dep_id):
+                    unmet += 1
+            elif dep_task.status != "COMPLETED":
+                unmet += 1
+        return unmet
+    
+    @classmethod
+    def _is_archived_complete(cls, task_id: str) -> bool:
+        """Check if a task was evicted to the archive after completing"""
+        if cls._archive is None or task_id in cls._tasks:
+            return False
+        return cls._archive.status(task_id) == "COMPLETED"
+        
+    @classmethod
+    def get_task(cls, agent_id: str, capabilities: Union[int, Iterable[str]]) -> Optional[Task]:
+        """Get next available task for an agent
+        
+        Capabilities may be names, AgentCapability members or a SkillRegistry mask.
+        """
+        mask = SkillRegistry.mask(capabilities)
+        task_id = cls._claim_ready(agent_id, mask)
+        if task_id is None and len(cls._speculative):
+            # Idle agents pick up duplicate attempts of stragglers
+            task_id = cls._pop_claim(cls._speculative, mask, agent_id, cls._claim_attempt)
+        if task_id is None:
+            return None
             
-        if task_id in visited:
-            return True
+        return cls._tasks[task_id]
+    
+    @classmethod
+    def _claim_ready(cls, agent_id: str, mask: int) -> Optional[str]:
+        """Claim the agent's best reserved task, or else the best ready task it can serve"""
+        # Affinity only reserves tasks for agents whose skills cover them
+        cls._agent_masks[agent_id] = mask
+        reserved = cls._reserved.get(agent_id)
+        if reserved is not None and len(reserved):
+            task_id = cls._pop_claim(reserved, mask, agent_id, cls._claim_reserved)
+            if task_id is not None:
+                return task_id
+        return cls._pop_claim(cls._ready, mask, agent_id, cls._claim_task)
+    
+    @classmethod
+    def _pop_claim(cls, queue: ReadyQueue, mask: int, agent_id: str,
+                   claim: Callable[[str, str], bool]) -> Optional[str]:
+        """Pop tasks from a queue until one is claimed for the agent
+        
+        The pop holds only the bucket lock; the claim takes the pool lock
+        itself and re-checks the task, which may have changed since.
+        """
+        while True:
+            task_id = queue.pop(mask)
+            if task_id is None:
+                return None
+            if claim(task_id, agent_id):
+                return task_id
+    
+    @classmethod
+    def configure_batching(cls, policy):
+        """Gang small ready tasks into one assignment under a BatchPolicy, None turns it off"""
+        with cls._lock:
+            cls._batch_policy = policy
+    
+    @classmethod
+    def get_batch(cls, agent_id: str,
+                  capabilities: Union[int, Iterable[str]]) -> Optional[TaskBatch]:
+        """Claim the next task for an agent together with small tasks like it
+        
+        The best task is claimed as by get_task, except that duplicate
+        attempts of stragglers are never batched. If it is small, further
+        small ready tasks with exactly its skill mask are claimed with it, up
+        to the policy's current batch size. Without a policy every batch
+        holds one task. Finish a batch with complete_batch.
+        """
+        started = time.perf_counter()
+        mask = SkillRegistry.mask(capabilities)
+        task_id = cls._claim_ready(agent_id, mask)
+        if task_id is None:
+            return None
             
-        visited.add(task_id)
+        task = cls._tasks[task_id]
+        tasks = [task]
+        policy = cls._batch_policy
+        if policy is not None and policy.is_small(task):
+            size = policy.batch_size()
+            sources = [(cls._ready, cls._claim_task)]
+            reserved = cls._reserved.get(agent_id)
+            if reserved is not None:
+                sources.insert(0, (reserved, cls._claim_reserved))
+            for queue, claim in sources:
+                while len(tasks) < size:
+                    task_id = queue.pop_exact(
+                        task.skill_mask,
+                        accept=lambda queued_id: policy.is_small(cls._tasks[queued_id])
+                    )
+                    if task_id is None:
+                        break
+                    if claim(task_id, agent_id):
+                        tasks.append(cls._tasks[task_id])
+                        
+        batch = TaskBatch(agent_id, tasks)
+        with cls._lock:
+            cls._batches[batch.batch_id] = batch
+        batch.overhead_seconds = time.perf_counter() - started
         
-        for dep_id in cls._dependency_graph.get(task_id, set()):
-            if cls._has_dependency_cycle(dep_id, visited):
-                return True
+        from agent_stack.core.monitoring import SchedulerMetrics
+        SchedulerMetrics.increment("batches_assigned")
+        SchedulerMetrics.increment("batched_tasks", len(tasks))
+        return batch
+    
+    @classmethod
+    def complete_batch(cls, batch_id: str, agent_id: str,
+                       results: Optional[Dict[str, Any]] = None,
+                       errors: Optional[Dict[str, str]] = None,
+                       overhead_seconds: float = 0.0) -> List[str]:
+        """Finish a batch in one call
+        
+        Tasks named in errors are failed with that error and every other
+        task is completed with its entry in results. Tasks that were taken
+        from the agent in the meantime are skipped. Returns the ids of the
+        tasks that were completed.
+        
+        overhead_seconds is the time the caller spent on the batch's
+        assignment outside the pool, such as transport or bookkeeping; the
+        batch policy adds it to the claim and completion time it measures.
+        """
+        started = time.perf_counter()
+        results = results or {}
+        errors = errors or {}
+        with cls._lock:
+            batch = cls._batches.get(batch_id)
+            if batch is None or batch.agent_id != agent_id:
+                raise ValueError(f"Batch not assigned to agent: {batch_id}")
                 
-        visited.remove(task_id)
-        return False
+            del cls._batches[batch_id]
+            completed = []
+            for task in batch.tasks:
+                if task.status == "COMPLETED" or task.assigned_agent != agent_id:
+                    continue
+                if task.task_id in errors:
+                    cls.fail_task(task.task_id, agent_id, errors[task.task_id])
+                else:
+                    cls.complete_task(task.task_id, agent_id, results.get(task.task_id))
+                    completed.append(task.task_id)
+                    
+            if cls._batch_policy is not None:
+                batch.overhead_seconds += time.perf_counter() - started + overhead_seconds
+                cls._batch_policy.observe(batch)
+            return completed
     
     @classmethod
-    def get_task(cls, agent_id: str, capabilities: List[str]) -> Optional[Task]:
-        """Get next available task for an agent"""
-        available_tasks = []
+    def wait_for_task(cls,
+                      agent_id: str,
+                      capabilities: Union[int, Iterable[str]],
+                      timeout: Optional[float] = None) -> Optional[Task]:
+        """Block until a task the agent can serve is claimed, or timeout passes
+        
+        The caller is parked instead of polling get_task; every task that
+        becomes ready wakes exactly one matching waiter. Returns None on
+        timeout.
+        """
+        mask = SkillRegistry.mask(capabilities)
+        deadline = None if timeout is None else time.monotonic() + timeout
         
-        for task in cls._tasks.values():
-            if cls._can_assign_task(task, agent_id, capabilities):
-                available_tasks.append(task)
+        while True:
+            # Park before trying so a task readied in between still wakes us
+            woken = threading.Event()
+            waiter = cls._waiters.add(mask, woken.set, agent_id)
+            task = cls.get_task(agent_id, mask)
+            if task is not None:
+                cls._release_waiter(waiter)
+                return task
                 
-        if not available_tasks:
-            return None
-            
-        # Sort by priority and select highest
-        task = max(available_tasks, key=lambda t: t.priority)
-        cls._assign_task(task, agent_id)
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not woken.wait(remaining) and cls._waiters.remove(waiter):
+                return None
+    
+    @classmethod
+    async def wait_for_task_async(cls,
+                                  agent_id: str,
+                                  capabilities: Union[int, Iterable[str]],
+                                  timeout: Optional[float] = None) -> Optional[Task]:
+        """Await a task the agent can serve, the asyncio form of wait_for_task"""
+        loop = asyncio.get_running_loop()
+        mask = SkillRegistry.mask(capabilities)
+        deadline = None if timeout is None else loop.time() + timeout
         
-        return task
+        while True:
+            # Bound per iteration so a late wakeup cannot reach a later waiter
+            woken = asyncio.Event()
+            registered: List[Waiter] = []
+            waiter = cls._waiters.add(
+                mask, functools.partial(cls._wake_async, loop, woken, registered), agent_id
+            )
+            registered.append(waiter)
+            task = cls.get_task(agent_id, mask)
+            if task is not None:
+                cls._release_waiter(waiter)
+                return task
+                
+            remaining = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                await asyncio.wait_for(woken.wait(), remaining)
+            except asyncio.TimeoutError:
+                if cls._waiters.remove(waiter):
+                    return None
     
     @classmethod
-    def _can_assign_task(cls, task: Task, agent_id: str, capabilities: List[str]) -> bool:
-        """Check if a task can be assigned to an agent"""
-        if task.status != "PENDING":
+    def _wake_async(cls, loop: asyncio.AbstractEventLoop, woken: asyncio.Event,
+                    registered: List[Waiter]):
+        """Set an async waiter's event from whichever thread readied a task"""
+        try:
+            loop.call_soon_threadsafe(woken.set)
+        except RuntimeError:
+            # The loop is closed, hand the wakeup to another waiter
+            cls._waiters.wake_one(registered[0].woken_by)
+    
+    @classmethod
+    def _release_waiter(cls, waiter: Waiter):
+        """Unpark a waiter that claimed a task, passing on a wakeup it no longer needs"""
+        if not cls._waiters.remove(waiter) and waiter.woken_by is not None:
+            cls._waiters.wake_one(waiter.woken_by)
+    
+    @classmethod
+    def _enqueue(cls, task: Task):
+        """Queue a newly ready task and wake one agent waiting for it"""
+        if not cls._check_deadline(task):
+            return
+            
+        if cls._cache is not None:
+            hit, result = cls._cached_result(task)
+            if hit:
+                cls._cached_ready.append((task, result))
+                cls._drain_cached()
+                return
+                
+        if cls._affinity_wait is not None:
+            agent_id = cls._preferred_agent(task)
+            # Only hold the task for an agent last seen able to run it
+            if agent_id is not None and SkillRegistry.matches(
+                    task.skill_mask, cls._agent_masks.get(agent_id, 0)):
+                cls._reserve(task, agent_id)
+                return
+                
+        cls._ready.push(task)
+        cls._waiters.wake_one(task.skill_mask)
+    
+    @classmethod
+    def _check_deadline(cls, task: Task) -> bool:
+        """Reject a ready task that can no longer meet its deadline
+        
+        Otherwise arm a timer for its latest start time, so a task left
+        waiting in the queue is rejected then instead of started late.
+        """
+        latest = cls._policy.latest_start(task)
+        if latest is None:
+            return True
+            
+        delay = latest - time.time()
+        if delay < 0:
+            cls._reject_task(task, "deadline_unreachable")
             return False
             
-        if task.assigned_agent is not None:
+        cls._timers.schedule(delay, cls._expire_deadline, task.task_id)
+        return True
+    
+    @classmethod
+    def _expire_deadline(cls, task_id: str):
+        """Reject a task still waiting at its latest start time"""
+        with cls._lock:
+            task = cls._tasks.get(task_id)
+            if task is None or task.status != "PENDING" or task.assigned_agent is not None:
+                return
+                
+            latest = cls._policy.latest_start(task)
+            if latest is None or time.time() < latest:
+                # Reassigned or re-estimated since the timer was armed
+                return
+                
+            # A claim in flight has popped the task already and rejects it itself
+            if cls._ready.remove(task_id) or cls._unreserve(task):
+                cls._reject_task(task, "deadline_unreachable")
+    
+    @classmethod
+    def _reject_task(cls, task: Task, reason: str):
+        """Fail a task and its dependents without running them"""
+        task.status = "FAILED"
+        task.metadata["failure_reason"] = reason
+        cls._finish_failed_task(task)
+        
+        from agent_stack.core.monitoring import SchedulerMetrics
+        from agent_stack.core.logging import SystemLogger
+        
+        SchedulerMetrics.increment("deadline_rejected")
+        SystemLogger.warning(
+            f"Task rejected: {task.task_id}",
+            extra={
+                "task_id": task.task_id,
+                "reason": reason,
+                "deadline": task_deadline(task)
+            }
+        )
+    
+    @classmethod
+    def configure_affinity(cls, max_wait_seconds: Optional[float]):
+        """Prefer the agent that completed most of a ready task's dependencies
+        
+        The task is held for that agent for up to max_wait_seconds before
+        any capable agent may take it, provided the capabilities the agent
+        last claimed with cover the task. get_task, lease_tasks and
+        get_batch all take the agent's held tasks first. None turns
+        affinity off.
+        """
+        with cls._lock:
+            cls._affinity_wait = max_wait_seconds
+    
+    @classmethod
+    def _preferred_agent(cls, task: Task) -> Optional[str]:
+        """Return the agent that completed most of a task's dependencies"""
+        votes = Counter()
+        for dep_id in task._dependencies:
+            dep = cls._tasks.get(dep_id)
+            if dep is not None and dep.status == "COMPLETED" and dep.assigned_agent:
+                votes[dep.assigned_agent] += 1
+        if not votes:
+            return None
+        return votes.most_common(1)[0][0]
+    
+    @classmethod
+    def _reserve(cls, task: Task, agent_id: str):
+        """Hold a ready task for one agent until the affinity wait runs out"""
+        reserved = cls._reserved.get(agent_id)
+        if reserved is None:
+            reserved = cls._reserved[agent_id] = ReadyQueue(key=lambda t: cls._ready.key(t))
+        reserved.push(task)
+        cls._reserved_for[task.task_id] = agent_id
+        cls._timers.schedule(cls._affinity_wait, cls._release_reservation, task.task_id, agent_id)
+        cls._waiters.wake_agent(agent_id, task.skill_mask)
+    
+    @classmethod
+    def _claim_reserved(cls, task_id: str, agent_id: str) -> bool:
+        """Claim a task held for the agent that produced its inputs"""
+        if not cls._claim_task(task_id, agent_id):
             return False
             
-        # Check capabilities
-        if not task.required_skills.issubset(set(capabilities)):
+        from agent_stack.core.monitoring import SchedulerMetrics
+        SchedulerMetrics.increment("affinity_hits")
+        return True
+    
+    @classmethod
+    def _release_reservation(cls, task_id: str, agent_id: str):
+        """Offer a task to any capable agent once its affinity wait is over"""
+        with cls._lock:
+            task = cls._tasks.get(task_id)
+            if task is None or cls._reserved_for.get(task_id) != agent_id:
+                return
+                
+            if cls._unreserve(task):
+                cls._ready.push(task)
+                cls._waiters.wake_one(task.skill_mask)
+                
+                from agent_stack.core.monitoring import SchedulerMetrics
+                SchedulerMetrics.increment("affinity_fallbacks")
+    
+    @classmethod
+    def _unreserve(cls, task: Task) -> bool:
+        """Drop a task's affinity reservation, returns False if it had none"""
+        agent_id = cls._reserved_for.pop(task.task_id, None)
+        if agent_id is None:
             return False
+        return cls._reserved[agent_id].remove(task.task_id)
+    
+    @classmethod
+    def lease_tasks(cls,
+                    agent_id: str,
+                    capabilities: Union[int, Iterable[str]],
+                    n: int,
+                    lease_seconds: float) -> List[Task]:
+        """Claim up to n tasks for an agent under renewable leases
+        
+        All claims are made in one call. A lease that is not renewed within
+        lease_seconds expires on the pool's timer queue and its task goes
+        back to the ready queue.
+        """
+        if lease_seconds <= 0:
+            raise ValueError(f"Lease duration must be positive: {lease_seconds}")
             
-        # Check dependencies
-        for dep_id in task.dependencies:
-            dep_task = cls._tasks.get(dep_id)
-            if not dep_task or dep_task.status != "COMPLETED":
+        mask = SkillRegistry.mask(capabilities)
+        tasks = []
+        while len(tasks) < n:
+            task_id = cls._claim_ready(agent_id, mask)
+            if task_id is None:
+                break
+                
+            with cls._lock:
+                task = cls._tasks.get(task_id)
+                # Reassigned between the claim and the lease
+                if task is None or task.assigned_agent != agent_id or task.status != "ASSIGNED":
+                    continue
+                cls._start_lease(task_id, agent_id, lease_seconds)
+                tasks.append(task)
+                
+        return tasks
+    
+    @classmethod
+    def renew_lease(cls, task_id: str, agent_id: str,
+                    lease_seconds: Optional[float] = None) -> Lease:
+        """Extend an agent's lease on a task, by its original duration by default"""
+        with cls._lock:
+            lease = cls._leases.get(task_id)
+            if lease is None or lease.agent_id != agent_id:
+                raise ValueError(f"Task not leased to agent: {agent_id}")
+                
+            return cls._start_lease(task_id, agent_id, lease_seconds or lease.lease_seconds)
+    
+    @classmethod
+    def get_lease(cls, task_id: str) -> Optional[Lease]:
+        """Get the active lease on a task"""
+        return cls._leases.get(task_id)
+    
+    @classmethod
+    def _start_lease(cls, task_id: str, agent_id: str, lease_seconds: float) -> Lease:
+        """Replace any lease on a task with a fresh one, caller holds the pool lock"""
+        cls._drop_lease(task_id)
+        lease = Lease(task_id, agent_id, lease_seconds)
+        lease.timer = cls._timers.schedule(lease_seconds, cls._expire_lease, lease)
+        cls._leases[task_id] = lease
+        return lease
+    
+    @classmethod
+    def _drop_lease(cls, task_id: str):
+        """Cancel the lease on a task, caller holds the pool lock"""
+        lease = cls._leases.pop(task_id, None)
+        if lease is not None:
+            cls._timers.cancel(lease.timer)
+    
+    @classmethod
+    def _expire_lease(cls, lease: Lease):
+        """Return a task whose lease ran out to the ready queue"""
+        with cls._lock:
+            # A renewal or completion replaced or removed this lease
+            if cls._leases.get(lease.task_id) is not lease:
+                return
+                
+            task = cls._tasks.get(lease.task_id)
+            if task is None or task.assigned_agent != lease.agent_id or task.status != "ASSIGNED":
+                cls._leases.pop(lease.task_id)
+                return
+                
+            cls.reassign_task(lease.task_id, reason="lease_expired")
+    
+    @classmethod
+    def _claim_task(cls, task_id: str, agent_id: str) -> bool:
+        """Assign a task popped from the ready queue, arbitrating through the store
+        
+        The task is re-checked under the pool lock because it may have been
+        assigned, rejected or queued again since it was popped. The store
+        claim runs without the pool lock, so claims are not serialised on
+        its round trips; meanwhile the task is in _claiming, which keeps
+        other local claims off it, and it is checked once more afterwards.
+        """
+        with cls._lock:
+            task = cls._tasks.get(task_id)
+            if task is None or task_id in cls._claiming or not cls._is_ready(task):
+                return False
+            # Drop an entry left by a reassignment back to the pool meanwhile
+            cls._ready.remove(task_id)
+            cls._unreserve(task)
+            
+            latest = cls._policy.latest_start(task)
+            if latest is not None and time.time() > latest:
+                cls._reject_task(task, "deadline_unreachable")
                 return False
                 
-        return True
+            store = cls._store
+            if store is None:
+                cls._assign_task(task, agent_id)
+                return True
+            cls._claiming.add(task_id)
+            
+        try:
+            claimed = store.try_claim(task_id, agent_id)
+        except Exception:
+            with cls._lock:
+                cls._claiming.discard(task_id)
+                if cls._tasks.get(task_id) is task:
+                    cls._ready.remove(task_id)
+                    cls._unreserve(task)
+                    if cls._is_ready(task):
+                        cls._enqueue(task)
+            raise
+            
+        with cls._lock:
+            cls._claiming.discard(task_id)
+            if not claimed:
+                # Another scheduler process sharing the store won this task
+                cls._remote.add(task_id)
+                cls._refresh_task(task_id, requeue=False)
+                return False
+                
+            if cls._tasks.get(task_id) is not task or not cls._is_ready(task):
+                # Changed here while the store decided; the local state wins
+                if task_id in cls._tasks:
+                    cls._persist(task)
+                return False
+            cls._ready.remove(task_id)
+            cls._unreserve(task)
+            cls._assign_task(task, agent_id)
+            return True
+    
+    @classmethod
+    def _refresh_task(cls, task_id: str, requeue: bool = True):
+        """Reload a task another scheduler claimed from the store row
+        
+        The row's state replaces the local copy. A task finished elsewhere
+        releases its dependents here, one without a row is dropped, and one
+        still pending or running elsewhere is looked at again after
+        _store_recheck_seconds. With requeue, a task found pending again
+        goes back to the local ready queue.
+        """
+        with cls._lock:
+            task = cls._tasks.get(task_id)
+            store = cls._store
+            if task is None or store is None or task_id not in cls._remote:
+                return
+                
+            load_state = getattr(store, "load_state", None)
+            state = load_state(task_id) if load_state is not None else None
+            if state is None:
+                cls._remote.discard(task_id)
+                cls._drop_task(task)
+                cls._release_pins(task)
+                return
+                
+            for name, value in state.items():
+                setattr(task, name, value)
+                
+            if task.status == "COMPLETED":
+                cls._remote.discard(task_id)
+                cls._finish_task(task)
+            elif task.status == "FAILED":
+                cls._remote.discard(task_id)
+                cls._finish_failed_task(task)
+            elif task.status == "PENDING" and requeue:
+                cls._remote.discard(task_id)
+                if cls._is_ready(task):
+                    cls._enqueue(task)
+            else:
+                cls._timers.schedule(cls._store_recheck_seconds, cls._refresh_task, task_id)
+    
+    @classmethod
+    def _is_ready(cls, task: Task) -> bool:
+        """Check if a task is pending with all dependencies completed"""
+        if task.status != "PENDING":
+            return False
+            
+        if task.assigned_agent is not None:
+            return False
+            
+        return cls._unmet_dependencies.get(task.task_id, 0) == 0
     
     @classmethod
     def _assign_task(cls, task: Task, agent_id: str):
@@ -129,80 +1084,653 @@ class TaskPool:
         task.assigned_agent = agent_id
         task.started_at = datetime.utcnow()
         
-        if agent_id not in cls._agent_tasks:
-            cls._agent_tasks[agent_id] = set()
-        cls._agent_tasks[agent_id].add(task.task_id)
+        with cls._agent_lock:
+            if agent_id not in cls._agent_tasks:
+                cls._agent_tasks[agent_id] = set()
+            cls._agent_tasks[agent_id].add(task.task_id)
+            
+        cls._persist(task)
+        cls._watch_straggler(task)
     
     @classmethod
-    def complete_task(cls, task_id: str, agent_id: str):
-        """Mark a task as completed"""
-        task = cls._tasks.get(task_id)
-        if not task:
-            raise ValueError(f"Task not found: {task_id}")
+    def configure_speculation(cls, policy):
+        """Launch duplicate attempts of stragglers under a SpeculationPolicy"""
+        cls._speculation_policy = policy
+    
+    @classmethod
+    def _watch_straggler(cls, task: Task, delay: Optional[float] = None):
+        """Arm a timer for when an assigned task would count as a straggler"""
+        policy = cls._speculation_policy
+        if policy is None:
+            return
             
-        if task.assigned_agent != agent_id:
-            raise ValueError(f"Task not assigned to agent: {agent_id}")
+        if delay is None:
+            delay = policy.threshold(task, cls._estimator)
+            if delay is None:
+                return
+        cls._timers.schedule(delay, cls._speculate, task.task_id, task.assigned_agent)
+    
+    @classmethod
+    def _speculate(cls, task_id: str, agent_id: str):
+        """Offer a duplicate attempt of a straggler to one idle capable agent"""
+        with cls._lock:
+            task = cls._tasks.get(task_id)
+            if (task is None or task.status != "ASSIGNED" or task.assigned_agent != agent_id
+                    or task_id in cls._speculative or cls._attempts.get(task_id)):
+                return
+                
+            cls._speculative.push(task)
+            if not cls._waiters.wake_one(task.skill_mask):
+                # Nobody is idle to take it; look again later
+                cls._speculative.remove(task_id)
+                cls._watch_straggler(task, cls._speculation_policy.recheck_seconds)
+    
+    @classmethod
+    def _claim_attempt(cls, task_id: str, agent_id: str) -> bool:
+        """Start a duplicate attempt of a running task on another agent"""
+        with cls._lock:
+            task = cls._tasks.get(task_id)
+            if task is None or task.status != "ASSIGNED" or task.assigned_agent == agent_id:
+                return False
+                
+            cls._attempts.setdefault(task_id, set()).add(agent_id)
+            with cls._agent_lock:
+                cls._agent_tasks.setdefault(agent_id, set()).add(task_id)
+                
+        from agent_stack.core.monitoring import SchedulerMetrics
+        SchedulerMetrics.increment("speculative_attempts")
+        return True
+    
+    @classmethod
+    def is_attempt_active(cls, task_id: str, agent_id: str) -> bool:
+        """Check if an agent should keep working on a task
+        
+        False once another attempt of the task has completed.
+        """
+        task = cls._tasks.get(task_id)
+        if task is None or task.status != "ASSIGNED":
+            return False
+        return task.assigned_agent == agent_id or agent_id in cls._attempts.get(task_id, ())
+    
+    @classmethod
+    def complete_task(cls, task_id: str, agent_id: str, result: Any = None):
+        """Mark a task as completed, optionally with its result
+        
+        With speculative execution the first attempt to complete wins and
+        later completions of the same task are ignored.
+        """
+        with cls._lock:
+            task = cls._tasks.get(task_id)
+            if not task:
+                raise ValueError(f"Task not found: {task_id}")
+                
+            if task.status == "COMPLETED":
+                return
+                
+            attempts = cls._attempts.get(task_id, set())
+            if task.assigned_agent != agent_id and agent_id not in attempts:
+                raise ValueError(f"Task not assigned to agent: {agent_id}")
+                
+            cls._attempts.pop(task_id, None)
+            if attempts:
+                cls._cancel_attempts(task, agent_id, attempts)
+                
+            task.status = "COMPLETED"
+            task.completed_at = datetime.utcnow()
+            task.actual_duration = (task.completed_at - task.started_at).total_seconds()
+            cls._record_deadline(task)
+            if cls._estimator is not None:
+                cls._estimator.observe(task.name, task.required_skills, task.actual_duration)
             
-        task.status = "COMPLETED"
-        task.completed_at = datetime.utcnow()
-        task.actual_duration = (task.completed_at - task.started_at).total_seconds()
+            with cls._agent_lock:
+                cls._agent_tasks[agent_id].remove(task_id)
+            cls._drop_lease(task_id)
+            cls._store_result(task, result)
+            cls._finish_task(task)
+    
+    @classmethod
+    def _cancel_attempts(cls, task: Task, winner: str, attempts: Set[str]):
+        """Hand a task to the attempt that finished first and cancel the rest"""
+        losers = (attempts | {task.assigned_agent}) - {winner, None}
+        with cls._agent_lock:
+            for agent_id in losers:
+                cls._agent_tasks.get(agent_id, set()).discard(task.task_id)
+        cls._speculative.remove(task.task_id)
         
-        cls._agent_tasks[agent_id].remove(task_id)
+        from agent_stack.core.monitoring import SchedulerMetrics
+        if winner != task.assigned_agent:
+            SchedulerMetrics.increment("speculative_wins")
+        task.assigned_agent = winner
+        
+        from agent_stack.core.events import SystemEventBus, SystemEvents
+        for agent_id in losers:
+            # We hold the pool lock, which handlers may need to drain the queue
+            SystemEventBus.emit(
+                SystemEvents.TASK_ATTEMPT_CANCELLED,
+                {
+                    "task_id": task.task_id,
+                    "agent_id": agent_id,
+                    "winner": winner
+                },
+                block=False
+            )
+    
+    @classmethod
+    def _finish_task(cls, task: Task):
+        """Persist a COMPLETED task and release its dependents"""
+        cls._policy.task_removed(task.task_id)
+        cls._persist(task)
         
         # Notify waiting tasks
-        cls._notify_dependent_tasks(task_id)
+        cls._notify_dependent_tasks(task.task_id)
+        cls._release_pins(task)
+        
+        cls._finished[task.task_id] = time.time()
+        cls._evict_finished()
+    
+    @classmethod
+    def _finish_failed_task(cls, task: Task):
+        """Persist a FAILED task and fail every task still waiting on it
+        
+        Dependents can never run, so each is FAILED with failure_reason
+        "dependency_failed" and the id of the task that failed first in
+        metadata["failed_dependency"]. All of them become evictable.
+        """
+        failed = [task]
+        for failed_task in failed:
+            for dependent_id in cls._dependents.get(failed_task.task_id, ()):
+                dependent = cls._tasks.get(dependent_id)
+                if dependent is None or dependent.status != "PENDING":
+                    continue
+                    
+                dependent.status = "FAILED"
+                dependent.metadata["failure_reason"] = "dependency_failed"
+                dependent.metadata["failed_dependency"] = task.task_id
+                failed.append(dependent)
+                
+        now = time.time()
+        for failed_task in failed:
+            cls._policy.task_removed(failed_task.task_id)
+            cls._persist(failed_task)
+            cls._release_pins(failed_task)
+            cls._finished[failed_task.task_id] = now
+        cls._evict_finished()
+        
+        if len(failed) > 1:
+            from agent_stack.core.monitoring import SchedulerMetrics
+            from agent_stack.core.logging import SystemLogger
+            
+            SchedulerMetrics.increment("dependency_failures", len(failed) - 1)
+            SystemLogger.warning(
+                f"Dependents failed with task: {task.task_id}",
+                extra={
+                    "task_id": task.task_id,
+                    "dependents": [failed_task.task_id for failed_task in failed[1:]]
+                }
+            )
+    
+    @classmethod
+    def configure_cache(cls, cache):
+        """Complete tasks from a ResultCache when their result is already known
+        
+        Tasks opt in with metadata["cacheable"]. Their key hashes the task
+        name, metadata["parameters"] and the result hashes of their
+        dependencies, so it is only known once they are ready. Completion
+        results are stored in metadata["result"] and, for cacheable tasks,
+        in the cache.
+        """
+        cls._cache = cache
+    
+    @classmethod
+    def _cached_result(cls, task: Task) -> Tuple[bool, Any]:
+        """Look up a ready cacheable task in the result cache"""
+        metadata = task._metadata
+        if not metadata or not metadata.get("cacheable"):
+            return False, None
+            
+        hashes = []
+        for dep_id in task._dependencies:
+            dep = cls.lookup_task(dep_id)
+            result_hash = dep.metadata.get("result_hash") if dep is not None else None
+            if result_hash is None:
+                return False, None
+            hashes.append(result_hash)
+            
+        metadata["cache_key"] = result_key(task.name, metadata.get("parameters"), hashes)
+        return cls._cache.get(metadata["cache_key"])
+    
+    @classmethod
+    def _store_result(cls, task: Task, result: Any):
+        """Record a completed task's result and publish it to the cache"""
+        if result is not None:
+            task.metadata["result"] = result
+        if cls._cache is None:
+            return
+            
+        task.metadata["result_hash"] = stable_hash(result)
+        cache_key = task.metadata.get("cache_key")
+        if cache_key is not None:
+            cls._cache.put(cache_key, result)
+    
+    @classmethod
+    def _drain_cached(cls):
+        """Complete queued cache hits, iteratively so hit chains cannot recurse"""
+        if cls._draining:
+            return
+            
+        cls._draining = True
+        try:
+            while cls._cached_ready:
+                task, result = cls._cached_ready.popleft()
+                now = datetime.utcnow()
+                task.status = "COMPLETED"
+                task.started_at = now
+                task.completed_at = now
+                task.actual_duration = 0
+                task.metadata["cache_hit"] = True
+                if result is not None:
+                    task.metadata["result"] = result
+                task.metadata["result_hash"] = stable_hash(result)
+                cls._finish_task(task)
+        finally:
+            cls._draining = False
+    
+    @classmethod
+    def fail_task(cls, task_id: str, agent_id: str, error: Optional[str] = None) -> bool:
+        """Record a failed attempt, parking the task for a delayed retry
+        
+        The attempt count is kept in metadata["retries"]. Until the retry
+        policy's max_retries is used up, the task waits in RETRYING for its
+        backoff on the pool's timer queue and then returns to the ready
+        queue; after that it is FAILED.
+        
+        Returns:
+            True if the task will be retried
+        """
+        with cls._lock:
+            task = cls._tasks.get(task_id)
+            if not task:
+                raise ValueError(f"Task not found: {task_id}")
+                
+            if cls._attempts.get(task_id) and cls._drop_attempt(task, agent_id):
+                # Another attempt of the task is still running
+                return True
+                
+            if task.assigned_agent != agent_id or task.status != "ASSIGNED":
+                raise ValueError(f"Task not assigned to agent: {agent_id}")
+                
+            with cls._agent_lock:
+                cls._agent_tasks[agent_id].discard(task_id)
+            cls._drop_lease(task_id)
+            
+            task.assigned_agent = None
+            retries = task.metadata.get("retries", 0)
+            if error is not None:
+                task.metadata["last_error"] = error
+                
+            from agent_stack.core.monitoring import SchedulerMetrics
+            
+            if retries >= cls._retry_policy.max_retries:
+                task.status = "FAILED"
+                task.metadata["failure_reason"] = "max_retries_exceeded"
+                cls._finish_failed_task(task)
+                SchedulerMetrics.increment("task_failures")
+                return False
+                
+            task.metadata["retries"] = retries + 1
+            task.status = "RETRYING"
+            cls._persist(task)
+            delay = cls._retry_policy.delay(retries + 1)
+            cls._timers.schedule(delay, cls._retry_task, task_id)
+            SchedulerMetrics.increment("task_retries")
+            
+        from agent_stack.core.logging import SystemLogger
+        
+        SystemLogger.info(
+            f"Task retry scheduled: {task_id}",
+            extra={
+                "task_id": task_id,
+                "agent_id": agent_id,
+                "attempt": retries + 1,
+                "delay_seconds": delay
+            }
+        )
+        return True
+    
+    @classmethod
+    def _drop_attempt(cls, task: Task, agent_id: str) -> bool:
+        """Stop one attempt of a speculatively executed task
+        
+        If the primary attempt fails, a duplicate attempt takes its place.
+        Returns False if the agent held no attempt of the task.
+        """
+        attempts = cls._attempts[task.task_id]
+        if agent_id == task.assigned_agent:
+            task.assigned_agent = attempts.pop()
+        elif agent_id in attempts:
+            attempts.discard(agent_id)
+        else:
+            return False
+            
+        if not attempts:
+            del cls._attempts[task.task_id]
+        with cls._agent_lock:
+            cls._agent_tasks.get(agent_id, set()).discard(task.task_id)
+        cls._persist(task)
+        return True
+    
+    @classmethod
+    def _retry_task(cls, task_id: str):
+        """Return a task to the ready queue once its backoff has passed"""
+        with cls._lock:
+            task = cls._tasks.get(task_id)
+            if task is None or task.status != "RETRYING":
+                return
+                
+            task.status = "PENDING"
+            cls._persist(task)
+            if cls._is_ready(task):
+                cls._enqueue(task)
+    
+    @classmethod
+    def configure_retries(cls, policy: RetryPolicy):
+        """Use a retry policy, e.g. RetryPolicy.from_config(settings.agent)"""
+        cls._retry_policy = policy
+    
+    @classmethod
+    def _record_deadline(cls, task: Task):
+        """Count whether a completed task finished by its deadline"""
+        deadline = task_deadline(task)
+        if deadline is None:
+            return
+            
+        from agent_stack.core.monitoring import SchedulerMetrics
+        
+        if task.completed_timestamp <= deadline:
+            SchedulerMetrics.increment("deadline_met")
+        else:
+            SchedulerMetrics.increment("deadline_missed")
     
     @classmethod
     def _notify_dependent_tasks(cls, completed_task_id: str):
         """Notify tasks that were waiting on this completion"""
-        for task_id, deps in cls._dependency_graph.items():
-            if completed_task_id in deps:
-                task = cls._tasks.get(task_id)
-                if task and task.status == "PENDING":
-                    # Check if all dependencies are now complete
-                    all_deps_complete = all(
-                        cls._tasks.get(dep_id).status == "COMPLETED"
-                        for dep_id in task.dependencies
-                    )
-                    if all_deps_complete:
-                        cls._notify_task_ready(task)
+        # Released tasks can be rejected and evicted, unlinking them from the set
+        for task_id in list(cls._dependents.get(completed_task_id, ())):
+            cls._release_dependent(task_id)
+    
+    @classmethod
+    def _release_dependent(cls, task_id: str):
+        """Count one dependency of a task as met, queueing it once ready"""
+        cls._unmet_dependencies[task_id] -= 1
+        
+        task = cls._tasks.get(task_id)
+        if task and cls._is_ready(task):
+            cls._enqueue(task)
+            cls._notify_task_ready(task)
     
     @classmethod
     def _notify_task_ready(cls, task: Task):
-        """Notify system that a task is ready for assignment"""
+        """Notify system that a task is ready for assignment, caller holds the pool lock"""
         from agent_stack.core.events import SystemEventBus
         
+        # Handlers may claim tasks, so waiting for room here could deadlock
         SystemEventBus.emit(
             "task_ready",
             {
                 "task_id": task.task_id,
                 "name": task.name,
                 "priority": task.priority
-            }
+            },
+            block=False
         )
     
+    @classmethod
+    def reset(cls):
+        """Clear all tasks, assignments and indexes"""
+        with cls._lock:
+            cls._tasks.clear()
+            cls._agent_tasks.clear()
+            cls._dependency_graph.clear()
+            cls._dependents.clear()
+            cls._unmet_dependencies.clear()
+            cls._topological_order = TopologicalOrder(cls._dependents, cls._dependency_graph)
+            cls._ready.clear()
+            cls._finished.clear()
+            cls._pinned.clear()
+            cls._leases.clear()
+            cls._timers.clear()
+            cls._policy.reset()
+            cls._store = None
+            cls._archive = None
+            cls._estimator = None
+            cls._cache = None
+            cls._cached_ready.clear()
+            cls._speculation_policy = None
+            cls._speculative.clear()
+            cls._attempts.clear()
+            cls._affinity_wait = None
+            cls._reserved.clear()
+            cls._reserved_for.clear()
+            cls._agent_masks.clear()
+            cls._batch_policy = None
+            cls._batches.clear()
+            cls._remote.clear()
+            cls._claiming.clear()
+    
+    @classmethod
+    def attach_store(cls, store):
+        """Persist pool state to a task store, loading the tasks it holds
+        
+        A store provides load(), save(task, created), flush() and
+        try_claim(task_id, agent_id); see SQLTaskStore and TaskJournal. The
+        store replaces the current pool contents. Every later state change
+        is handed to the store, and claims are arbitrated through it so
+        scheduler processes sharing one store never hand out the same task.
+        A task whose claim is lost is reloaded with load_state(task_id), if
+        the store has it, and followed until it finishes elsewhere.
+        """
+        with cls._lock:
+            archive, estimator, cache = cls._archive, cls._estimator, cls._cache
+            cls.reset()
+            cls._archive, cls._estimator, cls._cache = archive, estimator, cache
+            cls._insert_batch({task.task_id: task for task in store.load()})
+            cls._store = store
+    
+    @classmethod
+    def detach_store(cls):
+        """Flush and stop persisting to the attached task store"""
+        with cls._lock:
+            if cls._store is not None:
+                cls._store.flush()
+            cls._store = None
+    
+    @classmethod
+    def configure_scheduling(cls, policy):
+        """Rank ready tasks with a scheduling policy
+        
+        A policy provides sort_key(task), tasks_added(...), task_removed(id),
+        reset() and latest_start(task); see PriorityPolicy,
+        CriticalPathPolicy and DeadlinePolicy. Ready tasks are re-ranked
+        immediately.
+        """
+        with cls._lock:
+            policy.reset()
+            order = cls._topological_order.ordered(cls._tasks)
+            policy.tasks_added([cls._tasks[task_id] for task_id in order],
+                               cls._tasks, cls._dependency_graph, cls._dependents)
+            cls._policy = policy
+            cls._ready.key = policy.sort_key
+            for task in list(cls._tasks.values()):
+                if task.task_id in cls._ready:
+                    with cls._ready.lock_for(task):
+                        cls._ready.remove(task.task_id)
+                    if cls._check_deadline(task):
+                        cls._ready.push(task)
+    
+    @classmethod
+    def _apply_policy(cls, tasks: List[Task]):
+        """Let the policy see newly linked tasks and re-rank affected ready tasks"""
+        changed = cls._policy.tasks_added(tasks, cls._tasks, cls._dependency_graph, cls._dependents)
+        for task_id in changed:
+            if task_id in cls._ready:
+                cls._ready.push(cls._tasks[task_id])
+    
+    @classmethod
+    def configure_estimator(cls, estimator):
+        """Learn durations from completed tasks with a DurationEstimator
+        
+        New tasks created without an estimated_duration get the
+        estimator's estimate, which the scheduling policy then uses.
+        """
+        cls._estimator = estimator
+    
+    @classmethod
+    def estimate_duration(cls, name: str, skills: Iterable[str] = ()) -> Optional[float]:
+        """Get the learned duration estimate for a task name and skill set"""
+        if cls._estimator is None:
+            return None
+        return cls._estimator.estimate(name, skills)
+    
+    @classmethod
+    def _fill_estimate(cls, task: Task):
+        """Fill a missing duration estimate from the estimator"""
+        if task.estimated_duration is None and cls._estimator is not None:
+            task.estimated_duration = cls._estimator.estimate(task.name, task.required_skills)
+    
+    @classmethod
+    def configure_archive(cls, archive):
+        """Evict finished tasks to a TaskArchive under its retention policy"""
+        with cls._lock:
+            cls._archive = archive
+            cls._evict_finished()
+    
+    @classmethod
+    def _evict_finished(cls):
+        """Move finished tasks outside the retention policy to the archive"""
+        archive = cls._archive
+        if archive is None:
+            return
+            
+        now = time.time()
+        evicted = []
+        while cls._finished:
+            task_id, finished_at = next(iter(cls._finished.items()))
+            if not archive.should_evict(len(cls._finished) + len(cls._pinned), finished_at, now):
+                break
+                
+            del cls._finished[task_id]
+            if cls._has_unfinished_dependents(task_id):
+                # Still needed for dependency release, set aside until
+                # _release_pins sees its last dependent finish
+                cls._pinned[task_id] = finished_at
+                continue
+                
+            evicted.append(cls._tasks[task_id])
+            
+        archive.put_many(evicted)
+        for task in evicted:
+            cls._drop_task(task)
+    
+    @classmethod
+    def _release_pins(cls, task: Task):
+        """Make pinned dependencies of a finished or dropped task evictable again"""
+        if not cls._pinned:
+            return
+        for dep_id in task._dependencies:
+            finished_at = cls._pinned.get(dep_id)
+            if finished_at is not None and not cls._has_unfinished_dependents(dep_id):
+                del cls._pinned[dep_id]
+                # Older than anything finished since, so first in line
+                cls._finished[dep_id] = finished_at
+                cls._finished.move_to_end(dep_id, last=False)
+    
+    @classmethod
+    def _has_unfinished_dependents(cls, task_id: str) -> bool:
+        """Check if any task in the pool still waits on this one"""
+        for dependent_id in cls._dependents.get(task_id, ()):
+            dependent = cls._tasks.get(dependent_id)
+            if dependent is not None and dependent.status not in ("COMPLETED", "FAILED"):
+                return True
+        return False
+    
+    @classmethod
+    def _drop_task(cls, task: Task):
+        """Remove a task and its indexes from the in-memory pool"""
+        task_id = task.task_id
+        del cls._tasks[task_id]
+        cls._unlink_dependencies(task)
+        cls._dependents.pop(task_id, None)
+        cls._topological_order.discard(task_id)
+        cls._unmet_dependencies.pop(task_id, None)
+        cls._policy.task_removed(task_id)
+    
+    @classmethod
+    def lookup_task(cls, task_id: str) -> Optional[Task]:
+        """Get a task by id from the pool or, if evicted, the archive"""
+        task = cls._tasks.get(task_id)
+        if task is None and cls._archive is not None:
+            task = cls._archive.get(task_id)
+        return task
+    
+    @classmethod
+    def _persist(cls, task: Task, created: bool = False):
+        """Hand a task's current state to the attached store"""
+        store = cls._store
+        if store is not None:
+            store.save(task, created=created)
+    
+    @classmethod
+    def list_tasks(cls) -> List[Task]:
+        """Get every task in the pool"""
+        return list(cls._tasks.values())
+    
+    @classmethod
+    def snapshot_tasks(cls, encode: Callable[[Task], Any]) -> List[Any]:
+        """Encode every task in the pool while holding the pool lock"""
+        with cls._lock:
+            return [encode(task) for task in cls._tasks.values()]
+    
     @classmethod
     def get_agent_tasks(cls, agent_id: str) -> List[Task]:
         """Get all tasks assigned to an agent"""
-        task_ids = cls._agent_tasks.get(agent_id, set())
+        with cls._agent_lock:
+            task_ids = list(cls._agent_tasks.get(agent_id, ()))
         return [cls._tasks[task_id] for task_id in task_ids]
     
     @classmethod
-    def reassign_task(cls, task_id: str, new_agent_id: Optional[str] = None):
+    def reassign_task(cls, task_id: str, new_agent_id: Optional[str] = None,
+                      reason: str = "manual_reassignment"):
         """Reassign a task to a new agent or back to the pool"""
-        task = cls._tasks.get(task_id)
-        if not task:
-            raise ValueError(f"Task not found: {task_id}")
-            
-        old_agent_id = task.assigned_agent
-        if old_agent_id:
-            cls._agent_tasks[old_agent_id].remove(task_id)
+        with cls._lock:
+            task = cls._tasks.get(task_id)
+            if not task:
+                raise ValueError(f"Task not found: {task_id}")
+                
+            cls._drop_lease(task_id)
+            cls._speculative.remove(task_id)
+            for agent_id in cls._attempts.pop(task_id, ()):
+                with cls._agent_lock:
+                    cls._agent_tasks.get(agent_id, set()).discard(task_id)
             
-        if new_agent_id:
-            cls._assign_task(task, new_agent_id)
-        else:
-            task.status = "PENDING"
-            task.assigned_agent = None
+            # A claim that popped the task re-checks it under the pool lock
+            cls._remote.discard(task_id)
+            old_agent_id = task.assigned_agent
+            if old_agent_id:
+                with cls._agent_lock:
+                    cls._agent_tasks.get(old_agent_id, set()).discard(task_id)
+                
+            cls._unreserve(task)
+            if new_agent_id:
+                cls._ready.remove(task_id)
+                cls._assign_task(task, new_agent_id)
+            else:
+                task.status = "PENDING"
+                task.assigned_agent = None
+                cls._finished.pop(task_id, None)
+                cls._pinned.pop(task_id, None)
+                cls._persist(task)
+                if cls._is_ready(task):
+                    cls._enqueue(task)
             
         # Log reassignment
         from agent_stack.core.logging import SystemLogger
@@ -213,6 +1741,6 @@ class TaskPool:
                 "task_id": task_id,
                 "old_agent": old_agent_id,
                 "new_agent": new_agent_id,
-                "reason": "manual_reassignment"
+                "reason": reason
             }
         )
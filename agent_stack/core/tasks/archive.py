@@ -0,0 +1,130 @@
+"""
+AI Agent Stack - Finished Task Archive
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional, Union
+import json
+import sqlite3
+import threading
+import zlib
+
+from agent_stack.core.tasks import TASK_FIELDS, Task
+
+class TaskArchive:
+    """On-disk tier for finished tasks evicted from the TaskPool
+
+    Tasks are stored as compressed records in a SQLite file keyed by task id.
+    The status column is kept separate so dependency checks can be answered
+    without rehydrating the full task.
+
+    Retention is by count (keep at most keep_finished finished tasks in
+    memory) and/or by age (evict tasks finished more than max_age_seconds
+    ago). Only tasks with no unfinished dependents are ever evicted.
+    """
+
+    def __init__(self,
+                 path: Union[str, Path],
+                 keep_finished: Optional[int] = 10000,
+                 max_age_seconds: Optional[float] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.keep_finished = keep_finished
+        self.max_age_seconds = max_age_seconds
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS archived_tasks ("
+            " task_id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " completed_at REAL,"
+            " record BLOB NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def should_evict(self, finished_count: int, finished_at: float, now: float) -> bool:
+        """Check whether the oldest finished task falls outside the retention policy"""
+        if self.keep_finished is not None and finished_count > self.keep_finished:
+            return True
+
+        if self.max_age_seconds is not None and now - finished_at > self.max_age_seconds:
+            return True
+
+        return False
+
+    def put_many(self, tasks: Iterable[Task]):
+        """Archive finished tasks in one transaction"""
+        rows = [
+            (
+                task.task_id,
+                task.status,
+                _to_epoch(task.completed_at),
+                zlib.compress(json.dumps(_encode(task), default=str).encode()),
+            )
+            for task in tasks
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO archived_tasks VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def status(self, task_id: str) -> Optional[str]:
+        """Get the final status of an archived task"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM archived_tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """Rehydrate an archived task"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM archived_tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        return _decode(json.loads(zlib.decompress(row[0])))
+
+    def __contains__(self, task_id: str) -> bool:
+        return self.status(task_id) is not None
+
+    def close(self):
+        """Close the archive database"""
+        with self._lock:
+            self._conn.close()
+
+
+_DATETIME_FIELDS = ("created_at", "started_at", "completed_at")
+
+def _to_epoch(value: Optional[datetime]) -> Optional[float]:
+    return None if value is None else value.replace(tzinfo=timezone.utc).timestamp()
+
+def _encode(task: Task) -> dict:
+    """Encode a task as a JSON-compatible dict"""
+    record = {name: getattr(task, name) for name in TASK_FIELDS}
+    record["dependencies"] = sorted(task.dependencies)
+    record["required_skills"] = sorted(task.required_skills)
+    for field in _DATETIME_FIELDS:
+        if record[field] is not None:
+            record[field] = record[field].isoformat()
+    return record
+
+def _decode(record: dict) -> Task:
+    """Decode a dict produced by _encode"""
+    record["dependencies"] = set(record["dependencies"])
+    record["required_skills"] = set(record["required_skills"])
+    for field in _DATETIME_FIELDS:
+        if record[field] is not None:
+            record[field] = datetime.fromisoformat(record[field])
+    return Task(**record)
@@ -0,0 +1,100 @@
+"""
+AI Agent Stack - Micro-Task Batching Policy
+"""
+
+from typing import TYPE_CHECKING, List
+import math
+import time
+import uuid
+
+if TYPE_CHECKING:
+    from agent_stack.core.tasks import Task
+
+
+class TaskBatch:
+    """Small tasks with the same skill mask handed to one agent as one assignment"""
+
+    __slots__ = ("batch_id", "agent_id", "tasks", "started_at", "expected_work", "overhead_seconds")
+
+    def __init__(self, agent_id: str, tasks: List["Task"]):
+        self.batch_id = f"batch_{uuid.uuid4().hex}"
+        self.agent_id = agent_id
+        self.tasks = tasks
+        self.started_at = time.monotonic()
+        self.expected_work = sum(task.estimated_duration or 0.0 for task in tasks)
+        # Measured cost of claiming and completing the batch, not of its work
+        self.overhead_seconds = 0.0
+
+    @property
+    def task_ids(self) -> List[str]:
+        return [task.task_id for task in self.tasks]
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __repr__(self) -> str:
+        return (f"TaskBatch(batch_id={self.batch_id!r}, agent_id={self.agent_id!r}, "
+                f"tasks={self.task_ids!r})")
+
+
+class BatchPolicy:
+    """Which ready tasks to gang together and how many per batch
+
+    A task is small when its estimated_duration is at most
+    small_task_seconds. The fixed cost of one assignment is each finished
+    batch's overhead_seconds: the time measured claiming and completing it
+    in the pool, plus whatever the caller reports for its side of the round
+    trip. The task time is the batch's mean estimate. Both are smoothed,
+    and the batch size is the smallest that keeps that cost under
+    max_overhead_ratio of the batched work, clamped to [min_size, max_size].
+    """
+
+    def __init__(self,
+                 small_task_seconds: float = 1.0,
+                 max_overhead_ratio: float = 0.1,
+                 min_size: int = 1,
+                 max_size: int = 64,
+                 initial_size: int = 8,
+                 alpha: float = 0.2):
+        if not 1 <= min_size <= max_size:
+            raise ValueError(f"Invalid batch size bounds: {min_size}..{max_size}")
+        if max_overhead_ratio <= 0:
+            raise ValueError(f"Overhead ratio must be positive: {max_overhead_ratio}")
+
+        self.small_task_seconds = small_task_seconds
+        self.max_overhead_ratio = max_overhead_ratio
+        self.min_size = min_size
+        self.max_size = max_size
+        self.alpha = alpha
+
+        self.overhead = None
+        self.task_seconds = None
+        self._size = max(min_size, min(max_size, initial_size))
+
+    def is_small(self, task: "Task") -> bool:
+        """Check whether a task is short enough to be batched"""
+        return (task.estimated_duration is not None
+                and task.estimated_duration <= self.small_task_seconds)
+
+    def batch_size(self) -> int:
+        """Return how many tasks the next batch should hold"""
+        return self._size
+
+    def observe(self, batch: TaskBatch):
+        """Learn the per-assignment overhead from a finished batch"""
+        if not batch.tasks:
+            return
+
+        overhead = max(0.0, batch.overhead_seconds)
+        task_seconds = batch.expected_work / len(batch)
+        if self.overhead is None:
+            self.overhead, self.task_seconds = overhead, task_seconds
+        else:
+            self.overhead += self.alpha * (overhead - self.overhead)
+            self.task_seconds += self.alpha * (task_seconds - self.task_seconds)
+
+        if self.task_seconds > 0:
+            size = math.ceil(self.overhead / (self.max_overhead_ratio * self.task_seconds))
+        else:
+            size = self.max_size
+        self._size = max(self.min_size, min(self.max_size, size))
@@ -0,0 +1,117 @@
+"""
+AI Agent Stack - Task Result Cache
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+import hashlib
+import json
+import sqlite3
+import threading
+import zlib
+
+def stable_hash(value: Any) -> str:
+    """Return a SHA-256 hex digest of a JSON-serialisable value, independent of key order"""
+    data = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+def result_key(task_type: str, parameters: Any, dependency_hashes: Iterable[str]) -> str:
+    """Return the content address of a task's result
+
+    Two tasks share a key when they have the same type, the same parameters
+    and dependencies that produced the same results.
+    """
+    return stable_hash({
+        "type": task_type,
+        "parameters": parameters,
+        "dependencies": sorted(dependency_hashes),
+    })
+
+class ResultCache:
+    """Two-tier content-addressed store of task results
+
+    Lookups go to a size-bounded in-memory LRU first and then to an optional
+    SQLite file that keeps every result written, so a hit on disk is
+    promoted back into memory. Writes go to both tiers.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        self._conn = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " cache_key TEXT PRIMARY KEY,"
+                " result BLOB NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Look up a result, returns (hit, result)"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._record("memory_hits")
+                return True, self._memory[key]
+
+            row = None
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT result FROM results WHERE cache_key = ?", (key,)
+                ).fetchone()
+            if row is None:
+                self._record("misses")
+                return False, None
+
+            result = json.loads(zlib.decompress(row[0]))
+            self._remember(key, result)
+            self._record("disk_hits")
+            return True, result
+
+    def put(self, key: str, result: Any):
+        """Store a result under its content address"""
+        with self._lock:
+            self._remember(key, result)
+            if self._conn is not None:
+                data = zlib.compress(json.dumps(result, default=str).encode())
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?)", (key, data)
+                )
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counts and the hit ratio"""
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = sum(counts.values())
+        counts["hit_ratio"] = (lookups - counts["misses"]) / lookups if lookups else 0.0
+        return counts
+
+    def close(self):
+        """Close the disk tier"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: str, result: Any):
+        """Insert into the memory tier, evicting the least recently used"""
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _record(self, outcome: str):
+        from agent_stack.core.monitoring import SchedulerMetrics
+
+        self._counts[outcome] += 1
+        SchedulerMetrics.increment(f"result_cache_{outcome}")
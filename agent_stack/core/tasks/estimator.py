@@ -0,0 +1,236 @@
+"""
+AI Agent Stack - Task Duration Estimator
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import bisect
+import json
+import os
+import threading
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+class P2Quantile:
+    """Streaming quantile estimate with the P-square algorithm
+
+    Five markers track the minimum, the p/2, p and (1+p)/2 quantiles and the
+    maximum; each observation moves marker heights along a piecewise
+    parabola, so memory and update cost are constant.
+    """
+
+    __slots__ = ("p", "heights", "positions", "desired")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights: List[float] = []
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+
+    def add(self, value: float):
+        """Add one observation"""
+        heights = self.heights
+        if len(heights) < 5:
+            bisect.insort(heights, value)
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = bisect.bisect_right(heights, value) - 1
+
+        positions = self.positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        p = self.p
+        for i, increment in enumerate((0, p / 2, p, (1 + p) / 2, 1)):
+            self.desired[i] += increment
+
+        for i in (1, 2, 3):
+            offset = self.desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1)
+                    or (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (
+                        positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def value(self) -> Optional[float]:
+        """Return the current estimate, exact while fewer than five values were seen"""
+        heights = self.heights
+        if len(heights) == 5:
+            return heights[2]
+        if not heights:
+            return None
+        return heights[min(len(heights) - 1, int(round(self.p * (len(heights) - 1))))]
+
+    def _parabolic(self, i: int, step: int) -> float:
+        heights, positions = self.heights, self.positions
+        return heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+            (positions[i] - positions[i - 1] + step) * (heights[i + 1] - heights[i])
+            / (positions[i + 1] - positions[i])
+            + (positions[i + 1] - positions[i] - step) * (heights[i] - heights[i - 1])
+            / (positions[i] - positions[i - 1])
+        )
+
+class DurationStats:
+    """Running duration statistics for one task name or skill set"""
+
+    __slots__ = ("count", "mean", "variance", "quantiles")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.quantiles = [P2Quantile(p) for p in QUANTILES]
+
+    def add(self, duration: float, alpha: float):
+        """Fold one observed duration into the EWMA, variance and sketches"""
+        if self.count == 0:
+            self.mean = duration
+        else:
+            # Exponentially weighted mean and variance (West, 1979)
+            diff = duration - self.mean
+            increment = alpha * diff
+            self.mean += increment
+            self.variance = (1 - alpha) * (self.variance + diff * increment)
+        self.count += 1
+        for quantile in self.quantiles:
+            quantile.add(duration)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "ewma": self.mean,
+            "variance": self.variance,
+            **{f"p{round(q.p * 100)}": q.value() for q in self.quantiles},
+        }
+
+class DurationEstimator:
+    """Learned task duration estimates from completed tasks
+
+    Statistics are kept per task name and per required skill set. A task is
+    estimated from its name once that has min_samples observations, and
+    from its skill set otherwise. Updates are O(1). With a path, state is
+    loaded on construction and written atomically every save_every
+    observations and on save().
+    """
+
+    def __init__(self,
+                 path: Optional[Union[str, Path]] = None,
+                 alpha: float = 0.2,
+                 min_samples: int = 3,
+                 save_every: int = 100):
+        if not 0 < alpha <= 1:
+            raise ValueError(f"Smoothing factor must be in (0, 1]: {alpha}")
+
+        self.path = Path(path) if path is not None else None
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.save_every = save_every
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, DurationStats] = {}
+        self._unsaved = 0
+
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def observe(self, name: str, skills: Iterable[str], duration: float):
+        """Record the actual duration of a completed task"""
+        with self._lock:
+            for key in self._keys(name, skills):
+                if key is None:
+                    continue
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = DurationStats()
+                stats.add(duration, self.alpha)
+
+            self._unsaved += 1
+            if self.path is not None and self._unsaved >= self.save_every:
+                self._save()
+
+    def _select(self, name: str, skills: Iterable[str]) -> Optional[DurationStats]:
+        """Pick the statistics to estimate from, caller holds the lock"""
+        by_name, by_skills = self._keys(name, skills)
+        stats = self._stats.get(by_name)
+        if stats is None or stats.count < self.min_samples:
+            stats = self._stats.get(by_skills) or stats
+        return stats
+
+    def estimate(self, name: str, skills: Iterable[str] = (),
+                 quantile: Optional[float] = None) -> Optional[float]:
+        """Estimate a task's duration, the EWMA unless a tracked quantile is asked for"""
+        with self._lock:
+            stats = self._select(name, skills)
+            if stats is None:
+                return None
+            if quantile is None:
+                return stats.mean
+            for sketch in stats.quantiles:
+                if sketch.p == quantile:
+                    return sketch.value()
+        raise ValueError(f"Quantile not tracked: {quantile}")
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return all statistics keyed by "name:..." and "skills:..." for monitoring"""
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._stats.items()}
+
+    def save(self):
+        """Write the estimator state to its path"""
+        with self._lock:
+            self._save()
+
+    @staticmethod
+    def _keys(name: str, skills: Iterable[str]):
+        # Unnamed tasks are only grouped by skill set
+        return (f"name:{name}" if name else None), "skills:" + ",".join(sorted(skills))
+
+    def _save(self):
+        """Atomically replace the state file, caller holds the lock"""
+        if self.path is None:
+            return
+
+        state = {
+            key: {
+                "count": stats.count,
+                "mean": stats.mean,
+                "variance": stats.variance,
+                "quantiles": [[q.p, q.heights, q.positions, q.desired] for q in stats.quantiles],
+            }
+            for key, stats in self._stats.items()
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        with open(temporary, "w") as f:
+            json.dump({"alpha": self.alpha, "stats": state}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+        self._unsaved = 0
+
+    def _load(self):
+        """Restore state written by _save"""
+        with open(self.path) as f:
+            state = json.load(f)
+
+        for key, record in state["stats"].items():
+            stats = DurationStats()
+            stats.count = record["count"]
+            stats.mean = record["mean"]
+            stats.variance = record["variance"]
+            stats.quantiles = []
+            for p, heights, positions, desired in record["quantiles"]:
+                sketch = P2Quantile(p)
+                sketch.heights, sketch.positions, sketch.desired = heights, positions, desired
+                stats.quantiles.append(sketch)
+            self._stats[key] = stats
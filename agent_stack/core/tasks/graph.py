@@ -0,0 +1,105 @@
+"""
+AI Agent Stack - Dependency Graph Ordering
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+class TopologicalOrder:
+    """Incrementally maintained topological order of the task DAG
+
+    Implements the Pearce-Kelly dynamic topological sort: every node holds an
+    integer position and an edge insertion only revisits the nodes whose
+    positions lie between the two endpoints.  Inserting a dependency on an
+    older task, the common case, costs O(1).  All traversals are iterative so
+    long dependency chains never hit the interpreter recursion limit.
+    """
+
+    def __init__(self, successors: Dict[str, Set[str]], predecessors: Dict[str, Set[str]]):
+        # successors: node -> nodes that must come after it (dependents)
+        # predecessors: node -> nodes that must come before it (dependencies)
+        self._successors = successors
+        self._predecessors = predecessors
+        self._position: Dict[str, int] = {}
+        self._next_position = 0
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._position
+
+    def add_node(self, node: str):
+        """Place a node after every node seen so far"""
+        if node not in self._position:
+            self._position[node] = self._next_position
+            self._next_position += 1
+
+    def discard(self, node: str):
+        """Forget a node; the remaining positions stay a valid order"""
+        self._position.pop(node, None)
+
+    def ordered(self, nodes: Iterable[str]) -> List[str]:
+        """Return known nodes sorted so dependencies come first"""
+        return sorted((node for node in nodes if node in self._position),
+                      key=self._position.__getitem__)
+
+    def add_edge(self, before: str, after: str) -> bool:
+        """Record that before must precede after
+
+        The edge itself must not be in the adjacency maps yet; callers add it
+        once this returns True.
+
+        Returns:
+            False if the edge would close a cycle, in which case the order is
+            left untouched
+        """
+        self.add_node(before)
+        self.add_node(after)
+
+        lower = self._position[after]
+        upper = self._position[before]
+        if lower > upper:
+            return True
+
+        forward = self._collect(after, self._successors, lambda p: p <= upper, before)
+        if forward is None:
+            return False
+
+        backward = self._collect(before, self._predecessors, lambda p: p >= lower)
+        self._reorder(backward, forward)
+        return True
+
+    def _collect(self, start: str, edges: Dict[str, Set[str]], in_region: Callable[[int], bool],
+                 target: Optional[str] = None) -> Optional[Set[str]]:
+        """Collect nodes reachable from start whose positions lie in the region
+
+        Returns None if target is reached, which means the new edge closes a
+        cycle.
+        """
+        seen = {start}
+        stack = [start]
+
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return None
+
+            for neighbour in edges.get(node, ()):
+                if neighbour in seen:
+                    continue
+
+                position = self._position.get(neighbour)
+                if position is None or not in_region(position):
+                    continue
+
+                seen.add(neighbour)
+                stack.append(neighbour)
+
+        return seen
+
+    def _reorder(self, backward: Set[str], forward: Set[str]):
+        """Move the backward region ahead of the forward region"""
+        by_position = self._position.__getitem__
+        nodes: List[str] = sorted(backward, key=by_position) + sorted(forward, key=by_position)
+        positions = sorted(self._position[node] for node in nodes)
+
+        for node, position in zip(nodes, positions):
+            self._position[node] = position
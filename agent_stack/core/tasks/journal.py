@@ -0,0 +1,319 @@
+"""
+AI Agent Stack - Task Write-Ahead Log
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+import json
+import os
+import struct
+import threading
+import zlib
+
+from agent_stack.core.tasks import Task
+
+# Record header: payload length, payload crc32, operation code
+_HEADER = struct.Struct("<IIB")
+
+OP_CREATE = 1
+OP_ASSIGN = 2
+OP_COMPLETE = 3
+OP_REASSIGN = 4
+OP_UPDATE = 5
+OP_SNAPSHOT = 6
+
+FSYNC_ALWAYS = "always"
+FSYNC_GROUP = "group"
+FSYNC_INTERVAL = "interval"
+
+class TaskJournal:
+    """Write-ahead log with periodic snapshots for single-node TaskPools
+
+    Every state change is appended to the current log segment as a framed
+    binary record carrying the task's full mutable state, so replay is
+    idempotent. Every snapshot_every records a background thread writes a
+    compact snapshot of the pool and deletes the segments it covers, so a
+    cold start reads one snapshot plus a bounded log tail.
+
+    The fsync policy trades durability for throughput: "always" syncs each
+    record, "group" syncs every group_size records and "interval" syncs from
+    the background thread every interval_seconds.
+    """
+
+    def __init__(self,
+                 directory: Union[str, Path],
+                 fsync: str = FSYNC_GROUP,
+                 group_size: int = 64,
+                 interval_seconds: float = 1.0,
+                 snapshot_every: int = 100000):
+        if fsync not in (FSYNC_ALWAYS, FSYNC_GROUP, FSYNC_INTERVAL):
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self.group_size = group_size
+        self.interval_seconds = interval_seconds
+        self.snapshot_every = snapshot_every
+
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._unsynced = 0
+        self._since_snapshot = 0
+        self._snapshot_requested = False
+        self._closed = False
+
+        segments = self._segments()
+        self._segment = segments[-1] if segments else 1
+        self._truncate_torn_tail(self._segment_path(self._segment))
+        self._file: BinaryIO = open(self._segment_path(self._segment), "ab")
+
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def save(self, task: Task, created: bool = False):
+        """Append a task state change to the log"""
+        if created:
+            op, payload = OP_CREATE, _encode_task(task)
+        else:
+            op, payload = _STATUS_OPS.get(task.status, OP_UPDATE), _encode_state(task)
+
+        record = _frame(op, payload)
+        with self._lock:
+            self._file.write(record)
+            self._unsynced += 1
+            self._since_snapshot += 1
+
+            if self.fsync == FSYNC_ALWAYS or (
+                self.fsync == FSYNC_GROUP and self._unsynced >= self.group_size
+            ):
+                self._sync()
+
+            if self._since_snapshot >= self.snapshot_every and not self._snapshot_requested:
+                self._snapshot_requested = True
+                self._wakeup.notify()
+
+    def flush(self):
+        """Force every appended record to disk"""
+        with self._lock:
+            self._sync()
+
+    def try_claim(self, task_id: str, agent_id: str) -> bool:
+        """Claims are local to the single node owning the journal"""
+        return True
+
+    def load(self) -> List[Task]:
+        """Rebuild tasks from the latest snapshot and the log tail"""
+        with self._lock:
+            self._sync()
+            tasks: Dict[str, Task] = {}
+            first_segment = 1
+
+            snapshot = self.directory / "snapshot.bin"
+            if snapshot.exists():
+                with open(snapshot, "rb") as f:
+                    for op, payload in _read_records(f):
+                        if op == OP_SNAPSHOT:
+                            first_segment = payload["segment"]
+                        else:
+                            tasks[payload["task_id"]] = _decode_task(payload)
+
+            for segment in self._segments():
+                if segment < first_segment:
+                    continue
+                with open(self._segment_path(segment), "rb") as f:
+                    for op, payload in _read_records(f):
+                        if op == OP_CREATE:
+                            tasks[payload["task_id"]] = _decode_task(payload)
+                        elif payload["task_id"] in tasks:
+                            _apply_state(tasks[payload["task_id"]], payload)
+
+            return list(tasks.values())
+
+    def snapshot(self, tasks: Optional[List[Task]] = None):
+        """Write a snapshot and drop the log segments it covers
+
+        Defaults to the tasks currently in the TaskPool.
+        """
+        with self._snapshot_lock:
+            self._write_snapshot(tasks)
+
+    def _write_snapshot(self, tasks: Optional[List[Task]]):
+        """Rotate the log, write the snapshot and delete covered segments"""
+        with self._lock:
+            # Later records go to a fresh segment; replaying them over a
+            # snapshot that already reflects them is harmless
+            self._sync()
+            self._file.close()
+            covered = self._segment
+            self._segment += 1
+            self._file = open(self._segment_path(self._segment), "ab")
+            self._since_snapshot = 0
+            self._snapshot_requested = False
+
+        if tasks is None:
+            from agent_stack.core.tasks import TaskPool
+            records = TaskPool.snapshot_tasks(
+                lambda task: _frame(OP_CREATE, _encode_task(task))
+            )
+        else:
+            records = [_frame(OP_CREATE, _encode_task(task)) for task in tasks]
+
+        path = self.directory / "snapshot.bin"
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "wb") as f:
+            f.write(_frame(OP_SNAPSHOT, {"segment": covered + 1}))
+            for record in records:
+                f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+
+        for segment in self._segments():
+            if segment <= covered:
+                self._segment_path(segment).unlink()
+
+    def close(self):
+        """Sync the log and stop the background thread"""
+        with self._lock:
+            self._closed = True
+            self._sync()
+            self._file.close()
+            self._wakeup.notify()
+        self._worker.join()
+
+    def _run(self):
+        """Background loop for interval fsync and requested snapshots"""
+        while True:
+            with self._lock:
+                self._wakeup.wait(self.interval_seconds)
+                if self._closed:
+                    return
+                if self.fsync == FSYNC_INTERVAL:
+                    self._sync()
+                snapshot_requested = self._snapshot_requested
+
+            if snapshot_requested:
+                try:
+                    self.snapshot()
+                except Exception as e:
+                    from agent_stack.core.logging import SystemLogger
+
+                    SystemLogger.error_log(e, {"journal": str(self.directory)})
+
+    def _sync(self):
+        """Flush and fsync the current segment, caller holds the lock"""
+        if self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def _truncate_torn_tail(self, path: Path):
+        """Cut a partially written last record so new appends stay readable"""
+        if not path.exists():
+            return
+
+        valid = 0
+        with open(path, "rb") as f:
+            for _ in _read_records(f):
+                valid = f.tell()
+
+        if valid < path.stat().st_size:
+            with open(path, "r+b") as f:
+                f.truncate(valid)
+
+    def _segments(self) -> List[int]:
+        """Return the numbers of the log segments on disk, oldest first"""
+        paths = self.directory.glob("wal.*.log")
+        return sorted(int(path.stem.split(".")[1]) for path in paths)
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"wal.{segment:08d}.log"
+
+
+_STATUS_OPS = {
+    "ASSIGNED": OP_ASSIGN,
+    "COMPLETED": OP_COMPLETE,
+    "PENDING": OP_REASSIGN,
+}
+
+def _frame(op: int, payload: Dict) -> bytes:
+    """Encode one framed binary record"""
+    data = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return _HEADER.pack(len(data), zlib.crc32(data), op) + data
+
+def _read_records(f: BinaryIO) -> Iterator[Tuple[int, Dict]]:
+    """Yield records until the end of file or a torn tail write"""
+    while True:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+
+        length, checksum, op = _HEADER.unpack(header)
+        data = f.read(length)
+        if len(data) < length or zlib.crc32(data) != checksum:
+            return
+
+        yield op, json.loads(data)
+
+def _to_epoch(value: Optional[datetime]) -> Optional[float]:
+    return None if value is None else value.replace(tzinfo=timezone.utc).timestamp()
+
+def _from_epoch(value: Optional[float]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+def _encode_state(task: Task) -> Dict:
+    """Encode the fields that change after a task is created"""
+    return {
+        "task_id": task.task_id,
+        "status": task.status,
+        "progress": task.progress,
+        "assigned_agent": task.assigned_agent,
+        "started_at": _to_epoch(task.started_at),
+        "completed_at": _to_epoch(task.completed_at),
+        "actual_duration": task.actual_duration,
+        "metadata": task.metadata,
+    }
+
+def _encode_task(task: Task) -> Dict:
+    """Encode a full task"""
+    payload = _encode_state(task)
+    payload.update(
+        name=task.name,
+        description=task.description,
+        priority=task.priority,
+        dependencies=sorted(task.dependencies),
+        required_skills=sorted(task.required_skills),
+        created_at=_to_epoch(task.created_at),
+        estimated_duration=task.estimated_duration,
+    )
+    return payload
+
+def _apply_state(task: Task, payload: Dict):
+    """Apply an encoded state change to a task"""
+    task.status = payload["status"]
+    task.progress = payload["progress"]
+    task.assigned_agent = payload["assigned_agent"]
+    task.started_at = _from_epoch(payload["started_at"])
+    task.completed_at = _from_epoch(payload["completed_at"])
+    task.actual_duration = payload["actual_duration"]
+    task.metadata = payload["metadata"]
+
+def _decode_task(payload: Dict) -> Task:
+    """Decode a full task"""
+    task = Task(
+        task_id=payload["task_id"],
+        name=payload["name"],
+        description=payload["description"],
+        priority=payload["priority"],
+        dependencies=set(payload["dependencies"]),
+        required_skills=set(payload["required_skills"]),
+        created_at=_from_epoch(payload["created_at"]),
+        estimated_duration=payload["estimated_duration"],
+    )
+    _apply_state(task, payload)
+    return task
@@ -0,0 +1,97 @@
+"""
+AI Agent Stack - Task Definition Loader
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+import json
+
+PRIORITY_LEVELS = {
+    "low": 1,
+    "medium": 2,
+    "high": 3,
+    "critical": 4,
+}
+
+def iter_task_specs(path: Union[str, Path]) -> Iterator[Dict]:
+    """Yield create_tasks specs from a task file or directory tree
+
+    Supports the devstack tasks.json format ({"tasks": [...]}) and the
+    one-task-per-file YAML definitions under tasks/. Directories are walked
+    in sorted order and files are parsed one at a time; YAML files without a
+    task_id (phase maps, status tables) are skipped.
+    """
+    path = Path(path)
+
+    if path.is_dir():
+        for child in sorted(path.rglob("*")):
+            if child.suffix in (".json", ".yml", ".yaml"):
+                yield from iter_task_specs(child)
+        return
+
+    if path.suffix == ".json":
+        with open(path) as f:
+            data = json.load(f)
+        for entry in data.get("tasks", []):
+            yield _spec_from_json(entry)
+    else:
+        import yaml
+
+        with open(path) as f:
+            data = yaml.safe_load(f)
+        if isinstance(data, dict) and data.get("task_id"):
+            yield _spec_from_yaml(data, path)
+
+def load_tasks(*paths: Union[str, Path]) -> List:
+    """Load task definitions into the TaskPool in a single atomic batch"""
+    from agent_stack.core.tasks import TaskPool
+
+    specs: Dict[str, Dict] = {}
+    for path in paths:
+        for spec in iter_task_specs(path):
+            specs[spec["task_id"]] = spec
+
+    # "blocks" entries are reverse dependencies on tasks from other files
+    for spec in specs.values():
+        for blocked_id in spec.pop("blocks", ()):
+            if blocked_id in specs:
+                specs[blocked_id]["dependencies"].add(spec["task_id"])
+
+    return TaskPool.create_tasks(specs.values())
+
+def _spec_from_json(entry: Dict) -> Dict:
+    """Convert a tasks.json entry to a spec"""
+    return {
+        "task_id": entry["id"],
+        "name": entry.get("title", ""),
+        "status": _normalize_status(entry.get("status")),
+        "dependencies": set(entry.get("dependencies") or ()),
+        "metadata": {
+            key: value for key, value in entry.items()
+            if key not in ("id", "title", "status", "dependencies")
+        },
+    }
+
+def _spec_from_yaml(data: Dict, path: Path) -> Dict:
+    """Convert a YAML task definition to a spec"""
+    return {
+        "task_id": data["task_id"],
+        "name": data.get("name", ""),
+        "description": data.get("description", ""),
+        "priority": PRIORITY_LEVELS.get(str(data.get("priority", "")).lower(), 1),
+        "status": _normalize_status(data.get("status")),
+        "dependencies": {dep["task_id"] for dep in data.get("dependencies") or ()},
+        "blocks": [blocked["task_id"] for blocked in data.get("blocks") or ()],
+        "metadata": {
+            "type": data.get("type"),
+            "phase": data.get("phase"),
+            "source": str(path),
+        },
+    }
+
+def _normalize_status(status) -> str:
+    """Map a definition status onto the pool's initial states
+
+    Anything not finished is loaded as PENDING so it is scheduled again.
+    """
+    return "COMPLETED" if str(status).upper() == "COMPLETED" else "PENDING"
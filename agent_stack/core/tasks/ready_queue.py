@@ -0,0 +1,152 @@
+"""
+AI Agent Stack - Ready Queue
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+class _Bucket:
+    """Heap of ready entries sharing one required skill mask"""
+
+    __slots__ = ("heap", "lock")
+
+    def __init__(self):
+        self.heap: List[list] = []
+        self.lock = threading.RLock()
+
+
+class ReadyQueue:
+    """Priority index over tasks that are ready for assignment
+
+    Tasks are bucketed by their required skill mask and each bucket is a
+    heap ordered by priority, so a claim tests one mask per bucket, skipping
+    whole groups the agent cannot serve, and only looks at the heads of the
+    rest instead of scanning the whole pool.
+
+    The sort key comes from the scheduling policy; lower keys are claimed
+    first. Each bucket has its own lock. Agents with different skills pop from
+    different buckets without contending, and a pop is a compare-and-pop
+    under the bucket lock, so exactly one caller can win a given entry. No
+    caller code runs under a bucket lock apart from pop_exact's accept.
+    """
+
+    def __init__(self, key: Optional[Callable] = None):
+        self.key = key or (lambda task: (-task.priority,))
+        self._buckets: Dict[int, _Bucket] = {}
+        self._entries: Dict[str, list] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def lock_for(self, task) -> threading.RLock:
+        """Return the lock guarding claims of a task"""
+        return self._bucket(task.skill_mask).lock
+
+    def push(self, task):
+        """Add a task, replacing any entry it already has"""
+        skills = task.skill_mask
+        bucket = self._bucket(skills)
+
+        with bucket.lock:
+            self._invalidate(task.task_id)
+            # Entries are [sort_key, sequence, task_id, skills, valid]; the
+            # sequence keeps equal keys in creation order.
+            entry = [self.key(task), next(self._counter), task.task_id, skills, True]
+            self._entries[task.task_id] = entry
+            heapq.heappush(bucket.heap, entry)
+
+    def remove(self, task_id: str) -> bool:
+        """Drop a task from the queue, returns False if it was not queued"""
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return False
+
+        with self._buckets[entry[3]].lock:
+            if self._entries.get(task_id) is not entry:
+                return False
+            self._invalidate(task_id)
+            return True
+
+    def pop(self, capabilities: int) -> Optional[str]:
+        """Remove and return the best task id for an agent's capability mask"""
+        while True:
+            best = None
+            for skills, bucket in list(self._buckets.items()):
+                if skills & ~capabilities:
+                    continue
+
+                with bucket.lock:
+                    head = self._peek(bucket)
+                if head is not None and (best is None or head < best):
+                    best = head
+
+            if best is None:
+                return None
+
+            bucket = self._buckets[best[3]]
+            with bucket.lock:
+                # Another claimer may have won this entry since we peeked
+                if self._peek(bucket) is not best:
+                    continue
+
+                heapq.heappop(bucket.heap)
+                del self._entries[best[2]]
+                best[-1] = False
+                return best[2]
+
+    def pop_exact(self, skills: int, accept: Callable[[str], bool]) -> Optional[str]:
+        """Remove and return the head of the bucket for exactly this skill mask
+
+        accept is asked about the head before it is removed; when it returns
+        False the head stays queued and None is returned.
+        """
+        bucket = self._buckets.get(skills)
+        if bucket is None:
+            return None
+
+        with bucket.lock:
+            head = self._peek(bucket)
+            if head is None or not accept(head[2]):
+                return None
+
+            heapq.heappop(bucket.heap)
+            del self._entries[head[2]]
+            head[-1] = False
+            return head[2]
+
+    def clear(self):
+        """Remove all queued tasks"""
+        with self._lock:
+            self._buckets.clear()
+            self._entries.clear()
+
+    def _bucket(self, skills: int) -> _Bucket:
+        """Return the bucket for a skill mask, creating it if needed"""
+        bucket = self._buckets.get(skills)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(skills, _Bucket())
+        return bucket
+
+    def _invalidate(self, task_id: str):
+        """Mark a task's entry as stale, caller holds its bucket lock"""
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            # Lazy deletion: the heap slot is discarded when it reaches the top
+            entry[-1] = False
+
+    def _peek(self, bucket: _Bucket) -> Optional[list]:
+        """Return the valid head of a bucket, pruning stale entries"""
+        heap = bucket.heap
+        while heap and not heap[0][-1]:
+            heapq.heappop(heap)
+
+        return heap[0] if heap else None
@@ -0,0 +1,41 @@
+"""
+AI Agent Stack - Task Retry Policy
+"""
+
+import random
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from agent_stack.core.config.base import AgentConfig
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter for failed tasks
+
+    Attempt n waits half of min(max_delay, base_delay * 2 ** (n - 1)) plus a
+    random share of the other half, so delays still grow with each attempt
+    while tasks that failed together come back spread out in time.
+    """
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 base_delay: float = 1.0,
+                 max_delay: float = 300.0,
+                 rng: Optional[random.Random] = None):
+        if base_delay <= 0 or max_delay < base_delay:
+            raise ValueError(f"Invalid backoff delays: {base_delay}, {max_delay}")
+
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    @classmethod
+    def from_config(cls, config: "AgentConfig", **kwargs) -> "RetryPolicy":
+        """Build a policy using AgentConfig.max_retries"""
+        return cls(max_retries=config.max_retries, **kwargs)
+
+    def delay(self, attempt: int) -> float:
+        """Return the backoff in seconds before retry number attempt"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return ceiling / 2 + self._rng.uniform(0, ceiling / 2)
@@ -0,0 +1,145 @@
+"""
+AI Agent Stack - Scheduling Policies
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    from agent_stack.core.tasks import Task
+
+
+def task_deadline(task: "Task") -> Optional[float]:
+    """Return a task's deadline as epoch seconds
+    
+    The deadline is created_at plus metadata["timeout_seconds"], the field
+    TaskMetadata carries for typed tasks.
+    """
+    # Read the slot directly so tasks without metadata stay dict-free
+    timeout = task._metadata.get("timeout_seconds") if task._metadata else None
+    if timeout is None:
+        return None
+    return task.created_timestamp + timeout
+
+
+class PriorityPolicy:
+    """Rank ready tasks by their static priority alone
+
+    Sort keys are tuples and lower keys are claimed first; ties keep
+    creation order.
+    """
+
+    def sort_key(self, task: "Task") -> tuple:
+        return (-task.priority,)
+
+    def tasks_added(self, tasks: List["Task"], pool: Dict[str, "Task"],
+                    dependencies: Dict[str, Set[str]],
+                    dependents: Dict[str, Set[str]]) -> Iterable[str]:
+        """Update state for newly linked tasks, returns ids whose key changed"""
+        return ()
+
+    def task_removed(self, task_id: str):
+        """Forget a completed or evicted task"""
+
+    def reset(self):
+        """Drop all state"""
+
+    def latest_start(self, task: "Task") -> Optional[float]:
+        """Return the epoch time after which a ready task is rejected, if any"""
+        return None
+
+
+class CriticalPathPolicy(PriorityPolicy):
+    """Rank ready tasks by remaining critical-path length, then priority
+
+    A task's path length is its estimated duration plus the longest path
+    length among its unfinished dependents, so the head of a long chain is
+    started before short leaves. Lengths only ever grow while tasks are
+    added, so a new task propagates upward through its unfinished
+    ancestors until a length stops changing. Completing a task changes no
+    remaining path, since every unfinished task that could reach it lies
+    downstream. Tasks without an estimate count as default_duration.
+    """
+
+    def __init__(self, default_duration: float = 1.0):
+        self.default_duration = default_duration
+        self._length: Dict[str, float] = {}
+
+    def path_length(self, task_id: str) -> float:
+        """Return the remaining critical-path length through a task"""
+        return self._length.get(task_id, 0.0)
+
+    def sort_key(self, task: "Task") -> tuple:
+        return (-self._length.get(task.task_id, 0.0), -task.priority)
+
+    def tasks_added(self, tasks: List["Task"], pool: Dict[str, "Task"],
+                    dependencies: Dict[str, Set[str]],
+                    dependents: Dict[str, Set[str]]) -> Iterable[str]:
+        """Compute lengths for tasks given in dependency order
+
+        Walking the batch backwards sizes every new task once from its
+        already sized dependents; only then is the growth pushed into
+        existing ancestors.
+        """
+        length = self._length
+        for task in reversed(tasks):
+            if task.status == "COMPLETED":
+                continue
+            longest = 0.0
+            for dependent_id in dependents.get(task.task_id, ()):
+                longest = max(longest, length.get(dependent_id, 0.0))
+            length[task.task_id] = self._duration(task) + longest
+
+        changed: List[str] = []
+        for task in tasks:
+            if task.task_id in length:
+                self._propagate(task.task_id, pool, dependencies, changed)
+        return changed
+
+    def task_removed(self, task_id: str):
+        self._length.pop(task_id, None)
+
+    def reset(self):
+        self._length.clear()
+
+    def _propagate(self, task_id: str, pool: Dict[str, "Task"],
+                   dependencies: Dict[str, Set[str]], changed: List[str]):
+        """Raise ancestor lengths reachable from a task"""
+        length = self._length
+        stack = [task_id]
+        while stack:
+            node = stack.pop()
+            node_length = length[node]
+            for dep_id in dependencies.get(node, ()):
+                dep = pool.get(dep_id)
+                if dep is None or dep.status == "COMPLETED":
+                    continue
+                candidate = self._duration(dep) + node_length
+                if candidate > length.get(dep_id, 0.0):
+                    length[dep_id] = candidate
+                    changed.append(dep_id)
+                    stack.append(dep_id)
+
+    def _duration(self, task: "Task") -> float:
+        if task.estimated_duration is None:
+            return self.default_duration
+        return float(task.estimated_duration)
+
+
+class DeadlinePolicy(PriorityPolicy):
+    """Earliest deadline first, with early rejection of hopeless tasks
+
+    Ready tasks are ordered by deadline, then priority; tasks without a
+    deadline queue behind every task that has one. A task whose deadline
+    can no longer be met once its estimated duration is accounted for is
+    rejected instead of being started late.
+    """
+
+    def sort_key(self, task: "Task") -> tuple:
+        deadline = task_deadline(task)
+        return (float("inf") if deadline is None else deadline, -task.priority)
+
+    def latest_start(self, task: "Task") -> Optional[float]:
+        deadline = task_deadline(task)
+        if deadline is None:
+            return None
+        return deadline - (task.estimated_duration or 0)
@@ -0,0 +1,96 @@
+"""
+AI Agent Stack - Skill Registry
+"""
+
+from enum import Enum
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union, overload
+import sys
+import threading
+
+Skill = Union[str, Enum]
+
+class SkillRegistry:
+    """System-wide mapping of capability names to bits
+    
+    Every capability string gets one bit the first time it is seen, so a
+    skill set is an int mask and matching is req & ~caps == 0. Enum members
+    such as AgentCapability map to the bit of their value, which keeps them
+    interchangeable with the string capability tags agents use. Bits are
+    never reused, so masks stay valid for the life of the process.
+    """
+    
+    _lock = threading.Lock()
+    _bits: Dict[str, int] = {}
+    _names: List[str] = []
+    _skill_sets: Dict[int, FrozenSet[str]] = {0: frozenset()}
+    
+    @classmethod
+    def bit(cls, skill: Skill) -> int:
+        """Return the bit of a capability, registering it if needed"""
+        if isinstance(skill, Enum):
+            skill = skill.value
+        bit = cls._bits.get(skill)
+        if bit is None:
+            with cls._lock:
+                bit = cls._bits.get(skill)
+                if bit is None:
+                    bit = 1 << len(cls._names)
+                    cls._names.append(sys.intern(skill))
+                    cls._bits[skill] = bit
+        return bit
+    
+    @classmethod
+    def mask(cls, skills: Union[int, Iterable[Skill]]) -> int:
+        """Return the mask of a skill set, masks are passed through"""
+        if isinstance(skills, int):
+            return skills
+        mask = 0
+        for skill in skills:
+            mask |= cls.bit(skill)
+        return mask
+    
+    @classmethod
+    def skills(cls, mask: int) -> FrozenSet[str]:
+        """Return the shared frozenset of capability names in a mask"""
+        skills = cls._skill_sets.get(mask)
+        if skills is None:
+            names = cls._names
+            skills = frozenset(
+                names[index] for index in range(mask.bit_length()) if mask >> index & 1
+            )
+            skills = cls._skill_sets.setdefault(mask, skills)
+        return skills
+    
+    @staticmethod
+    def matches(required: int, capabilities: int) -> bool:
+        """Check if capabilities cover every required skill"""
+        return required & ~capabilities == 0
+
+
+class CapabilityMask:
+    """Read-only SkillRegistry mask of a capability list attribute
+    
+    Declared on a class as capability_mask = CapabilityMask("capability_tags").
+    The mask is cached on the instance against a tuple of the list, so it
+    follows both reassignment and in-place edits such as append.
+    """
+    
+    def __init__(self, attribute: str) -> None:
+        self.attribute = attribute
+        self._cache = f"_{attribute}_mask"
+    
+    @overload
+    def __get__(self, instance: None, owner: type) -> "CapabilityMask": ...
+    
+    @overload
+    def __get__(self, instance: object, owner: type) -> int: ...
+    
+    def __get__(self, instance: Optional[object], owner: type) -> Union["CapabilityMask", int]:
+        if instance is None:
+            return self
+        skills = tuple(getattr(instance, self.attribute))
+        cached: Optional[Tuple[Tuple[Any, ...], int]] = instance.__dict__.get(self._cache)
+        if cached is None or cached[0] != skills:
+            cached = skills, SkillRegistry.mask(skills)
+            instance.__dict__[self._cache] = cached
+        return cached[1]
@@ -0,0 +1,48 @@
+"""
+AI Agent Stack - Speculative Execution Policy
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+from agent_stack.core.tasks.estimator import QUANTILES
+
+if TYPE_CHECKING:
+    from agent_stack.core.tasks import Task
+    from agent_stack.core.tasks.estimator import DurationEstimator
+
+
+class SpeculationPolicy:
+    """When to launch a duplicate attempt of a running task
+
+    A task becomes a straggler once it has run longer than the learned
+    quantile of its duration, or multiplier times its estimated_duration
+    while nothing has been learned yet. Tasks with neither are never
+    duplicated. If no idle capable agent is waiting when a straggler is
+    found, it is checked again after recheck_seconds. quantile must be one
+    the DurationEstimator tracks.
+    """
+
+    def __init__(self,
+                 quantile: float = 0.9,
+                 multiplier: float = 1.5,
+                 min_seconds: float = 1.0,
+                 recheck_seconds: float = 5.0):
+        if quantile not in QUANTILES:
+            raise ValueError(f"Quantile not tracked: {quantile}, choose one of {QUANTILES}")
+
+        self.quantile = quantile
+        self.multiplier = multiplier
+        self.min_seconds = min_seconds
+        self.recheck_seconds = recheck_seconds
+
+    def threshold(self, task: "Task",
+                  estimator: Optional["DurationEstimator"] = None) -> Optional[float]:
+        """Return how long a task may run before it counts as a straggler"""
+        learned = None
+        if estimator is not None:
+            learned = estimator.estimate(task.name, task.required_skills, quantile=self.quantile)
+        if learned is None and task.estimated_duration is not None:
+            learned = task.estimated_duration * self.multiplier
+        if learned is None:
+            return None
+        return max(self.min_seconds, learned)
@@ -0,0 +1,274 @@
+"""
+AI Agent Stack - Persistent Task Storage
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+import json
+import threading
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    bindparam,
+    create_engine,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
+
+from agent_stack.core.config.base import DatabaseConfig
+from agent_stack.core.tasks import Task
+
+metadata = MetaData()
+
+tasks_table = Table(
+    "tasks",
+    metadata,
+    Column("task_id", String(64), primary_key=True),
+    Column("name", String(255), nullable=False, default=""),
+    Column("description", Text, nullable=False, default=""),
+    Column("priority", Integer, nullable=False, default=1),
+    Column("status", String(16), nullable=False, index=True),
+    Column("progress", Integer, nullable=False, default=0),
+    Column("assigned_agent", String(64), index=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("started_at", DateTime),
+    Column("completed_at", DateTime),
+    Column("estimated_duration", Float),
+    Column("actual_duration", Float),
+    Column("task_metadata", Text, nullable=False, default="{}"),
+)
+
+task_dependencies_table = Table(
+    "task_dependencies",
+    metadata,
+    Column("task_id", String(64), primary_key=True),
+    Column("dependency_id", String(64), primary_key=True, index=True),
+)
+
+task_skills_table = Table(
+    "task_skills",
+    metadata,
+    Column("task_id", String(64), primary_key=True),
+    Column("skill", String(64), primary_key=True),
+)
+
+class SQLTaskStore:
+    """SQLAlchemy-backed TaskPool storage
+
+    Tasks, assignments and dependency edges are persisted through a pooled
+    engine built from DatabaseConfig. State changes are buffered and written
+    in one transaction per batch. Claims lock the candidate row with
+    SELECT ... FOR UPDATE SKIP LOCKED where the database supports it and
+    then apply a conditional PENDING -> ASSIGNED update, which is also what
+    makes them atomic on SQLite.
+    """
+
+    def __init__(self, config: DatabaseConfig, batch_size: int = 100):
+        self.batch_size = batch_size
+        self._engine = self._create_engine(config)
+        self._created: Dict[str, Task] = {}
+        self._updated: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        metadata.create_all(self._engine)
+
+    @staticmethod
+    def _create_engine(config: DatabaseConfig) -> Engine:
+        """Create the pooled engine described by a database config"""
+        url = make_url(config.url)
+        options = {"echo": config.echo}
+
+        if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+            # A private in-memory database only lives as long as its
+            # connection, so every checkout must share the same one
+            options["poolclass"] = StaticPool
+            options["connect_args"] = {"check_same_thread": False}
+        else:
+            options["pool_size"] = config.pool_size
+            options["max_overflow"] = config.max_overflow
+
+        return create_engine(url, **options)
+
+    def save(self, task: Task, created: bool = False):
+        """Buffer the current state of a task for the next batch write"""
+        with self._lock:
+            if created or task.task_id in self._created:
+                self._created[task.task_id] = task
+            else:
+                self._updated[task.task_id] = self._state_row(task)
+            pending = len(self._created) + len(self._updated)
+
+        if pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered changes in a single transaction"""
+        # Batches must reach the database in order, or an update could run
+        # before the insert of the row it targets
+        with self._flush_lock:
+            with self._lock:
+                created, self._created = self._created, {}
+                updated, self._updated = self._updated, {}
+
+            if created or updated:
+                self._write(created, updated)
+
+    def _write(self, created: Dict[str, Task], updated: Dict[str, Dict]):
+        """Insert created tasks and apply state updates in one transaction"""
+        with self._engine.begin() as conn:
+            if created:
+                rows = [self._task_row(task) for task in created.values()]
+                conn.execute(insert(tasks_table), rows)
+
+                edges = [
+                    {"task_id": task.task_id, "dependency_id": dep_id}
+                    for task in created.values()
+                    for dep_id in task.dependencies
+                ]
+                if edges:
+                    conn.execute(insert(task_dependencies_table), edges)
+
+                skills = [
+                    {"task_id": task.task_id, "skill": skill}
+                    for task in created.values()
+                    for skill in task.required_skills
+                ]
+                if skills:
+                    conn.execute(insert(task_skills_table), skills)
+
+            if updated:
+                # The SET clause is taken from the keys of the parameter rows
+                statement = update(tasks_table).where(
+                    tasks_table.c.task_id == bindparam("row_task_id")
+                )
+                conn.execute(statement, list(updated.values()))
+
+    def try_claim(self, task_id: str, agent_id: str) -> bool:
+        """Atomically move a PENDING task to ASSIGNED for an agent
+
+        Returns:
+            False if the task is locked by or already assigned through
+            another scheduler sharing this database
+        """
+        self.flush()
+
+        with self._engine.begin() as conn:
+            row = conn.execute(
+                select(tasks_table.c.status)
+                .where(tasks_table.c.task_id == task_id)
+                .with_for_update(skip_locked=True)
+            ).first()
+            if row is None or row.status != "PENDING":
+                return False
+
+            result = conn.execute(
+                update(tasks_table)
+                .where(tasks_table.c.task_id == task_id)
+                .where(tasks_table.c.status == "PENDING")
+                .values(status="ASSIGNED", assigned_agent=agent_id, started_at=datetime.utcnow())
+            )
+            return result.rowcount == 1
+
+    def load_state(self, task_id: str) -> Optional[Dict]:
+        """Return the persisted assignment state of one task
+
+        Returns:
+            The task's status, assigned_agent, started_at, completed_at,
+            actual_duration, progress and metadata, or None if it has no row
+        """
+        self.flush()
+
+        with self._engine.connect() as conn:
+            row = conn.execute(
+                select(tasks_table).where(tasks_table.c.task_id == task_id)
+            ).first()
+        if row is None:
+            return None
+
+        return {
+            "status": row.status,
+            "assigned_agent": row.assigned_agent,
+            "started_at": row.started_at,
+            "completed_at": row.completed_at,
+            "actual_duration": row.actual_duration,
+            "progress": row.progress,
+            "metadata": json.loads(row.task_metadata),
+        }
+
+    def load(self) -> List[Task]:
+        """Load every persisted task with its dependencies and skills"""
+        self.flush()
+
+        with self._engine.connect() as conn:
+            dependencies: Dict[str, set] = {}
+            for row in conn.execute(select(task_dependencies_table)):
+                dependencies.setdefault(row.task_id, set()).add(row.dependency_id)
+
+            skills: Dict[str, set] = {}
+            for row in conn.execute(select(task_skills_table)):
+                skills.setdefault(row.task_id, set()).add(row.skill)
+
+            return [
+                Task(
+                    task_id=row.task_id,
+                    name=row.name,
+                    description=row.description,
+                    priority=row.priority,
+                    status=row.status,
+                    progress=row.progress,
+                    assigned_agent=row.assigned_agent,
+                    dependencies=dependencies.get(row.task_id, set()),
+                    required_skills=skills.get(row.task_id, set()),
+                    created_at=row.created_at,
+                    started_at=row.started_at,
+                    completed_at=row.completed_at,
+                    estimated_duration=row.estimated_duration,
+                    actual_duration=row.actual_duration,
+                    metadata=json.loads(row.task_metadata),
+                )
+                for row in conn.execute(select(tasks_table))
+            ]
+
+    def close(self):
+        """Flush buffered changes and release pooled connections"""
+        self.flush()
+        self._engine.dispose()
+
+    @staticmethod
+    def _task_row(task: Task) -> Dict:
+        """Return the full tasks row for a task"""
+        row = SQLTaskStore._state_row(task)
+        del row["row_task_id"]
+        row.update(
+            task_id=task.task_id,
+            name=task.name,
+            description=task.description,
+            priority=task.priority,
+            created_at=task.created_at,
+            estimated_duration=task.estimated_duration,
+        )
+        return row
+
+    @staticmethod
+    def _state_row(task: Task) -> Dict:
+        """Return the columns that change after creation as update parameters"""
+        return {
+            "row_task_id": task.task_id,
+            "status": task.status,
+            "progress": task.progress,
+            "assigned_agent": task.assigned_agent,
+            "started_at": task.started_at,
+            "completed_at": task.completed_at,
+            "actual_duration": task.actual_duration,
+            "task_metadata": json.dumps(task.metadata, default=str),
+        }
@@ -0,0 +1,98 @@
+"""
+AI Agent Stack - Timer Queue
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional
+
+
+class Timer:
+    """Handle for a scheduled callback"""
+
+    __slots__ = ("deadline", "sequence", "callback", "args", "cancelled")
+
+    def __init__(self, deadline: float, sequence: int, callback: Callable, args: tuple):
+        self.deadline = deadline
+        self.sequence = sequence
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other: "Timer") -> bool:
+        return (self.deadline, self.sequence) < (other.deadline, other.sequence)
+
+
+class TimerQueue:
+    """Single-thread scheduler for many one-shot callbacks
+
+    Timers sit in a heap ordered by monotonic deadline and one daemon thread
+    sleeps until the earliest is due, so scheduling and cancelling are
+    O(log n) and thousands of pending deadlines cost no threads and no
+    periodic scans. Cancelled timers are dropped lazily when they reach the
+    top. Callbacks run on the timer thread and should be short.
+    """
+
+    def __init__(self, name: str = "timer-queue"):
+        self.name = name
+        self._heap: List[Timer] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, delay: float, callback: Callable, *args) -> Timer:
+        """Run callback(*args) after delay seconds"""
+        timer = Timer(time.monotonic() + delay, next(self._counter), callback, args)
+        with self._condition:
+            heapq.heappush(self._heap, timer)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            elif self._heap[0] is timer:
+                # New earliest deadline, wake the thread to shorten its sleep
+                self._condition.notify()
+        return timer
+
+    def cancel(self, timer: Optional[Timer]):
+        """Cancel a timer that has not fired yet"""
+        if timer is not None:
+            timer.cancelled = True
+
+    def clear(self):
+        """Cancel every pending timer"""
+        with self._condition:
+            for timer in self._heap:
+                timer.cancelled = True
+            self._heap.clear()
+
+    def _run(self):
+        """Fire timers as their deadlines pass"""
+        while True:
+            with self._condition:
+                while True:
+                    while self._heap and self._heap[0].cancelled:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+
+                    delay = self._heap[0].deadline - time.monotonic()
+                    if delay <= 0:
+                        timer = heapq.heappop(self._heap)
+                        break
+                    self._condition.wait(delay)
+
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                from agent_stack.core.logging import SystemLogger
+
+                SystemLogger.error_log(e, {
+                    "timer_queue": self.name,
+                    "callback": getattr(timer.callback, "__qualname__", repr(timer.callback)),
+                })
@@ -0,0 +1,100 @@
+"""
+AI Agent Stack - Task Waiters
+"""
+
+import itertools
+import threading
+from typing import Callable, Dict, Optional
+
+
+class Waiter:
+    """An agent parked until a task it can serve becomes ready"""
+
+    __slots__ = ("mask", "wake", "sequence", "agent_id", "woken_by")
+
+    def __init__(self, mask: int, wake: Callable[[], None], sequence: int,
+                 agent_id: Optional[str] = None):
+        self.mask = mask
+        self.wake = wake
+        self.sequence = sequence
+        self.agent_id = agent_id
+        self.woken_by: Optional[int] = None
+
+
+class WaiterRegistry:
+    """Parked agents grouped by capability mask
+
+    A ready task wakes exactly one waiter: the longest waiting one whose
+    capabilities cover the task's skill mask. Waiters are grouped by mask so
+    finding it costs one mask test per distinct capability set rather than
+    one per waiter.
+    """
+
+    def __init__(self):
+        self._groups: Dict[int, Dict[Waiter, None]] = {}
+        self._by_agent: Dict[str, Waiter] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(group) for group in self._groups.values())
+
+    def add(self, mask: int, wake: Callable[[], None], agent_id: Optional[str] = None) -> Waiter:
+        """Park a waiter that wake() will signal"""
+        waiter = Waiter(mask, wake, next(self._counter), agent_id)
+        with self._lock:
+            self._groups.setdefault(mask, {})[waiter] = None
+            if agent_id is not None:
+                self._by_agent[agent_id] = waiter
+        return waiter
+
+    def remove(self, waiter: Waiter) -> bool:
+        """Unpark a waiter, returns False if it was already woken"""
+        with self._lock:
+            group = self._groups.get(waiter.mask)
+            if group is None or waiter not in group:
+                return False
+            self._unlink(waiter)
+            return True
+
+    def wake_one(self, skill_mask: int) -> bool:
+        """Wake the oldest waiter able to serve a task, returns False if none"""
+        with self._lock:
+            best = None
+            for mask, group in self._groups.items():
+                if skill_mask & ~mask:
+                    continue
+                head = next(iter(group))
+                if best is None or head.sequence < best.sequence:
+                    best = head
+
+            if best is None:
+                return False
+
+            self._unlink(best)
+            best.woken_by = skill_mask
+
+        best.wake()
+        return True
+
+    def wake_agent(self, agent_id: str, skill_mask: int) -> bool:
+        """Wake a specific agent if it is parked and can serve a task"""
+        with self._lock:
+            waiter = self._by_agent.get(agent_id)
+            if waiter is None or skill_mask & ~waiter.mask:
+                return False
+
+            self._unlink(waiter)
+            waiter.woken_by = skill_mask
+
+        waiter.wake()
+        return True
+
+    def _unlink(self, waiter: Waiter):
+        """Remove a parked waiter, caller holds the lock"""
+        group = self._groups[waiter.mask]
+        del group[waiter]
+        if not group:
+            del self._groups[waiter.mask]
+        if waiter.agent_id is not None and self._by_agent.get(waiter.agent_id) is waiter:
+            del self._by_agent[waiter.agent_id]
@@ -6,6 +6,7 @@ from datetime import datetime
 from enum import Enum
 from typing import List
 
+from agent_stack.core.tasks.skills import CapabilityMask
 from agent_stack.core.types.base import AgentID
 from agent_stack.core.types.task import Task
 
@@ -25,6 +26,9 @@ class AgentMetadata:
     status: str
     version: str
 
+    # Capabilities share SkillRegistry bits with the string capability tags
+    capability_mask = CapabilityMask("capabilities")
+
 class BaseAgent(ABC):
     """Abstract base class for all agents in the system.
     
@@ -0,0 +1,74 @@
+"""
+AI Agent Stack - Event Dispatch Benchmark
+
+Subscribes many per-agent handlers to one event type and compares the cost
+of finding the handlers for an event by testing every filter with the
+indexed lookup the SystemEventBus uses, then times topic matching against
+a growing number of wildcard patterns.
+
+Usage: python -m benchmarks.event_dispatch [--subscribers 10000] [--events 20000]
+"""
+
+import argparse
+import random
+import time
+
+from agent_stack.core.events import EventHandler
+from agent_stack.core.events.index import HandlerIndex
+from agent_stack.core.events.topics import TopicTrie
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--unfiltered", type=int, default=10)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    handlers = [EventHandler(print) for _ in range(args.unfiltered)]
+    handlers += [
+        EventHandler(print, {"agent_id": f"agent_{i}"})
+        for i in range(args.subscribers)
+    ]
+    index = HandlerIndex()
+    for handler in handlers:
+        index.add(handler)
+
+    events = [
+        {"agent_id": f"agent_{rng.randrange(args.subscribers)}", "status": "WORKING"}
+        for _ in range(args.events)
+    ]
+
+    start = time.perf_counter()
+    scanned = sum(1 for event in events for h in handlers if h.matches(event))
+    linear = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed_matches = sum(len(index.match(event)) for event in events)
+    indexed = time.perf_counter() - start
+
+    assert scanned == indexed_matches
+    print(f"{len(handlers)} subscribers, {len(events)} events, "
+          f"{scanned / len(events):.0f} deliveries per event")
+    print(f"{'linear scan':>12}: {linear / len(events) * 1e6:9.1f} us/event")
+    print(f"{'indexed':>12}: {indexed / len(events) * 1e6:9.1f} us/event "
+          f"({linear / indexed:.0f}x)")
+
+    topics = [f"fleet_{i % 100}.agent_{i}.task.completed" for i in range(args.events)]
+    for patterns in (100, 1000, args.subscribers):
+        trie = TopicTrie()
+        for i in range(patterns):
+            trie.index_for(f"fleet_{i % 100}.agent_{i}.#").add(EventHandler(print))
+        trie.index_for("#.completed").add(EventHandler(print))
+
+        start = time.perf_counter()
+        for topic in topics:
+            # Bypass the per-topic cache to time the trie walk itself
+            found = []
+            trie._walk(trie._root, topic.split("."), 0, found)
+        elapsed = time.perf_counter() - start
+        print(f"{patterns:>6} patterns: {elapsed / len(topics) * 1e6:9.1f} us/topic")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+AI Agent Stack - Scheduling Makespan Benchmark
+
+Simulates a fleet of agents draining a build DAG and compares the makespan
+of the priority-only policy with the critical-path policy. Time is
+simulated, so runs are fast and deterministic for a given seed.
+
+Usage: python -m benchmarks.makespan [--agents 8] [--chains 6] [--depth 120]
+"""
+
+from typing import Dict, List
+import argparse
+import heapq
+import os
+import random
+import tempfile
+
+from agent_stack.core.tasks import TaskPool
+from agent_stack.core.tasks.scheduling import CriticalPathPolicy, PriorityPolicy
+
+def build_workload(chains: int, depth: int, leaves: int, seed: int) -> List[Dict]:
+    """Long low-priority dependency chains next to many short urgent leaves"""
+    rng = random.Random(seed)
+    specs = []
+    for chain in range(chains):
+        previous = None
+        for step in range(depth):
+            task_id = f"chain_{chain}_{step}"
+            specs.append({
+                "task_id": task_id,
+                "name": "compile",
+                "priority": 1,
+                "dependencies": {previous} if previous else set(),
+                "estimated_duration": rng.uniform(2, 8),
+            })
+            previous = task_id
+    for leaf in range(leaves):
+        specs.append({
+            "task_id": f"leaf_{leaf}",
+            "name": "lint",
+            "priority": rng.randint(2, 4),
+            "estimated_duration": rng.uniform(0.5, 3),
+        })
+    return specs
+
+def simulate(policy, specs: List[Dict], agents: int) -> float:
+    """Return the simulated makespan of draining the workload"""
+    TaskPool.reset()
+    TaskPool.configure_scheduling(policy)
+    TaskPool.create_tasks(specs)
+    durations = {spec["task_id"]: spec["estimated_duration"] for spec in specs}
+
+    clock = 0.0
+    idle = [f"agent_{i}" for i in range(agents)]
+    running = []
+    while True:
+        while idle:
+            task = TaskPool.get_task(idle[-1], [])
+            if task is None:
+                break
+            agent_id = idle.pop()
+            heapq.heappush(running, (clock + durations[task.task_id], task.task_id, agent_id))
+
+        if not running:
+            return clock
+
+        clock, task_id, agent_id = heapq.heappop(running)
+        TaskPool.complete_task(task_id, agent_id)
+        idle.append(agent_id)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--chains", type=int, default=6)
+    parser.add_argument("--depth", type=int, default=120)
+    parser.add_argument("--leaves", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Ready notifications go to the event bus and logs, which the
+    # simulation does not need
+    TaskPool._notify_task_ready = classmethod(lambda cls, task: None)
+    os.chdir(tempfile.mkdtemp())
+
+    specs = build_workload(args.chains, args.depth, args.leaves, args.seed)
+    total = sum(spec["estimated_duration"] for spec in specs)
+    print(f"{len(specs)} tasks, {args.agents} agents, lower bound {total / args.agents:.1f}")
+    for policy in (PriorityPolicy(), CriticalPathPolicy()):
+        makespan = simulate(policy, specs, args.agents)
+        print(f"{type(policy).__name__:>20}: makespan {makespan:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+AI Agent Stack - Task Memory Benchmark
+
+Reports the traced heap cost per task of the compact Task representation
+next to the previous dataclass layout.
+
+Usage: python -m benchmarks.task_memory [--sizes 10000 100000 1000000]
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+import argparse
+import gc
+import tracemalloc
+import uuid
+
+from agent_stack.core.tasks import Task
+
+SKILLS = ["python", "docker", "sql", "frontend", "testing", "docs"]
+
+@dataclass
+class DataclassTask:
+    """Task layout before the slotted representation"""
+    task_id: str = field(default_factory=lambda: f"task_{uuid.uuid4().hex[:8]}")
+    name: str = ""
+    description: str = ""
+    priority: int = 1
+    status: str = "PENDING"
+    progress: int = 0
+    assigned_agent: Optional[str] = None
+    dependencies: Set[str] = field(default_factory=set)
+    required_skills: Set[str] = field(default_factory=set)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    estimated_duration: Optional[int] = None
+    actual_duration: Optional[int] = None
+    metadata: Dict = field(default_factory=dict)
+
+def build(task_class, count: int) -> List:
+    """Build tasks shaped like a typical pool: some deps, a few skill sets"""
+    tasks = []
+    for i in range(count):
+        dependencies = {f"task_{i - 1}"} if i % 4 else set()
+        tasks.append(task_class(
+            task_id=f"task_{i}",
+            name="build",
+            priority=i % 4 + 1,
+            status="COMPLETED" if i % 3 == 0 else "PENDING",
+            dependencies=dependencies,
+            required_skills={SKILLS[i % len(SKILLS)], SKILLS[i % 2]},
+            completed_at=datetime.utcnow() if i % 3 == 0 else None,
+        ))
+    return tasks
+
+def measure(task_class, count: int) -> float:
+    """Return traced bytes per task for a list of count tasks"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tasks = build(task_class, count)
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del tasks
+    return used / count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'tasks':>10} {'dataclass B/task':>18} {'compact B/task':>16} {'saving':>8}")
+    for count in args.sizes:
+        before = measure(DataclassTask, count)
+        after = measure(Task, count)
+        print(f"{count:>10} {before:>18.1f} {after:>16.1f} {1 - after / before:>8.1%}")
+
+if __name__ == "__main__":
+    main()
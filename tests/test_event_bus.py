@@ -0,0 +1,220 @@
+"""Tests for the system event bus."""
+
+import threading
+from typing import List, Tuple
+
+from agent_stack.core.events import EventHandler, SystemEventBus, SystemEvents
+from agent_stack.core.events.backpressure import EventQueue
+from agent_stack.core.events.index import HandlerIndex
+from agent_stack.core.events.topics import TopicTrie
+
+def test_handler_index_matches_like_a_linear_scan() -> None:
+    handlers = [
+        EventHandler(print),
+        EventHandler(print, {"agent_id": "a"}),
+        EventHandler(print, {"agent_id": "b"}),
+        EventHandler(print, {"agent_id": "a", "status": "IDLE"}),
+        EventHandler(print, {"task_id": "t1"}),
+        EventHandler(print, {"agent_id": None}),
+        EventHandler(print, {"tags": ["x"]}),
+    ]
+    index = HandlerIndex()
+    for handler in handlers:
+        index.add(handler)
+
+    events = [
+        {"agent_id": "a", "status": "IDLE"},
+        {"agent_id": "a", "status": "WORKING", "task_id": "t1"},
+        {"task_id": "t2"},
+        {"tags": ["x"], "agent_id": ["unhashable"]},
+    ]
+    for event in events:
+        expected = {h.id for h in handlers if h.matches(event)}
+        assert {h.id for h in index.match(event)} == expected
+
+    assert index.remove(handlers[1].id)
+    assert not index.remove(handlers[1].id)
+    assert handlers[1] not in index.match({"agent_id": "a"})
+    assert len(index) == len(handlers) - 1
+
+def test_dispatch_reaches_only_matching_subscribers() -> None:
+    received: List[Tuple[str, str]] = []
+    bus = SystemEventBus()
+    ids = [
+        SystemEventBus.subscribe(
+            "test_index_event", lambda t, d, n=name: received.append((n, d["agent_id"])),
+            {"agent_id": name}
+        )
+        for name in ("a", "b")
+    ]
+
+    bus._dispatch_event("test_index_event", {"agent_id": "b"})
+    for handler_id in ids:
+        SystemEventBus.unsubscribe("test_index_event", handler_id)
+    bus._dispatch_event("test_index_event", {"agent_id": "b"})
+
+    assert received == [("b", "b")]
+
+def test_parallel_dispatch_keeps_key_order_and_skips_stalled_handlers() -> None:
+    received: List[Tuple[str, int]] = []
+    done = threading.Event()
+    release = threading.Event()
+
+    def record(event_type, data):
+        if data["agent_id"] == "slow":
+            release.wait(5)
+            return
+        received.append((data["agent_id"], data["seq"]))
+        if len(received) == 40:
+            done.set()
+
+    SystemEventBus.configure_dispatch(workers=1, handler_timeout=0.1)
+    handler_id = SystemEventBus.subscribe("test_dispatch_event", record)
+    try:
+        SystemEventBus.emit("test_dispatch_event", {"agent_id": "slow", "seq": 0})
+        for seq in range(20):
+            for agent_id in ("a", "b"):
+                SystemEventBus.emit("test_dispatch_event", {"agent_id": agent_id, "seq": seq})
+
+        # The one worker is stuck in the slow handler until it is replaced
+        assert done.wait(5)
+        for agent_id in ("a", "b"):
+            assert [seq for key, seq in received if key == agent_id] == list(range(20))
+        assert SystemEventBus.stats()["handler_timeouts"] == 1
+    finally:
+        release.set()
+        SystemEventBus.unsubscribe("test_dispatch_event", handler_id)
+        SystemEventBus.configure_dispatch(workers=0)
+
+def test_bounded_queue_overflow_policies() -> None:
+    events = EventQueue(maxsize=3, policies={
+        "heartbeat": "coalesce", "metric": "drop_oldest", "log": "drop_newest"
+    })
+    events.put("task_completed", {"task_id": "t1"})
+    events.put("heartbeat", {"agent_id": "a", "seq": 1})
+    events.put("metric", {"value": 1})
+
+    assert events.put("heartbeat", {"agent_id": "a", "seq": 2})
+    assert events.put("heartbeat", {"agent_id": "b", "seq": 1})
+    assert events.put("metric", {"value": 2})
+    assert not events.put("log", {"line": "x"})
+
+    # Lossless events are never evicted by another type's overflow
+    assert [events.get(timeout=0) for _ in range(3)] == [
+        ("task_completed", {"task_id": "t1"}),
+        ("heartbeat", {"agent_id": "b", "seq": 1}),
+        ("metric", {"value": 2}),
+    ]
+    assert events.get(timeout=0) is None
+    stats = events.stats()
+    assert (stats["coalesced"], stats["dropped_oldest"], stats["dropped_newest"]) == (1, 2, 1)
+
+def test_bounded_queue_blocks_lossless_emitters() -> None:
+    events = EventQueue(maxsize=1)
+    events.put("task_completed", {"task_id": "t1"})
+    emitter = threading.Thread(target=events.put, args=("task_completed", {"task_id": "t2"}))
+    emitter.start()
+    emitter.join(0.05)
+    assert emitter.is_alive()
+
+    assert events.get() == ("task_completed", {"task_id": "t1"})
+    emitter.join(5)
+    assert events.get() == ("task_completed", {"task_id": "t2"})
+    assert events.stats()["blocked_puts"] == 1
+
+    # Emitters holding locks are admitted over the bound instead
+    events.put("task_completed", {"task_id": "t3"})
+    assert events.put("task_completed", {"task_id": "t4"}, block=False)
+    assert events.stats()["queued"] == 2
+
+def test_dispatch_lanes_honour_the_queue_bound() -> None:
+    received: List[int] = []
+    release = threading.Event()
+
+    def record(event_type, data):
+        release.wait(5)
+        received.append(data["seq"])
+
+    SystemEventBus.configure_dispatch(workers=2, handler_timeout=None)
+    SystemEventBus.configure_queue(maxsize=5, default_policy="drop_newest")
+    handler_id = SystemEventBus.subscribe("test_lane_bound_event", record)
+    try:
+        for seq in range(200):
+            SystemEventBus.emit("test_lane_bound_event", {"agent_id": "a", "seq": seq})
+        for _ in range(200):
+            if SystemEventBus.stats()["queued"] == 0:
+                break
+            threading.Event().wait(0.01)
+
+        # One event is with the stalled handler, at most five wait in its lane
+        stats = SystemEventBus.stats()
+        assert stats["queued"] == 0
+        assert stats["backlog"] <= 5
+        assert stats["dropped_newest"] + stats["lane_dropped_newest"] == 200 - 1 - stats["backlog"]
+    finally:
+        release.set()
+        SystemEventBus.unsubscribe("test_lane_bound_event", handler_id)
+        SystemEventBus.configure_queue()
+        SystemEventBus.configure_dispatch(workers=0)
+    assert received == sorted(received)
+
+def test_coalescible_events_deliver_latest_value_per_key() -> None:
+    events = EventQueue()
+    events.set_coalescible({"agent_heartbeat"})
+    for seq in range(10):
+        for agent_id in ("a", "b"):
+            events.put("agent_heartbeat", {"agent_id": agent_id, "seq": seq})
+    events.put("task_completed", {"task_id": "t1"})
+    events.put("task_completed", {"task_id": "t1"})
+
+    delivered = []
+    while True:
+        item = events.get(timeout=0)
+        if item is None:
+            break
+        delivered.append(item)
+
+    assert delivered == [
+        ("agent_heartbeat", {"agent_id": "a", "seq": 9}),
+        ("agent_heartbeat", {"agent_id": "b", "seq": 9}),
+        ("task_completed", {"task_id": "t1"}),
+        ("task_completed", {"task_id": "t1"}),
+    ]
+    stats = events.stats()
+    assert (stats["coalescible"], stats["coalesced"]) == (20, 18)
+
+def test_topic_trie_wildcards() -> None:
+    trie = TopicTrie()
+    patterns = {}
+    for pattern in ["task.*", "task.#", "#", "agent.heartbeat", "*.completed", "task.#.failed"]:
+        handler = EventHandler(print)
+        trie.index_for(pattern).add(handler)
+        patterns[handler.id] = pattern
+
+    def matching(topic: str) -> set:
+        return {patterns[h.id] for index in trie.match(topic) for h in index.match({})}
+
+    assert matching("task.completed") == {"task.*", "task.#", "#", "*.completed"}
+    assert matching("task") == {"task.#", "#"}
+    assert matching("task.attempt.failed") == {"task.#", "#", "task.#.failed"}
+    assert matching("agent.heartbeat") == {"#", "agent.heartbeat"}
+
+def test_wildcard_subscribers_receive_flat_system_events() -> None:
+    received: List[Tuple[str, str]] = []
+    bus = SystemEventBus()
+    ids = [
+        ("task.*", SystemEventBus.subscribe("task.*", lambda t, d: received.append(("task.*", t)))),
+        (SystemEvents.TASK_COMPLETED, SystemEventBus.subscribe(
+            SystemEvents.TASK_COMPLETED, lambda t, d: received.append(("flat", t)))),
+    ]
+
+    bus._dispatch_event(SystemEvents.TASK_COMPLETED, {})
+    bus._dispatch_event("task.failed", {})
+    bus._dispatch_event(SystemEvents.AGENT_HEARTBEAT, {})
+    for event_type, handler_id in ids:
+        SystemEventBus.unsubscribe(event_type, handler_id)
+    bus._dispatch_event(SystemEvents.TASK_COMPLETED, {})
+
+    assert received == [
+        ("flat", "task_completed"), ("task.*", "task_completed"), ("task.*", "task.failed"),
+    ]
@@ -0,0 +1,51 @@
+"""Tests for learned task duration estimates."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from agent_stack.core.tasks import TaskPool
+from agent_stack.core.tasks.estimator import DurationEstimator, P2Quantile
+
+def test_p2_quantile_tracks_stream() -> None:
+    rng = random.Random(3)
+    values = [rng.expovariate(1 / 10) for _ in range(20000)]
+    sketch = P2Quantile(0.9)
+    for value in values:
+        sketch.add(value)
+
+    exact = sorted(values)[int(0.9 * len(values))]
+    assert sketch.value() == pytest.approx(exact, rel=0.05)
+
+def test_estimates_fill_new_tasks_and_persist(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(TaskPool, "_notify_task_ready", classmethod(lambda cls, task: None))
+    TaskPool.reset()
+
+    path = tmp_path / "durations.json"
+    estimator = DurationEstimator(path, alpha=0.5, min_samples=2)
+    for duration in (10.0, 20.0):
+        estimator.observe("compile", {"python"}, duration)
+    estimator.observe("", {"python"}, 100.0)
+
+    assert estimator.estimate("compile", {"python"}) == 15.0
+    # Too few samples for the name, so the skill set answers
+    assert estimator.estimate("lint", {"python"}) == pytest.approx(57.5)
+    assert estimator.estimate("lint", {"sql"}) is None
+
+    TaskPool.configure_estimator(estimator)
+    task = TaskPool.create_task("compile", required_skills={"python"})
+    assert task.estimated_duration == 15.0
+    assert TaskPool.create_task("compile", estimated_duration=3).estimated_duration == 3
+
+    TaskPool.get_task("agent_1", ["python"])
+    TaskPool.complete_task(task.task_id, "agent_1")
+    assert estimator.snapshot()["name:compile"]["count"] == 3
+
+    estimator.save()
+    restored = DurationEstimator(path, alpha=0.5, min_samples=2)
+    assert restored.snapshot() == estimator.snapshot()
+    TaskPool.reset()
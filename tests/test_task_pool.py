@@ -0,0 +1,850 @@
+"""Tests for the task pool scheduler."""
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Generator, List, Optional, Set
+
+import pytest
+
+from agent_stack.core.tasks import Task, TaskPool
+
+@pytest.fixture
+def task_pool(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> Generator[List[str], None, None]:
+    """Provide an empty task pool and record task_ready notifications.
+
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+        tmp_path: Working directory for any log files the pool writes
+
+    Yields:
+        List of task ids in the order they were announced as ready
+    """
+    monkeypatch.chdir(tmp_path)
+    ready: List[str] = []
+    monkeypatch.setattr(
+        TaskPool, "_notify_task_ready", classmethod(lambda cls, task: ready.append(task.task_id))
+    )
+    TaskPool.reset()
+    yield ready
+    TaskPool.reset()
+
+def test_get_task_returns_highest_priority(task_pool: List[str]) -> None:
+    low = TaskPool.create_task("low", priority=1)
+    high = TaskPool.create_task("high", priority=5)
+
+    assert TaskPool.get_task("agent_1", []) is high
+    assert TaskPool.get_task("agent_1", []) is low
+    assert TaskPool.get_task("agent_1", []) is None
+
+def test_equal_priority_is_first_in_first_out(task_pool: List[str]) -> None:
+    first = TaskPool.create_task("first")
+    second = TaskPool.create_task("second")
+
+    assert TaskPool.get_task("agent_1", []) is first
+    assert TaskPool.get_task("agent_1", []) is second
+
+def test_get_task_respects_required_skills(task_pool: List[str]) -> None:
+    skilled = TaskPool.create_task("skilled", priority=5, required_skills={"build"})
+    plain = TaskPool.create_task("plain", priority=1)
+
+    assert TaskPool.get_task("agent_1", ["communication"]) is plain
+    assert TaskPool.get_task("agent_2", ["communication"]) is None
+    assert TaskPool.get_task("agent_2", ["build", "communication"]) is skilled
+
+def test_dependent_task_becomes_ready_on_completion(task_pool: List[str]) -> None:
+    parent = TaskPool.create_task("parent")
+    child = TaskPool.create_task("child", priority=9, dependencies={parent.task_id})
+
+    assert TaskPool.get_task("agent_1", []) is parent
+    assert TaskPool.get_task("agent_2", []) is None
+
+    TaskPool.complete_task(parent.task_id, "agent_1")
+
+    assert task_pool == [child.task_id]
+    assert TaskPool.get_task("agent_2", []) is child
+
+def test_reassign_returns_task_to_ready_queue(task_pool: List[str]) -> None:
+    task = TaskPool.create_task("task")
+    assert TaskPool.get_task("agent_1", []) is task
+
+    TaskPool.reassign_task(task.task_id)
+
+    assert task.status == "PENDING"
+    assert TaskPool.get_task("agent_2", []) is task
+    assert task.assigned_agent == "agent_2"
+
+def test_reassign_to_agent_removes_task_from_ready_queue(task_pool: List[str]) -> None:
+    task = TaskPool.create_task("task")
+
+    TaskPool.reassign_task(task.task_id, "agent_1")
+
+    assert TaskPool.get_task("agent_2", []) is None
+    assert [t.task_id for t in TaskPool.get_agent_tasks("agent_1")] == [task.task_id]
+
+def test_task_released_only_when_last_dependency_completes(task_pool: List[str]) -> None:
+    left = TaskPool.create_task("left")
+    right = TaskPool.create_task("right")
+    join = TaskPool.create_task("join", dependencies={left.task_id, right.task_id})
+
+    TaskPool.get_task("agent_1", [])
+    TaskPool.get_task("agent_2", [])
+    TaskPool.complete_task(left.task_id, "agent_1")
+
+    assert task_pool == []
+    assert TaskPool.get_task("agent_1", []) is None
+
+    TaskPool.complete_task(right.task_id, "agent_2")
+
+    assert task_pool == [join.task_id]
+    assert TaskPool.get_task("agent_1", []) is join
+
+def test_dependency_on_completed_task_is_ready_immediately(task_pool: List[str]) -> None:
+    parent = TaskPool.create_task("parent")
+    TaskPool.get_task("agent_1", [])
+    TaskPool.complete_task(parent.task_id, "agent_1")
+
+    child = TaskPool.create_task("child", dependencies={parent.task_id})
+
+    assert TaskPool.get_task("agent_1", []) is child
+
+def test_cycle_is_rejected_without_side_effects(task_pool: List[str]) -> None:
+    TaskPool.create_task("seed")
+    task_id = "task_cycle"
+    TaskPool.create_task("dangling", dependencies={task_id})
+
+    with pytest.raises(ValueError, match="cycle"):
+        TaskPool._update_dependency_graph(
+            Task(task_id=task_id, dependencies={next(iter(TaskPool._dependents[task_id]))})
+        )
+
+    assert task_id not in TaskPool._tasks
+    assert task_id not in TaskPool._dependency_graph
+
+def test_long_dependency_chain_does_not_recurse(task_pool: List[str]) -> None:
+    previous = TaskPool.create_task("start")
+    for index in range(5000):
+        previous = TaskPool.create_task(f"step_{index}", dependencies={previous.task_id})
+
+    assert TaskPool._unmet_dependencies[previous.task_id] == 1
+
+def test_wide_diamonds_are_accepted(task_pool: List[str]) -> None:
+    layer = [TaskPool.create_task("root").task_id]
+    for depth in range(30):
+        left = TaskPool.create_task(f"left_{depth}", dependencies=set(layer))
+        right = TaskPool.create_task(f"right_{depth}", dependencies=set(layer))
+        layer = [left.task_id, right.task_id]
+
+    assert len(TaskPool._tasks) == 61
+
+def test_create_tasks_resolves_forward_references(task_pool: List[str]) -> None:
+    tasks = TaskPool.create_tasks([
+        {"task_id": "deploy", "name": "deploy", "dependencies": {"build", "test"}},
+        {"task_id": "test", "name": "test", "dependencies": {"build"}},
+        {"task_id": "build", "name": "build"},
+    ])
+
+    assert [task.task_id for task in tasks] == ["build", "test", "deploy"]
+    assert TaskPool.get_task("agent_1", []).task_id == "build"
+    assert TaskPool.get_task("agent_1", []) is None
+
+def test_create_tasks_is_atomic_on_cycle(task_pool: List[str]) -> None:
+    with pytest.raises(ValueError, match="cycle"):
+        TaskPool.create_tasks([
+            {"task_id": "a", "dependencies": {"c"}},
+            {"task_id": "b", "dependencies": {"a"}},
+            {"task_id": "c", "dependencies": {"b"}},
+            {"task_id": "d"},
+        ])
+
+    assert TaskPool._tasks == {}
+    assert TaskPool.get_task("agent_1", []) is None
+
+def test_create_tasks_rejects_duplicate_ids(task_pool: List[str]) -> None:
+    TaskPool.create_tasks([{"task_id": "a"}])
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        TaskPool.create_tasks([{"task_id": "b"}, {"task_id": "a"}])
+
+    assert set(TaskPool._tasks) == {"a"}
+
+def test_completed_batch_task_releases_existing_dependents(task_pool: List[str]) -> None:
+    TaskPool.create_tasks([{"task_id": "child", "dependencies": {"parent"}}])
+    assert TaskPool.get_task("agent_1", []) is None
+
+    TaskPool.create_tasks([{"task_id": "parent", "status": "COMPLETED"}])
+
+    assert task_pool == ["child"]
+    assert TaskPool.get_task("agent_1", []).task_id == "child"
+
+def test_load_tasks_from_repository_definitions(task_pool: List[str]) -> None:
+    from agent_stack.core.tasks.loader import load_tasks
+
+    root = Path(__file__).resolve().parent.parent
+    tasks = load_tasks(root / "devstack" / "tasks" / "tasks.json", root / "tasks")
+    by_id = {task.task_id: task for task in tasks}
+
+    assert by_id["GLFS-SETUP-001"].status == "COMPLETED"
+    assert by_id["TASK-1.4"].dependencies == {"TASK-1.3"}
+    assert {"TASK-EH001", "TASK-EH002"} <= by_id["TASK-EH003"].dependencies
+    assert by_id["TASK-TI002"].priority == 4
+
+def test_concurrent_claims_never_assign_a_task_twice(task_pool: List[str]) -> None:
+    skill_sets = [set(), {"build"}, {"test"}, {"build", "test"}]
+    specs = []
+    for index in range(2000):
+        spec = {"task_id": f"task_{index}", "required_skills": skill_sets[index % 4]}
+        if index >= 400:
+            spec["dependencies"] = {f"task_{index - 400}"}
+        specs.append(spec)
+    TaskPool.create_tasks(specs)
+
+    claims: Counter = Counter()
+    claims_lock = threading.Lock()
+    capabilities = [["build"], ["test"], ["build", "test"], ["build", "test"]]
+
+    def agent(agent_id: str, skills: List[str]) -> None:
+        idle_polls = 0
+        while idle_polls < 200:
+            task = TaskPool.get_task(agent_id, skills)
+            if task is None:
+                idle_polls += 1
+                continue
+            idle_polls = 0
+            with claims_lock:
+                claims[task.task_id] += 1
+            TaskPool.complete_task(task.task_id, agent_id)
+
+    threads = [
+        threading.Thread(target=agent, args=(f"agent_{index}", capabilities[index % 4]))
+        for index in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(claims.values()) == 1
+    assert len(claims) == 2000
+    assert all(task.status == "COMPLETED" for task in TaskPool._tasks.values())
+
+def test_claim_rechecks_a_task_changed_after_it_was_popped(task_pool: List[str]) -> None:
+    task = TaskPool.create_task("contended")
+    # Popped by one claimer, which has not yet taken the pool lock
+    assert TaskPool._ready.pop(0) == task.task_id
+
+    TaskPool.reassign_task(task.task_id, "agent_2")
+    with TaskPool._lock:
+        assert not TaskPool._claim_task(task.task_id, "agent_1")
+    assert task.assigned_agent == "agent_2"
+
+    TaskPool.reassign_task(task.task_id)
+    with TaskPool._lock:
+        assert TaskPool._claim_task(task.task_id, "agent_1")
+    assert task.task_id not in TaskPool._ready
+    assert TaskPool.get_agent_tasks("agent_1") == [task]
+    assert TaskPool.get_agent_tasks("agent_2") == []
+
+def test_lost_store_claim_follows_the_remote_scheduler(
+    task_pool: List[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class SharedStore:
+        """Store whose rows another scheduler process also claims"""
+
+        def __init__(self) -> None:
+            self.rows: Dict[str, Dict] = {}
+            self.claimable: Set[str] = set()
+
+        def load(self) -> List[Task]:
+            return []
+
+        def save(self, task: Task, created: bool = False) -> None:
+            pass
+
+        def flush(self) -> None:
+            pass
+
+        def try_claim(self, task_id: str, agent_id: str) -> bool:
+            return task_id in self.claimable
+
+        def load_state(self, task_id: str) -> Optional[Dict]:
+            return self.rows.get(task_id)
+
+    store = SharedStore()
+    TaskPool.attach_store(store)
+    monkeypatch.setattr(TaskPool, "_store_recheck_seconds", 0.01)
+    parent = TaskPool.create_task("parent", priority=5)
+    child = TaskPool.create_task("child", dependencies={parent.task_id})
+    ghost = TaskPool.create_task("ghost")
+
+    store.rows[parent.task_id] = {"status": "ASSIGNED", "assigned_agent": "remote_agent"}
+    assert TaskPool.get_task("agent_1", []) is None
+    assert (parent.status, parent.assigned_agent) == ("ASSIGNED", "remote_agent")
+    assert TaskPool.lookup_task(ghost.task_id) is None
+    assert TaskPool.get_agent_tasks("agent_1") == []
+
+    # Finishing on the other scheduler releases the dependent here
+    store.rows[parent.task_id] = {"status": "COMPLETED", "assigned_agent": "remote_agent"}
+    store.claimable.add(child.task_id)
+    assert TaskPool.wait_for_task("agent_1", [], timeout=5) is child
+
+def test_store_claims_run_outside_the_pool_lock(task_pool: List[str]) -> None:
+    entered = threading.Event()
+    release = threading.Event()
+
+    class StalledStore:
+        """Store whose claim of the first task waits until released"""
+
+        def load(self) -> List[Task]:
+            return []
+
+        def save(self, task: Task, created: bool = False) -> None:
+            pass
+
+        def flush(self) -> None:
+            pass
+
+        def try_claim(self, task_id: str, agent_id: str) -> bool:
+            if task_id == "first":
+                entered.set()
+                release.wait(5)
+            return True
+
+    TaskPool.attach_store(StalledStore())
+    TaskPool.create_tasks([{"task_id": "first", "priority": 5}, {"task_id": "second"}])
+    claims: Dict[str, Optional[Task]] = {}
+    def claim(key: str, agent_id: str) -> None:
+        claims[key] = TaskPool.get_task(agent_id, [])
+
+    slow = threading.Thread(target=claim, args=("slow", "agent_1"))
+    slow.start()
+    try:
+        assert entered.wait(5)
+        # A stalled store round trip does not hold up other claims
+        fast = threading.Thread(target=claim, args=("fast", "agent_2"))
+        fast.start()
+        fast.join(2)
+        assert not fast.is_alive()
+        assert claims["fast"].task_id == "second"
+        assert TaskPool.get_task("agent_3", []) is None
+    finally:
+        release.set()
+        slow.join(5)
+    assert claims["slow"].task_id == "first"
+    assert claims["slow"].assigned_agent == "agent_1"
+
+def test_finished_tasks_are_evicted_to_archive(task_pool: List[str], tmp_path: Path) -> None:
+    from agent_stack.core.tasks.archive import TaskArchive
+
+    archive = TaskArchive(tmp_path / "archive.db", keep_finished=1)
+    TaskPool.configure_archive(archive)
+    TaskPool.create_tasks([
+        {"task_id": "a"},
+        {"task_id": "b"},
+        {"task_id": "c", "dependencies": {"a"}},
+    ])
+
+    claimed = {TaskPool.get_task(agent_id, []).task_id: agent_id
+               for agent_id in ("agent_1", "agent_2")}
+    TaskPool.complete_task("a", claimed["a"])
+    TaskPool.complete_task("b", claimed["b"])
+
+    # "a" is older but pinned by its pending dependent, so "b" is evicted
+    assert "a" in TaskPool._tasks and "a" in TaskPool._pinned
+    assert "b" not in TaskPool._tasks
+    assert TaskPool.lookup_task("b").status == "COMPLETED"
+
+    late = TaskPool.create_task("late", dependencies={"b"})
+    assert TaskPool._unmet_dependencies[late.task_id] == 0
+    assert "b" not in TaskPool._dependents
+
+    TaskPool.get_task("agent_1", [])
+    TaskPool.complete_task("c", "agent_1")
+    assert "a" not in TaskPool._tasks and not TaskPool._pinned
+    archive.close()
+
+def test_compact_task_keeps_attribute_api() -> None:
+    created = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    task = Task(task_id="t", required_skills={"python"}, created_at=created)
+    other = Task(task_id="u", required_skills=["python"])
+
+    assert not hasattr(task, "__dict__")
+    assert task.created_at == created
+    assert task.required_skills == {"python"}
+    assert task.skill_mask == other.skill_mask
+    assert task._dependencies is other._dependencies
+
+    # Set methods copy the shared set on the first write
+    task.dependencies.add("a")
+    task.required_skills.add("sql")
+    task.required_skills.discard("python")
+    assert task.dependencies == {"a"} and other.dependencies == set()
+    assert task.required_skills == {"sql"} and other.required_skills == {"python"}
+    assert task.dependencies | {"b"} == {"a", "b"}
+
+    task.metadata["retries"] = 1
+    assert other.metadata == {}
+    shared: Dict = {}
+    owner = Task(task_id="v", metadata=shared)
+    shared["note"] = "x"
+    assert owner.metadata is shared and owner.metadata["note"] == "x"
+    task.completed_at = created
+    assert task.completed_timestamp == task.created_timestamp
+
+def test_skill_masks_match_tags_and_capability_enum(task_pool: List[str]) -> None:
+    from agent_stack.core.tasks.skills import SkillRegistry
+    from agent_stack.core.types import AgentCapability
+
+    task = TaskPool.create_task("monitor", required_skills={"health_monitoring", "python"})
+    mask = SkillRegistry.mask([AgentCapability.HEALTH_MONITORING, "python"])
+
+    assert task.skill_mask == mask
+    assert task.required_skills == {"health_monitoring", "python"}
+    assert TaskPool.get_task("agent_1", SkillRegistry.mask(["python"])) is None
+    assert TaskPool.get_task("agent_1", mask | SkillRegistry.bit("sql")) is task
+
+def test_agent_capability_mask_follows_tag_edits() -> None:
+    from agent_stack.core.agents import Agent
+    from agent_stack.core.tasks.skills import SkillRegistry
+
+    agent = Agent("agent_1")
+    assert agent.state.capability_mask == 0
+    agent.state.capability_tags.append("python")
+    assert agent.state.capability_mask == SkillRegistry.mask(["python"])
+    agent.state.capability_tags = ["sql"]
+    assert agent.state.capability_mask == SkillRegistry.mask(["sql"])
+
+def test_lease_tasks_claims_batch_and_expires(task_pool: List[str]) -> None:
+    for i in range(5):
+        TaskPool.create_task(f"small_{i}")
+
+    leased = TaskPool.lease_tasks("agent_1", [], n=3, lease_seconds=0.05)
+    assert [task.name for task in leased] == ["small_0", "small_1", "small_2"]
+    assert all(task.assigned_agent == "agent_1" for task in leased)
+
+    kept = leased[0].task_id
+    TaskPool.complete_task(leased[1].task_id, "agent_1")
+    lease = TaskPool.renew_lease(kept, "agent_1", lease_seconds=30)
+    assert TaskPool.get_lease(kept) is lease
+    with pytest.raises(ValueError):
+        TaskPool.renew_lease(kept, "agent_2")
+
+    deadline = time.monotonic() + 5
+    while TaskPool.get_lease(leased[2].task_id) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert TaskPool._tasks[leased[2].task_id].status == "PENDING"
+    assert TaskPool._tasks[kept].assigned_agent == "agent_1"
+    assert len(TaskPool.lease_tasks("agent_2", [], n=10, lease_seconds=30)) == 3
+
+def test_agent_completes_every_leased_task(
+    task_pool: List[str], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from agent_stack.core.agents import Agent
+
+    # Agents append their progress comments under the working directory
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "agent_stack" / "logs" / "work_logs").mkdir(parents=True)
+    for i in range(3):
+        TaskPool.create_task(f"small_{i}")
+    agent = Agent("agent_1")
+    agent.state.max_concurrent_tasks = 3
+
+    leased = agent.request_tasks(lease_seconds=30)
+    assert len(leased) == 3
+    agent.fail_task(leased[2].task_id, "boom")
+    for task in leased[:2]:
+        agent.complete_task(task.task_id)
+
+    assert TaskPool._tasks[leased[0].task_id].status == "COMPLETED"
+    assert TaskPool._tasks[leased[1].task_id].status == "COMPLETED"
+    assert TaskPool.get_agent_tasks("agent_1") == []
+    assert (agent.state.current_task_count, agent.state.current_task) == (0, None)
+    assert agent.state.status == "IDLE"
+
+def test_agent_releases_tasks_whose_lease_ran_out(
+    task_pool: List[str], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from agent_stack.core.agents import Agent
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "agent_stack" / "logs" / "work_logs").mkdir(parents=True)
+    for i in range(3):
+        TaskPool.create_task(f"task_{i}")
+    agent = Agent("agent_1")
+    agent.state.max_concurrent_tasks = 1
+
+    # Heartbeats keep a lease alive well past its duration
+    renewed = agent.request_tasks(lease_seconds=0.2)[0]
+    for _ in range(6):
+        time.sleep(0.05)
+        agent.send_heartbeat()
+    assert TaskPool.get_lease(renewed.task_id).agent_id == "agent_1"
+
+    agent.state.max_concurrent_tasks = 3
+    lost = agent.request_tasks(lease_seconds=0.05)
+    for _ in range(200):
+        if all(TaskPool.get_lease(task.task_id) is None for task in lost):
+            break
+        time.sleep(0.01)
+    agent.complete_task(lost[0].task_id)
+    agent.fail_task(lost[1].task_id, "boom")
+    agent.complete_task(renewed.task_id)
+
+    assert [task.status for task in lost] == ["PENDING", "PENDING"]
+    assert renewed.status == "COMPLETED"
+    assert (agent.state.current_task_count, agent.state.assigned_tasks) == (0, set())
+    assert agent.state.status == "IDLE"
+
+def test_critical_path_policy_starts_long_chains_first(task_pool: List[str]) -> None:
+    from agent_stack.core.tasks.scheduling import CriticalPathPolicy, PriorityPolicy
+
+    policy = CriticalPathPolicy()
+    TaskPool.configure_scheduling(policy)
+    try:
+        TaskPool.create_tasks([
+            {"task_id": "leaf", "priority": 4, "estimated_duration": 1},
+            {"task_id": "head", "estimated_duration": 5},
+            {"task_id": "tail", "dependencies": {"head"}, "estimated_duration": 5},
+        ])
+        TaskPool.create_task("other", priority=3, estimated_duration=3)
+        assert policy.path_length("head") == 10
+
+        # A new dependent grows the path of the ready task it waits on
+        TaskPool.create_task("late", dependencies={"leaf"}, estimated_duration=20)
+        assert policy.path_length("leaf") == 21
+
+        order = [TaskPool.get_task(f"agent_{i}", []).task_id for i in range(3)]
+        assert order[:2] == ["leaf", "head"]
+    finally:
+        TaskPool.configure_scheduling(PriorityPolicy())
+
+def test_task_ready_handlers_can_claim_while_the_event_queue_is_full(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    from agent_stack.core.events import SystemEventBus
+
+    # Unlike the task_pool fixture, keep the real task_ready notifications
+    monkeypatch.chdir(tmp_path)
+    TaskPool.reset()
+    claimed: List[str] = []
+    all_claimed = threading.Event()
+
+    def claim(event_type, data):
+        task = TaskPool.get_task("agent_2", [])
+        if task is not None:
+            claimed.append(task.task_id)
+        if len(claimed) == 20:
+            all_claimed.set()
+
+    SystemEventBus.configure_queue(maxsize=2)
+    handler_id = SystemEventBus.subscribe("task_ready", claim)
+    try:
+        parent = TaskPool.create_task("parent")
+        for i in range(20):
+            TaskPool.create_task(f"child_{i}", dependencies={parent.task_id})
+        assert TaskPool.get_task("agent_1", []) is parent
+
+        # The handler waits for the pool lock held while the ready events go out
+        completion = threading.Thread(
+            target=TaskPool.complete_task, args=(parent.task_id, "agent_1"), daemon=True
+        )
+        completion.start()
+        completion.join(5)
+        assert not completion.is_alive()
+        assert all_claimed.wait(5)
+    finally:
+        SystemEventBus.unsubscribe("task_ready", handler_id)
+        SystemEventBus.configure_queue()
+        TaskPool.reset()
+
+def test_wait_for_task_wakes_one_matching_waiter(task_pool: List[str]) -> None:
+    results = {}
+
+    def wait(agent_id: str, capabilities: List[str]) -> None:
+        task = TaskPool.wait_for_task(agent_id, capabilities, timeout=0.5)
+        results[agent_id] = task.task_id if task else None
+
+    threads = [
+        threading.Thread(target=wait, args=(f"agent_{i}", caps))
+        for i, caps in enumerate([["python"], ["sql"], ["sql", "python"]])
+    ]
+    deadline = time.monotonic() + 5
+    for parked, thread in enumerate(threads, 1):
+        thread.start()
+        while len(TaskPool._waiters) < parked and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    task = TaskPool.create_task("query", required_skills={"sql"})
+    for thread in threads:
+        thread.join()
+
+    # The longest waiting matching agent wins; the other match stays parked
+    assert results == {"agent_0": None, "agent_1": task.task_id, "agent_2": None}
+
+def test_wait_for_task_async(task_pool: List[str]) -> None:
+    import asyncio
+
+    async def main():
+        waiting = asyncio.ensure_future(TaskPool.wait_for_task_async("agent_1", [], timeout=5))
+        while not len(TaskPool._waiters):
+            await asyncio.sleep(0.001)
+        threading.Thread(target=TaskPool.create_task, args=("async",)).start()
+        return await waiting
+
+    task = asyncio.run(main())
+    assert task.name == "async"
+    assert asyncio.run(TaskPool.wait_for_task_async("agent_1", [], timeout=0.01)) is None
+    # A timed-out waiter is unregistered and cannot absorb a later wakeup
+    assert len(TaskPool._waiters) == 0
+
+def test_deadline_policy_orders_and_rejects(task_pool: List[str]) -> None:
+    from agent_stack.core.monitoring import HeartbeatMonitor, SchedulerMetrics
+    from agent_stack.core.tasks.scheduling import DeadlinePolicy, PriorityPolicy
+
+    SchedulerMetrics.reset()
+    TaskPool.configure_scheduling(DeadlinePolicy())
+    try:
+        bulk = TaskPool.create_task("bulk", priority=4)
+        relaxed = TaskPool.create_task("relaxed", metadata={"timeout_seconds": 600})
+        urgent = TaskPool.create_task("urgent", metadata={"timeout_seconds": 60})
+        hopeless = TaskPool.create_task("hopeless", estimated_duration=120,
+                                        metadata={"timeout_seconds": 60})
+        expiring = TaskPool.create_task("expiring", estimated_duration=59.95,
+                                        metadata={"timeout_seconds": 60})
+
+        assert hopeless.status == "FAILED"
+        deadline = time.monotonic() + 5
+        while expiring.status != "FAILED" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert expiring.metadata["failure_reason"] == "deadline_unreachable"
+
+        order = [TaskPool.get_task("agent_1", []).task_id for _ in range(3)]
+        assert order == [urgent.task_id, relaxed.task_id, bulk.task_id]
+
+        TaskPool.complete_task(urgent.task_id, "agent_1")
+        metrics = HeartbeatMonitor.get_deadline_metrics()
+        assert metrics["deadline_met"] == 1
+        assert metrics["deadline_rejected"] == 2
+    finally:
+        TaskPool.configure_scheduling(PriorityPolicy())
+
+def test_rejected_task_fails_its_dependents(task_pool: List[str], tmp_path: Path) -> None:
+    from agent_stack.core.tasks.archive import TaskArchive
+    from agent_stack.core.tasks.scheduling import DeadlinePolicy, PriorityPolicy
+
+    archive = TaskArchive(tmp_path / "archive.db", keep_finished=0)
+    TaskPool.configure_archive(archive)
+    TaskPool.configure_scheduling(DeadlinePolicy())
+    try:
+        # Rejected while its batch is inserted, taking later batch tasks with it
+        TaskPool.create_tasks([
+            {"task_id": "hopeless", "estimated_duration": 120,
+             "metadata": {"timeout_seconds": 60}},
+            {"task_id": "child", "dependencies": {"hopeless"}},
+            {"task_id": "grandchild", "dependencies": {"child"}},
+        ])
+        # Rejected by its deadline timer while waiting in the ready queue
+        expiring = TaskPool.create_task("expiring", estimated_duration=59.95,
+                                        metadata={"timeout_seconds": 60})
+        TaskPool.create_task("after", dependencies={expiring.task_id})
+        deadline = time.monotonic() + 5
+        while TaskPool._tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert not TaskPool._tasks and not TaskPool._unmet_dependencies
+        assert TaskPool.lookup_task("grandchild").metadata == {
+            "failure_reason": "dependency_failed", "failed_dependency": "hopeless"
+        }
+        assert expiring.metadata["failure_reason"] == "deadline_unreachable"
+    finally:
+        TaskPool.configure_scheduling(PriorityPolicy())
+        archive.close()
+
+def test_failed_task_retries_with_backoff(task_pool: List[str]) -> None:
+    import random
+
+    from agent_stack.core.tasks.retry import RetryPolicy
+
+    policy = RetryPolicy(max_retries=2, base_delay=0.02, max_delay=0.05, rng=random.Random(1))
+    delays = [policy.delay(attempt) for attempt in (1, 2, 3, 4)]
+    assert 0.01 <= delays[0] <= 0.02 and all(0.025 <= d <= 0.05 for d in delays[2:])
+
+    TaskPool.configure_retries(policy)
+    try:
+        task = TaskPool.create_task("flaky")
+        assert TaskPool.get_task("agent_1", []) is task
+        for attempt in (1, 2):
+            assert TaskPool.fail_task(task.task_id, "agent_1", "boom")
+            assert task.status == "RETRYING" and task.metadata["retries"] == attempt
+            assert TaskPool.get_task("agent_1", []) is None
+            # Back in the ready queue once the backoff expires
+            assert TaskPool.wait_for_task("agent_1", [], timeout=5) is task
+
+        assert not TaskPool.fail_task(task.task_id, "agent_1", "boom")
+        assert task.status == "FAILED"
+        assert task.metadata["failure_reason"] == "max_retries_exceeded"
+        assert task.metadata["last_error"] == "boom"
+    finally:
+        TaskPool.configure_retries(RetryPolicy())
+
+def test_failed_task_fails_its_dependents(task_pool: List[str], tmp_path: Path) -> None:
+    from agent_stack.core.tasks.archive import TaskArchive
+    from agent_stack.core.tasks.retry import RetryPolicy
+
+    archive = TaskArchive(tmp_path / "archive.db", keep_finished=0)
+    TaskPool.configure_archive(archive)
+    TaskPool.configure_retries(RetryPolicy(max_retries=0))
+    try:
+        TaskPool.create_tasks([
+            {"task_id": "build"},
+            {"task_id": "test", "dependencies": {"build"}},
+            {"task_id": "deploy", "dependencies": {"test"}},
+        ])
+        assert TaskPool.get_task("agent_1", []).task_id == "build"
+        assert not TaskPool.fail_task("build", "agent_1", "boom")
+
+        # The whole chain is failed and archived instead of waiting forever
+        assert not TaskPool._tasks and not TaskPool._finished and not TaskPool._pinned
+        for task_id in ("test", "deploy"):
+            task = TaskPool.lookup_task(task_id)
+            assert task.status == "FAILED"
+            assert task.metadata["failure_reason"] == "dependency_failed"
+            assert task.metadata["failed_dependency"] == "build"
+        assert TaskPool.lookup_task("build").metadata["failure_reason"] == "max_retries_exceeded"
+    finally:
+        TaskPool.configure_retries(RetryPolicy())
+        archive.close()
+
+def test_result_cache_completes_duplicate_tasks(task_pool: List[str], tmp_path: Path) -> None:
+    from agent_stack.core.tasks.cache import ResultCache
+
+    cache = ResultCache(tmp_path / "results.db", max_entries=1)
+    TaskPool.configure_cache(cache)
+    spec = {"cacheable": True, "parameters": {"package": "gcc", "version": "13"}}
+
+    first = TaskPool.create_task("build", metadata=spec)
+    TaskPool.get_task("agent_1", [])
+    TaskPool.complete_task(first.task_id, "agent_1", result={"artifact": "gcc.tar"})
+
+    rebuild = TaskPool.create_task("build", metadata=spec)
+    assert rebuild.status == "COMPLETED"
+    assert rebuild.metadata["result"] == {"artifact": "gcc.tar"}
+
+    # Same dependency outputs, so the dependent is a hit as well
+    TaskPool.create_tasks([
+        {"task_id": "install", "name": "install", "dependencies": {first.task_id},
+         "metadata": {"cacheable": True}},
+    ])
+    TaskPool.get_task("agent_1", [])
+    TaskPool.complete_task("install", "agent_1", result="ok")
+    again = TaskPool.create_task("install", dependencies={rebuild.task_id},
+                                 metadata={"cacheable": True})
+    assert again.metadata.get("cache_hit")
+
+    other = TaskPool.create_task("build", metadata={"cacheable": True, "parameters": {}})
+    assert other.status == "PENDING"
+
+    cache.close()
+    reopened = ResultCache(tmp_path / "results.db")
+    assert reopened.get(first.metadata["cache_key"]) == (True, {"artifact": "gcc.tar"})
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+
+def test_straggler_gets_speculative_attempt(task_pool: List[str]) -> None:
+    from agent_stack.core.tasks.speculation import SpeculationPolicy
+
+    with pytest.raises(ValueError):
+        SpeculationPolicy(quantile=0.95)
+    TaskPool.configure_speculation(SpeculationPolicy(min_seconds=0.02, recheck_seconds=0.02))
+    task = TaskPool.create_task("slow", estimated_duration=0.01)
+    assert TaskPool.get_task("agent_1", []) is task
+
+    # An idle capable agent is woken with a duplicate of the straggler
+    assert TaskPool.wait_for_task("agent_2", [], timeout=5) is task
+    assert TaskPool.is_attempt_active(task.task_id, "agent_1")
+    assert TaskPool.get_task("agent_3", []) is None
+
+    # A rejected completion leaves the duplicate attempt intact
+    with pytest.raises(ValueError):
+        TaskPool.complete_task(task.task_id, "agent_3")
+    TaskPool.complete_task(task.task_id, "agent_2", result="fast")
+    TaskPool.complete_task(task.task_id, "agent_1", result="slow")
+
+    assert task.assigned_agent == "agent_2"
+    assert task.metadata["result"] == "fast"
+    assert not TaskPool.is_attempt_active(task.task_id, "agent_1")
+    assert TaskPool.get_agent_tasks("agent_1") == []
+
+def test_affinity_prefers_agent_that_completed_dependencies(task_pool: List[str]) -> None:
+    TaskPool.configure_affinity(0.05)
+    producer = TaskPool.create_task("produce")
+    consumer = TaskPool.create_task("consume", dependencies={producer.task_id})
+    assert TaskPool.get_task("agent_1", []) is producer
+    TaskPool.complete_task(producer.task_id, "agent_1")
+
+    # The consumer is held for agent_1 and reaches others only after the wait
+    assert TaskPool.get_task("agent_2", []) is None
+    assert TaskPool.get_task("agent_1", []) is consumer
+
+    other = TaskPool.create_task("consume_again", dependencies={producer.task_id})
+    assert TaskPool.get_task("agent_2", []) is None
+    assert TaskPool.wait_for_task("agent_2", [], timeout=5) is other
+
+    # Held tasks can be leased, and are not held for an agent lacking the skills
+    leased = TaskPool.create_task("consume_leased", dependencies={producer.task_id})
+    assert TaskPool.lease_tasks("agent_1", [], n=5, lease_seconds=30) == [leased]
+    gpu = TaskPool.create_task("render", dependencies={producer.task_id}, required_skills={"gpu"})
+    assert TaskPool.get_task("agent_2", ["gpu"]) is gpu
+
+def test_small_tasks_are_batched_and_completed_together(task_pool: List[str]) -> None:
+    from agent_stack.core.tasks.batching import BatchPolicy
+
+    policy = BatchPolicy(small_task_seconds=0.1, max_overhead_ratio=0.5, initial_size=3)
+    TaskPool.configure_batching(policy)
+    small = [TaskPool.create_task(f"small_{i}", estimated_duration=0.01) for i in range(4)]
+    skilled = TaskPool.create_task("skilled", estimated_duration=0.01, required_skills={"gpu"})
+    large = TaskPool.create_task("large", priority=-1, estimated_duration=10)
+
+    batch = TaskPool.get_batch("agent_1", ["gpu"])
+    assert batch.task_ids == [task.task_id for task in small[:3]]
+    assert skilled.status == "PENDING"
+
+    completed = TaskPool.complete_batch(
+        batch.batch_id, "agent_1",
+        results={small[0].task_id: "a"}, errors={small[2].task_id: "boom"},
+        overhead_seconds=0.05
+    )
+    assert completed == [small[0].task_id, small[1].task_id]
+    assert small[0].metadata["result"] == "a"
+    assert small[2].status != "COMPLETED"
+
+    # The reported overhead dwarfs the tiny tasks, so batches grow
+    assert batch.overhead_seconds >= 0.05
+    assert policy.batch_size() > 3
+    with pytest.raises(ValueError):
+        TaskPool.complete_batch(batch.batch_id, "agent_1")
+
+    # Tasks with another skill mask or a long estimate are not ganged
+    assert TaskPool.get_batch("agent_2", ["gpu"]).tasks == [small[3]]
+    assert TaskPool.get_batch("agent_2", ["gpu"]).tasks == [skilled]
+    assert TaskPool.get_batch("agent_2", ["gpu"]).tasks == [large]
+
+def test_batches_leave_speculative_attempts_to_get_task(task_pool: List[str]) -> None:
+    from agent_stack.core.tasks.speculation import SpeculationPolicy
+
+    TaskPool.configure_speculation(SpeculationPolicy(min_seconds=0.02, recheck_seconds=0.02))
+    task = TaskPool.create_task("slow", estimated_duration=0.01)
+    assert TaskPool.get_batch("agent_1", []).tasks == [task]
+    woken = threading.Event()
+    waiter = TaskPool._waiters.add(0, woken.set, "agent_2")
+    assert woken.wait(5)
+    TaskPool._release_waiter(waiter)
+
+    # A batch could not complete a duplicate attempt, so none is handed out
+    assert TaskPool.get_batch("agent_2", []) is None
+    assert TaskPool.get_task("agent_2", []) is task
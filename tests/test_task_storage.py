@@ -0,0 +1,68 @@
+"""Tests for persistent task pool storage."""
+
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from agent_stack.core.config.base import Settings
+from agent_stack.core.tasks import TaskPool
+from agent_stack.core.tasks.storage import SQLTaskStore
+
+@pytest.fixture
+def task_store(
+    test_settings: Settings, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> Generator[SQLTaskStore, None, None]:
+    """Provide an empty pool backed by an in-memory SQLite store.
+
+    Args:
+        test_settings: Test settings holding the database configuration
+        monkeypatch: Pytest monkeypatch fixture
+        tmp_path: Working directory for any log files the pool writes
+
+    Yields:
+        The attached task store
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(TaskPool, "_notify_task_ready", classmethod(lambda cls, task: None))
+    store = SQLTaskStore(test_settings.database, batch_size=10)
+    TaskPool.attach_store(store)
+    yield store
+    TaskPool.reset()
+    store.close()
+
+def test_pool_state_survives_restart(task_store: SQLTaskStore) -> None:
+    tasks = TaskPool.create_tasks([
+        {"task_id": "build", "name": "build", "required_skills": {"build"}},
+        {"task_id": "test", "name": "test", "dependencies": {"build"}},
+        {"task_id": "deploy", "name": "deploy", "dependencies": {"test"}},
+    ])
+    assert len(tasks) == 3
+
+    TaskPool.get_task("agent_1", ["build"])
+    TaskPool.complete_task("build", "agent_1")
+    TaskPool.get_task("agent_2", [])
+    TaskPool.detach_store()
+
+    TaskPool.attach_store(task_store)
+    restored = TaskPool._tasks
+
+    assert restored["build"].status == "COMPLETED"
+    assert restored["build"].required_skills == {"build"}
+    assert restored["test"].status == "ASSIGNED"
+    assert [task.task_id for task in TaskPool.get_agent_tasks("agent_2")] == ["test"]
+    assert restored["deploy"].dependencies == {"test"}
+    assert TaskPool.get_task("agent_3", []) is None
+
+def test_claim_is_atomic_across_schedulers(task_store: SQLTaskStore) -> None:
+    task = TaskPool.create_task("shared")
+
+    assert task_store.try_claim(task.task_id, "scheduler_b_agent")
+    assert not task_store.try_claim(task.task_id, "scheduler_c_agent")
+
+    # This scheduler lost the race, so the local claim must not succeed
+    assert TaskPool.get_task("agent_1", []) is None
+    # and the task now reflects the winner's assignment
+    assert task.status == "ASSIGNED"
+    assert task.assigned_agent == "scheduler_b_agent"
+    assert TaskPool.get_agent_tasks("agent_1") == []